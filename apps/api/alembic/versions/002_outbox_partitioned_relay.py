@@ -0,0 +1,37 @@
+"""Add events.seq for the partitioned, ordered outbox relay
+
+Revision ID: 002_outbox_partitioned_relay
+Revises: 001_baseline_2025_09_16
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "002_outbox_partitioned_relay"
+down_revision = "001_baseline_2025_09_16"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    # Monotonic insert order used to publish each aggregate's events in order
+    op.execute(
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS seq bigint "
+        "GENERATED BY DEFAULT AS IDENTITY"
+    )
+    # Relay claim scans only pending rows, in seq order
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_pending_seq ON events (seq) "
+        "WHERE published_at IS NULL AND state = 'pending'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_events_pending_seq")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS seq")
@@ -0,0 +1,146 @@
+"""Range-partition events and processed_events by time
+
+Converts `events` (by occurred_at) and `processed_events` (by processed_at) into
+monthly range-partitioned tables. The existing table of each is attached as the
+first partition, covering everything before next month, so no rows are copied.
+Upcoming partitions and retention are then managed by app.infra.partitions.
+
+The partition key joins each primary key, so `processed_events` no longer
+rejects a second row for an event id and `ON CONFLICT` can't dedupe it.
+Idempotency now rests on the consumer's lookup of the event id within
+`processed_events_retention_days` (taken under an advisory lock on the id
+when recording); events redelivered after that window are processed again.
+
+Revision ID: 003_time_partition_events
+Revises: 002_outbox_partitioned_relay
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "003_time_partition_events"
+down_revision = "002_outbox_partitioned_relay"
+branch_labels = None
+depends_on = None
+
+
+# Partitions created ahead of time by the migration; maintenance keeps it rolling
+MONTHS_AHEAD = 3
+
+EVENTS_INDEXES = {
+    "ix_events_aggregate_id": "(aggregate_id)",
+    "ix_events_event_type": "(event_type)",
+    "ix_events_occurred_at": "(occurred_at)",
+    "ix_events_published_at": "(published_at)",
+    "idx_events_state": "(state)",
+    "idx_events_next_attempt": "(next_attempt_at) WHERE state = 'pending'",
+    "ix_events_pending_seq": "(seq) WHERE published_at IS NULL AND state = 'pending'",
+}
+
+PROCESSED_EVENTS_INDEXES = {
+    "ix_processed_events_processed_at": "(processed_at)",
+}
+
+
+def _col_exists(conn: Any, table: str, column: str) -> bool:
+    res = conn.exec_driver_sql(
+        "SELECT 1 FROM information_schema.columns WHERE table_name=%s AND column_name=%s",
+        (table, column),
+    ).first()
+    return res is not None
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _partition(table: str, start: datetime) -> None:
+    year, month = _add_months(start.year, start.month, 1)
+    end = start.replace(year=year, month=month)
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {table}_p{start:%Y%m} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def _convert(
+    table: str, column: str, pk_columns: list[str], indexes: dict[str, str]
+) -> None:
+    """Swap `table` for a partitioned parent and attach the old table to it."""
+    legacy = f"{table}_legacy"
+    now = datetime.now(UTC)
+    year, month = _add_months(now.year, now.month, 1)
+    boundary = datetime(year, month, 1, tzinfo=UTC)
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    # Index names are schema-wide; move the old ones aside so the parent can
+    # reuse them (matching indexes on the legacy partition get attached)
+    for name in indexes:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_legacy")
+
+    # The partition key must be part of the primary key
+    op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT IF EXISTS {table}_pkey")
+    op.execute(f"ALTER TABLE {legacy} ADD PRIMARY KEY ({', '.join(pk_columns)})")
+
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE ({column})"
+    )
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(pk_columns)})")
+    # Validate the bound up front so ATTACH can skip its own scan
+    op.execute(
+        f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_bound "
+        f"CHECK ({column} IS NOT NULL AND {column} < '{boundary.isoformat()}')"
+    )
+    op.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {legacy}_bound")
+
+    for offset in range(MONTHS_AHEAD + 1):
+        year, month = _add_months(boundary.year, boundary.month, offset)
+        _partition(table, boundary.replace(year=year, month=month))
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+    for name, definition in indexes.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    conn = op.get_bind()
+
+    # Partitioned tables cannot own identity columns before PG 17; keep seq on
+    # a plain sequence default that survives the swap.
+    op.execute("ALTER TABLE events ALTER COLUMN seq DROP IDENTITY IF EXISTS")
+    op.execute("CREATE SEQUENCE IF NOT EXISTS events_seq_seq AS bigint")
+    op.execute(
+        "SELECT setval('events_seq_seq', COALESCE((SELECT max(seq) FROM events), 0) + 1, false)"
+    )
+    op.execute("ALTER TABLE events ALTER COLUMN seq SET DEFAULT nextval('events_seq_seq')")
+
+    _convert("events", "occurred_at", ["id", "occurred_at"], EVENTS_INDEXES)
+    op.execute("ALTER SEQUENCE events_seq_seq OWNED BY events.seq")
+
+    pk = ["event_id"]
+    if _col_exists(conn, "processed_events", "worker_id"):
+        pk.append("worker_id")
+    _convert("processed_events", "processed_at", [*pk, "processed_at"], PROCESSED_EVENTS_INDEXES)
+
+
+def downgrade() -> None:
+    """Forward-only: partitioned tables cannot be converted back in place.
+
+    For rollback, use database snapshots or create new forward migration.
+    """
+    raise NotImplementedError("Forward-only migration - no downgrade supported")
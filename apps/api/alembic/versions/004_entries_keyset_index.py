@@ -0,0 +1,33 @@
+"""Composite index for keyset pagination of entries
+
+Serves `ORDER BY created_at DESC, id` per author over live entries, so each
+cursor page is a bounded index range scan regardless of depth.
+
+Revision ID: 004_entries_keyset_index
+Revises: 003_time_partition_events
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "004_entries_keyset_index"
+down_revision = "003_time_partition_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes to entries
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_author_created_id "
+            "ON entries (author_id, created_at DESC, id) WHERE is_deleted = false"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_entries_author_created_id")
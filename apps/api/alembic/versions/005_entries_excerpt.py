@@ -0,0 +1,79 @@
+"""Stored excerpt and covering index for summary entry listings
+
+Adds `entries.excerpt`, a plain-text preview written by the entries API, and
+replaces the keyset index with one that INCLUDEs the bounded summary
+columns, so `view=summary` pages are read in index order and fetch only the
+title from the heap. Titles are unbounded and would push index tuples past
+the btree size limit, so they are not included.
+
+Revision ID: 005_entries_excerpt
+Revises: 004_entries_keyset_index
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "005_entries_excerpt"
+down_revision = "004_entries_keyset_index"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+# Approximate excerpt (tags stripped, whitespace collapsed); rows get the
+# exact excerpt the next time they are written
+BACKFILL = sa.text(
+    "UPDATE entries SET excerpt = left(btrim(regexp_replace("
+    "regexp_replace(COALESCE(content, ''), '<[^>]+>', ' ', 'g'), "
+    "'\\s+', ' ', 'g')), 200) "
+    "WHERE id > :after AND (CAST(:last AS uuid) IS NULL OR id <= :last) "
+    "AND excerpt IS NULL"
+)
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("ALTER TABLE entries ADD COLUMN IF NOT EXISTS excerpt text")
+
+    with op.get_context().autocommit_block():
+        # One short transaction per batch of ids, never a whole-table rewrite
+        bind = op.get_bind()
+        after = UUID(int=0)
+        while True:
+            # Last id of the next batch; None once fewer rows remain
+            last = bind.scalar(
+                sa.text(
+                    "SELECT id FROM entries WHERE id > :after "
+                    "ORDER BY id OFFSET :skip LIMIT 1"
+                ),
+                {"after": after, "skip": BACKFILL_BATCH - 1},
+            )
+            bind.execute(BACKFILL, {"after": after, "last": last})
+            if last is None:
+                break
+            after = last
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_author_created_summary "
+            "ON entries (author_id, created_at DESC, id) "
+            "INCLUDE (excerpt, updated_at, word_count, char_count, version) "
+            "WHERE is_deleted = false"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_entries_author_created_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_author_created_id "
+            "ON entries (author_id, created_at DESC, id) WHERE is_deleted = false"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_entries_author_created_summary")
+    op.execute("ALTER TABLE entries DROP COLUMN IF EXISTS excerpt")
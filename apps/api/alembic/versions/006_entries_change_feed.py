@@ -0,0 +1,76 @@
+"""Change stamps on entries for the delta sync feed
+
+Every insert or update of an entry (soft deletes included) is stamped by a
+trigger with the writing transaction id (`change_xid`) and a sequence number
+(`change_seq`). The feed pages by (change_xid, change_seq) and only serves
+changes of transactions that have finished, so late commits are never skipped.
+
+Revision ID: 006_entries_change_feed
+Revises: 005_entries_excerpt
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "006_entries_change_feed"
+down_revision = "005_entries_excerpt"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    op.execute("CREATE SEQUENCE IF NOT EXISTS entries_change_seq AS bigint")
+    op.execute(
+        "ALTER TABLE entries ADD COLUMN IF NOT EXISTS change_xid bigint, "
+        "ADD COLUMN IF NOT EXISTS change_seq bigint"
+    )
+    # Existing rows predate every running transaction: xid 0, seq by last write
+    op.execute(
+        "UPDATE entries AS e SET change_xid = 0, change_seq = o.seq "
+        "FROM (SELECT id, nextval('entries_change_seq') AS seq FROM "
+        "(SELECT id FROM entries ORDER BY updated_at, id) AS ordered) AS o "
+        "WHERE e.id = o.id"
+    )
+    op.execute("ALTER TABLE entries ALTER COLUMN change_xid SET NOT NULL")
+    op.execute("ALTER TABLE entries ALTER COLUMN change_seq SET NOT NULL")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entries_track_change() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            NEW.change_seq := nextval('entries_change_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER entries_track_change BEFORE INSERT OR UPDATE ON entries "
+        "FOR EACH ROW EXECUTE FUNCTION entries_track_change()"
+    )
+
+    with op.get_context().autocommit_block():
+        # Tombstones stay in the index: deletes are changes too
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_author_changes "
+            "ON entries (author_id, change_xid, change_seq)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_entries_author_changes")
+    op.execute("DROP TRIGGER IF EXISTS entries_track_change ON entries")
+    op.execute("DROP FUNCTION IF EXISTS entries_track_change()")
+    op.execute(
+        "ALTER TABLE entries DROP COLUMN IF EXISTS change_seq, "
+        "DROP COLUMN IF EXISTS change_xid"
+    )
+    op.execute("DROP SEQUENCE IF EXISTS entries_change_seq")
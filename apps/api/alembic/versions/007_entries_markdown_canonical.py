@@ -0,0 +1,88 @@
+"""Allow markdown entries without stored HTML
+
+`entries.content` becomes nullable so markdown entries (content_version 2)
+can keep markdown as their only source and have HTML rendered on read
+(`JOURNAL_ENTRY_HTML_STORAGE=rendered`). Full-text search falls back to the
+markdown when no HTML is stored.
+
+Redundant HTML of existing markdown entries is dropped when the migration is
+run with `alembic -x drop_rendered_html=true upgrade head`. That is not a
+content change, so it bypasses the change-feed trigger. The search_vector
+column is re-added afterwards, and that rewrite compacts the table.
+
+Downgrading requires HTML to be stored again for every entry
+(`python -m app.scripts.store_entry_html`).
+
+Revision ID: 007_entries_markdown_canonical
+Revises: 006_entries_change_feed
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "007_entries_markdown_canonical"
+down_revision = "006_entries_change_feed"
+branch_labels = None
+depends_on = None
+
+
+def _search_vector(source: str) -> str:
+    return (
+        "ALTER TABLE entries ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        f"(to_tsvector('english', coalesce(title, '') || ' ' || {source})) STORED"
+    )
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("ALTER TABLE entries ALTER COLUMN content DROP NOT NULL")
+
+    # The generated expression can't be altered in place (before PG 17)
+    op.execute("DROP INDEX IF EXISTS ix_entries_search_vector")
+    op.execute("ALTER TABLE entries DROP COLUMN IF EXISTS search_vector")
+
+    drop_html = context.get_x_argument(as_dictionary=True).get("drop_rendered_html")
+    if drop_html in {"1", "true", "yes"}:
+        op.execute("ALTER TABLE entries DISABLE TRIGGER entries_track_change")
+        op.execute(
+            "UPDATE entries SET content = NULL WHERE content_version >= 2 "
+            "AND markdown_content IS NOT NULL AND markdown_content <> '' "
+            "AND content IS NOT NULL"
+        )
+        op.execute("ALTER TABLE entries ENABLE TRIGGER entries_track_change")
+
+    op.execute(_search_vector("coalesce(content, markdown_content, '')"))
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_search_vector "
+            "ON entries USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    missing = op.get_bind().scalar(
+        sa.text("SELECT count(*) FROM entries WHERE content IS NULL")
+    )
+    if missing:
+        raise RuntimeError(
+            f"{missing} entries have no stored HTML; run "
+            "`python -m app.scripts.store_entry_html` first"
+        )
+
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("DROP INDEX IF EXISTS ix_entries_search_vector")
+    op.execute("ALTER TABLE entries DROP COLUMN IF EXISTS search_vector")
+    op.execute(_search_vector("coalesce(content, '')"))
+    op.execute("ALTER TABLE entries ALTER COLUMN content SET NOT NULL")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_search_vector "
+            "ON entries USING gin (search_vector)"
+        )
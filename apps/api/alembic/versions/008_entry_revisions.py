@@ -0,0 +1,65 @@
+"""Entry revision history
+
+Adds `entry_revisions`: one row per kept version of an entry, holding either
+a zlib-compressed snapshot of its text or a compressed reverse delta against
+the next newer revision (see app.infra.revisions). The data is compressed by
+the application, so TOAST compression is turned off for it.
+
+Revision ID: 008_entry_revisions
+Revises: 007_entries_markdown_canonical
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "008_entry_revisions"
+down_revision = "007_entries_markdown_canonical"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "entry_revisions",
+        sa.Column("entry_id", sa.UUID(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("content_format", sa.String(length=16), nullable=False),
+        sa.Column("text_length", sa.Integer(), nullable=False),
+        sa.Column("is_snapshot", sa.Boolean(), nullable=False),
+        sa.Column("chain", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "chain_bytes", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "autosave", sa.Boolean(), server_default=sa.text("false"), nullable=False
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["entry_id"], ["entries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("entry_id", "version"),
+    )
+    op.execute("ALTER TABLE entry_revisions ALTER COLUMN data SET STORAGE EXTERNAL")
+    # Finds entries whose old autosaves may need thinning
+    op.create_index(
+        "ix_entry_revisions_autosave_created",
+        "entry_revisions",
+        ["created_at"],
+        postgresql_where=sa.text("autosave"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_entry_revisions_autosave_created", table_name="entry_revisions"
+    )
+    op.drop_table("entry_revisions")
@@ -0,0 +1,123 @@
+"""Per-user daily entry counters for /stats
+
+Adds `user_entry_stats_daily`: per author and UTC day, the number of live
+entries created that day and the number last updated that day. Triggers on
+`entries` apply +1/-1 upserts on every insert, delete, soft delete and
+day-changing update, whichever code path writes. Existing entries are
+counted in the same transaction, which holds off writers until it commits.
+
+Revision ID: 009_user_entry_stats_daily
+Revises: 008_entry_revisions
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "009_user_entry_stats_daily"
+down_revision = "008_entry_revisions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    op.create_table(
+        "user_entry_stats_daily",
+        sa.Column("author_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("created", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("updated", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("author_id", "day"),
+    )
+
+    # Days are UTC calendar days, whatever the session time zone
+    op.execute(
+        "CREATE OR REPLACE FUNCTION utc_day(ts timestamptz) RETURNS date "
+        "AS $$ SELECT (ts AT TIME ZONE 'UTC')::date $$ LANGUAGE sql IMMUTABLE"
+    )
+    # One upsert per touched day (GROUP BY folds created == updated days);
+    # days that drop to zero are removed, so deleted users leave no rows
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entry_stats_apply(
+            author uuid, created_day date, updated_day date, delta integer
+        ) RETURNS void AS $$
+            INSERT INTO user_entry_stats_daily AS s (author_id, day, created, updated)
+            SELECT author, d, sum(c), sum(u)
+            FROM (VALUES (created_day, delta, 0), (updated_day, 0, delta)) AS v (d, c, u)
+            GROUP BY d
+            ON CONFLICT (author_id, day) DO UPDATE
+            SET created = s.created + excluded.created,
+                updated = s.updated + excluded.updated;
+            DELETE FROM user_entry_stats_daily
+            WHERE delta < 0 AND author_id = author
+              AND day IN (created_day, updated_day) AND created = 0 AND updated = 0;
+        $$ LANGUAGE sql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entries_stats_rollup() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' AND NOT OLD.is_deleted THEN
+                PERFORM entry_stats_apply(
+                    OLD.author_id, utc_day(OLD.created_at), utc_day(OLD.updated_at), -1
+                );
+            END IF;
+            IF TG_OP <> 'DELETE' AND NOT NEW.is_deleted THEN
+                PERFORM entry_stats_apply(
+                    NEW.author_id, utc_day(NEW.created_at), utc_day(NEW.updated_at), 1
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER entries_stats_rollup AFTER INSERT OR DELETE ON entries "
+        "FOR EACH ROW EXECUTE FUNCTION entries_stats_rollup()"
+    )
+    # Same-day edits (most autosaves) leave the counters alone
+    op.execute(
+        """
+        CREATE TRIGGER entries_stats_rollup_update AFTER UPDATE ON entries
+        FOR EACH ROW WHEN (
+            OLD.is_deleted IS DISTINCT FROM NEW.is_deleted
+            OR OLD.author_id IS DISTINCT FROM NEW.author_id
+            OR utc_day(OLD.created_at) IS DISTINCT FROM utc_day(NEW.created_at)
+            OR utc_day(OLD.updated_at) IS DISTINCT FROM utc_day(NEW.updated_at)
+        )
+        EXECUTE FUNCTION entries_stats_rollup()
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO user_entry_stats_daily (author_id, day, created, updated)
+        SELECT author_id, day, sum(created), sum(updated)
+        FROM (
+            SELECT author_id, utc_day(created_at) AS day, 1 AS created, 0 AS updated
+            FROM entries WHERE NOT is_deleted
+            UNION ALL
+            SELECT author_id, utc_day(updated_at), 0, 1
+            FROM entries WHERE NOT is_deleted
+        ) AS t
+        GROUP BY author_id, day
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS entries_stats_rollup_update ON entries")
+    op.execute("DROP TRIGGER IF EXISTS entries_stats_rollup ON entries")
+    op.execute("DROP FUNCTION IF EXISTS entries_stats_rollup()")
+    op.execute("DROP FUNCTION IF EXISTS entry_stats_apply(uuid, date, date, integer)")
+    op.execute("DROP FUNCTION IF EXISTS utc_day(timestamptz)")
+    op.drop_table("user_entry_stats_daily")
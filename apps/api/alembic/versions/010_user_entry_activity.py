@@ -0,0 +1,126 @@
+"""Per-user daily activity arrays for /stats/activity
+
+Adds `user_entry_activity`: one row per author holding dense arrays of live
+entries created, their words and their characters per UTC day. Element `i`
+is day 2000-01-01 + i; arrays extend in either direction as days are
+written, and untouched days in between are NULL.
+
+Writes to `entries` recompute the affected days from `entries` itself (an
+idempotent overwrite of one element) under a lock on the author's row, so
+concurrent writers of one author cannot overwrite each other's counts.
+
+Revision ID: 010_user_entry_activity
+Revises: 009_user_entry_stats_daily
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "010_user_entry_activity"
+down_revision = "009_user_entry_stats_daily"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    op.create_table(
+        "user_entry_activity",
+        sa.Column("author_id", sa.UUID(), nullable=False),
+        *(
+            sa.Column(
+                name,
+                postgresql.ARRAY(sa.Integer()),
+                server_default=sa.text("'{}'"),
+                nullable=False,
+            )
+            for name in ("entries", "words", "chars")
+        ),
+        sa.PrimaryKeyConstraint("author_id"),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entry_activity_refresh(author uuid, d date)
+        RETURNS void AS $$
+            INSERT INTO user_entry_activity (author_id) VALUES (author)
+            ON CONFLICT DO NOTHING;
+            -- Count only once the row is ours: this statement's successor
+            -- then sees every earlier writer's committed entries
+            SELECT 1 FROM user_entry_activity WHERE author_id = author FOR UPDATE;
+            UPDATE user_entry_activity
+            SET entries[d - DATE '2000-01-01'] = totals.n,
+                words[d - DATE '2000-01-01'] = totals.w,
+                chars[d - DATE '2000-01-01'] = totals.c
+            FROM (
+                SELECT count(*)::integer AS n,
+                       coalesce(sum(word_count), 0)::integer AS w,
+                       coalesce(sum(char_count), 0)::integer AS c
+                FROM entries
+                WHERE author_id = author AND is_deleted = false
+                  AND created_at >= d::timestamp AT TIME ZONE 'UTC'
+                  AND created_at < (d + 1)::timestamp AT TIME ZONE 'UTC'
+            ) AS totals
+            WHERE author_id = author;
+        $$ LANGUAGE sql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entries_activity_rollup() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM entry_activity_refresh(OLD.author_id, utc_day(OLD.created_at));
+            END IF;
+            IF TG_OP = 'INSERT' OR (
+                TG_OP = 'UPDATE' AND (
+                    OLD.author_id IS DISTINCT FROM NEW.author_id
+                    OR utc_day(OLD.created_at) <> utc_day(NEW.created_at)
+                )
+            ) THEN
+                PERFORM entry_activity_refresh(NEW.author_id, utc_day(NEW.created_at));
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER entries_activity_rollup AFTER INSERT OR DELETE ON entries "
+        "FOR EACH ROW EXECUTE FUNCTION entries_activity_rollup()"
+    )
+    # Edits that leave liveness, day and counts alone skip the refresh
+    op.execute(
+        """
+        CREATE TRIGGER entries_activity_rollup_update AFTER UPDATE ON entries
+        FOR EACH ROW WHEN (
+            OLD.is_deleted IS DISTINCT FROM NEW.is_deleted
+            OR OLD.author_id IS DISTINCT FROM NEW.author_id
+            OR OLD.created_at IS DISTINCT FROM NEW.created_at
+            OR OLD.word_count IS DISTINCT FROM NEW.word_count
+            OR OLD.char_count IS DISTINCT FROM NEW.char_count
+        )
+        EXECUTE FUNCTION entries_activity_rollup()
+        """
+    )
+
+    op.execute(
+        "SELECT entry_activity_refresh(author_id, day) FROM "
+        "(SELECT DISTINCT author_id, utc_day(created_at) AS day FROM entries "
+        "WHERE is_deleted = false) AS days"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup_update ON entries")
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup ON entries")
+    op.execute("DROP FUNCTION IF EXISTS entries_activity_rollup()")
+    op.execute("DROP FUNCTION IF EXISTS entry_activity_refresh(uuid, date)")
+    op.drop_table("user_entry_activity")
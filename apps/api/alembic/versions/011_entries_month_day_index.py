@@ -0,0 +1,37 @@
+"""Month/day expression index for "on this day"
+
+Serves `/entries/on-this-day`: per author, live entries by UTC month and
+day of creation, so finding the same calendar day in earlier years reads a
+few index ranges instead of the author's whole history.
+
+Revision ID: 011_entries_month_day_index
+Revises: 010_user_entry_activity
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "011_entries_month_day_index"
+down_revision = "010_user_entry_activity"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes to entries
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_author_month_day "
+            "ON entries (author_id, "
+            "(EXTRACT(month FROM timezone('UTC', created_at))), "
+            "(EXTRACT(day FROM timezone('UTC', created_at)))) "
+            "WHERE is_deleted = false"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_entries_author_month_day")
@@ -0,0 +1,184 @@
+"""Statement-level triggers for user_entry_activity
+
+The row-level triggers of 010 recounted the whole day from `entries` and
+rewrote the author's activity row once per written row, holding the row
+lock across the recount: a 500-row import recounted and rewrote 500 times,
+and an author's autosaves queued behind each other's recounts.
+
+These triggers fire once per statement and read the statement's transition
+tables instead. Changes are summed into +/- deltas per author and day, and
+each author's row is rewritten once, adding all of that statement's deltas
+to its arrays. `entry_activity_refresh` stays for `rebuild_entry_stats`.
+
+Revision ID: 012_activity_stmt_triggers
+Revises: 011_entries_month_day_index
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "012_activity_stmt_triggers"
+down_revision = "011_entries_month_day_index"
+branch_labels = None
+depends_on = None
+
+
+# Per-row contributions of live entries; `sign` is -1 for rows going away
+CHANGES = """
+    SELECT author_id, utc_day(created_at) - DATE '2000-01-01' AS i,
+           {sign} AS n,
+           {sign} * coalesce(word_count, 0) AS w,
+           {sign} * coalesce(char_count, 0) AS c
+    FROM {rows} WHERE is_deleted = false
+"""
+
+# One call per author: every day's delta of the statement at once
+APPLY = """
+    PERFORM entry_activity_apply(
+        author_id, array_agg(i), array_agg(n), array_agg(w), array_agg(c)
+    )
+    FROM (
+        SELECT author_id, i, sum(n)::integer AS n,
+               sum(w)::integer AS w, sum(c)::integer AS c
+        FROM ({changes}) AS changes
+        GROUP BY author_id, i
+        HAVING sum(n) <> 0 OR sum(w) <> 0 OR sum(c) <> 0
+    ) AS deltas
+    GROUP BY author_id
+    ORDER BY author_id;
+"""
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup_update ON entries")
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup ON entries")
+    op.execute("DROP FUNCTION IF EXISTS entries_activity_rollup()")
+
+    # Element updates on a plpgsql array variable are in place, so the
+    # arrays are copied once however many days change
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION activity_add(
+            arr integer[], idx integer[], delta integer[]
+        ) RETURNS integer[] AS $$
+        BEGIN
+            FOR k IN 1 .. coalesce(array_length(idx, 1), 0) LOOP
+                arr[idx[k]] := coalesce(arr[idx[k]], 0) + delta[k];
+            END LOOP;
+            RETURN arr;
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE
+        """
+    )
+    # Increments are applied to the latest row version under its row lock,
+    # so concurrent writers of one author add up instead of overwriting
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entry_activity_apply(
+            author uuid, idx integer[], n integer[], w integer[], c integer[]
+        ) RETURNS void AS $$
+            INSERT INTO user_entry_activity (author_id) VALUES (author)
+            ON CONFLICT DO NOTHING;
+            UPDATE user_entry_activity
+            SET entries = activity_add(entries, idx, n),
+                words = activity_add(words, idx, w),
+                chars = activity_add(chars, idx, c)
+            WHERE author_id = author;
+        $$ LANGUAGE sql
+        """
+    )
+    # Transition tables exist per event, so each event gets its own query
+    inserted = CHANGES.format(sign=1, rows="new_rows")
+    deleted = CHANGES.format(sign=-1, rows="old_rows")
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION entries_activity_rollup() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {APPLY.format(changes=inserted)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {APPLY.format(changes=deleted)}
+            ELSE
+                {APPLY.format(changes=f"{inserted} UNION ALL {deleted}")}
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER entries_activity_rollup_insert AFTER INSERT ON entries "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION entries_activity_rollup()"
+    )
+    # Statement triggers take no WHEN clause; edits that change no counts
+    # net out to no deltas and skip the write
+    op.execute(
+        "CREATE TRIGGER entries_activity_rollup_update AFTER UPDATE ON entries "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION entries_activity_rollup()"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_activity_rollup_delete AFTER DELETE ON entries "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION entries_activity_rollup()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup_delete ON entries")
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup_update ON entries")
+    op.execute("DROP TRIGGER IF EXISTS entries_activity_rollup_insert ON entries")
+    op.execute("DROP FUNCTION IF EXISTS entries_activity_rollup()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "entry_activity_apply(uuid, integer[], integer[], integer[], integer[])"
+    )
+    op.execute("DROP FUNCTION IF EXISTS activity_add(integer[], integer[], integer[])")
+
+    # The row-level triggers of 010
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entries_activity_rollup() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM entry_activity_refresh(OLD.author_id, utc_day(OLD.created_at));
+            END IF;
+            IF TG_OP = 'INSERT' OR (
+                TG_OP = 'UPDATE' AND (
+                    OLD.author_id IS DISTINCT FROM NEW.author_id
+                    OR utc_day(OLD.created_at) <> utc_day(NEW.created_at)
+                )
+            ) THEN
+                PERFORM entry_activity_refresh(NEW.author_id, utc_day(NEW.created_at));
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER entries_activity_rollup AFTER INSERT OR DELETE ON entries "
+        "FOR EACH ROW EXECUTE FUNCTION entries_activity_rollup()"
+    )
+    op.execute(
+        """
+        CREATE TRIGGER entries_activity_rollup_update AFTER UPDATE ON entries
+        FOR EACH ROW WHEN (
+            OLD.is_deleted IS DISTINCT FROM NEW.is_deleted
+            OR OLD.author_id IS DISTINCT FROM NEW.author_id
+            OR OLD.created_at IS DISTINCT FROM NEW.created_at
+            OR OLD.word_count IS DISTINCT FROM NEW.word_count
+            OR OLD.char_count IS DISTINCT FROM NEW.char_count
+        )
+        EXECUTE FUNCTION entries_activity_rollup()
+        """
+    )
@@ -0,0 +1,84 @@
+"""Per-user running entry totals for /stats
+
+Adds `user_entry_stats_total`: one row per author with the number of live
+entries, so `total_entries` is a single row read instead of a sum over every
+day the author ever wrote on. `entry_stats_apply` (009) applies the same
++1/-1 to it as to the daily counters; authors dropping to zero lose the row.
+
+Existing totals are summed from `user_entry_stats_daily` under a lock on it,
+so triggers that ran before the new `entry_stats_apply` are already counted
+and later ones wait and then count themselves.
+
+Revision ID: 013_user_entry_stats_total
+Revises: 012_activity_stmt_triggers
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "013_user_entry_stats_total"
+down_revision = "012_activity_stmt_triggers"
+branch_labels = None
+depends_on = None
+
+
+DAILY = """
+    INSERT INTO user_entry_stats_daily AS s (author_id, day, created, updated)
+    SELECT author, d, sum(c), sum(u)
+    FROM (VALUES (created_day, delta, 0), (updated_day, 0, delta)) AS v (d, c, u)
+    GROUP BY d
+    ON CONFLICT (author_id, day) DO UPDATE
+    SET created = s.created + excluded.created,
+        updated = s.updated + excluded.updated;
+    DELETE FROM user_entry_stats_daily
+    WHERE delta < 0 AND author_id = author
+      AND day IN (created_day, updated_day) AND created = 0 AND updated = 0;
+"""
+
+TOTAL = """
+    INSERT INTO user_entry_stats_total AS t (author_id, entries)
+    VALUES (author, delta)
+    ON CONFLICT (author_id) DO UPDATE SET entries = t.entries + excluded.entries;
+    DELETE FROM user_entry_stats_total
+    WHERE delta < 0 AND author_id = author AND entries = 0;
+"""
+
+
+def _entry_stats_apply(body: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION entry_stats_apply(
+            author uuid, created_day date, updated_day date, delta integer
+        ) RETURNS void AS $$
+        {body}
+        $$ LANGUAGE sql
+    """
+
+
+def upgrade() -> None:
+    # Fail fast if locks can't be acquired
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    op.create_table(
+        "user_entry_stats_total",
+        sa.Column("author_id", sa.UUID(), nullable=False),
+        sa.Column("entries", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("author_id"),
+    )
+
+    op.execute("LOCK TABLE user_entry_stats_daily IN EXCLUSIVE MODE")
+    op.execute(_entry_stats_apply(DAILY + TOTAL))
+    op.execute(
+        "INSERT INTO user_entry_stats_total (author_id, entries) "
+        "SELECT author_id, sum(created) FROM user_entry_stats_daily "
+        "GROUP BY author_id HAVING sum(created) > 0"
+    )
+
+
+def downgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(_entry_stats_apply(DAILY))
+    op.drop_table("user_entry_stats_total")
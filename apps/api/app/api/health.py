@@ -20,6 +20,7 @@ from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.infra.db import build_engine
+from app.infra.nats_bus import nats_manager
 from app.infra.redis import get_redis
 
 
@@ -120,6 +121,20 @@ def _infisical_cli_check() -> Check:
     )
 
 
+def _nats_check() -> Check:
+    """Report the shared NATS connection state (sync, no I/O)."""
+    state = nats_manager.status()
+    if state == "connected":
+        return Check(name="nats", status=Status.healthy)
+    if state == "not_started":
+        return Check(
+            name="nats",
+            status=Status.skipped,
+            detail="NATS connection not started",
+        )
+    return Check(name="nats", status=Status.unhealthy, detail=state)
+
+
 @router.get("/healthz", response_model=HealthReport)
 async def liveness() -> HealthReport:
     """Liveness probe - always returns 200 with process status.
@@ -198,6 +213,9 @@ async def readiness(response: Response) -> HealthReport:
             )
         )
 
+    # NATS check (shared connection state, no I/O)
+    checks.append(_nats_check())
+
     # Infisical CLI check (sync, no network)
     checks.append(_infisical_cli_check())
 
@@ -2,15 +2,25 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 import json
 from typing import Any
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db import get_session
+from app.infra.db import build_engine, get_session, sessionmaker_for
+from app.infra.dlq import (
+    DeadEventFilter,
+    get_replay_job,
+    list_dead_events,
+    serialize_dead_event,
+    start_replay_job,
+)
 from app.infra.nats_bus import nats_conn
 from app.middleware.enhanced_jwt_middleware import require_scopes
 
@@ -61,3 +71,78 @@ async def reindex_embeddings_v2(
     async with nats_conn() as nc:
         await nc.publish("journal.reindex.bulk", payload)
     return {"status": "queued", "message": "Bulk embedding reindex has been queued"}
+
+
+@router.get("/dlq")
+async def list_dlq_v2(
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+    event_type: str | None = None,
+    error: str | None = Query(None, description="Substring of the last error"),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after_seq: int | None = Query(None, description="Continue after this seq"),
+    limit: int = Query(100, ge=1, le=1000),
+) -> dict[str, Any]:
+    """List dead-lettered outbox events (requires admin.read)."""
+    await require_scopes(["admin.read"], request)
+    flt = DeadEventFilter(
+        event_type=event_type, error_contains=error, since=since, until=until
+    )
+    rows = await list_dead_events(db, flt, limit=limit, after_seq=after_seq)
+    return {
+        "items": [serialize_dead_event(ev) for ev in rows],
+        "next_after_seq": rows[-1].seq if len(rows) == limit else None,
+    }
+
+
+class DlqReplayRequest(BaseModel):
+    """Selection and pacing for a DLQ replay."""
+
+    ids: list[UUID] | None = None
+    event_type: str | None = None
+    error: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    limit: int | None = Field(None, ge=1)
+    batch_size: int = Field(500, ge=1, le=5000)
+    max_per_second: float | None = Field(None, gt=0)
+    dry_run: bool = False
+
+
+@router.post("/dlq/replay", status_code=202)
+async def replay_dlq_v2(
+    request: Request, response: Response, body: DlqReplayRequest
+) -> dict[str, Any]:
+    """Replay dead-lettered events to their original subjects (requires admin.write).
+
+    The replay runs as a background job; poll ``Location`` for progress.
+    """
+    await require_scopes(["admin.write"], request)
+    flt = DeadEventFilter(
+        event_type=body.event_type,
+        error_contains=body.error,
+        since=body.since,
+        until=body.until,
+        ids=body.ids,
+    )
+    job = start_replay_job(
+        sessionmaker_for(build_engine()),
+        flt,
+        batch_size=body.batch_size,
+        max_per_second=body.max_per_second,
+        limit=body.limit,
+        dry_run=body.dry_run,
+    )
+    response.headers["Location"] = f"{request.url.path}/{job.id}"
+    return job.as_dict()
+
+
+@router.get("/dlq/replay/{job_id}")
+async def get_dlq_replay_v2(request: Request, job_id: str) -> dict[str, Any]:
+    """Progress of a replay job started on this instance (requires admin.read)."""
+    await require_scopes(["admin.read"], request)
+    job = get_replay_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Replay job not found")
+    return job.as_dict()
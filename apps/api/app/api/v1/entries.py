@@ -1,29 +1,79 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, time, timedelta
+import logging
+import os
+from pathlib import Path
+import tempfile
 from typing import Annotated, Any, Literal
 
 # Standard library imports
 from uuid import UUID
+import zipfile
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 # Third-party imports
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import RowMapping, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infra.auto_embed import ensure_embedding_for_entry
-from app.infra.conversion import markdown_to_html
-from app.infra.db import get_session
+from app.infra.conversion import entry_html, render_markdown, storable_html
+from app.infra.db import build_engine, get_read_session, get_session, sessionmaker_for
 
 # Local imports
 from app.infra.enhanced_auth import require_user
-from app.infra.metrics import count_words_chars, extract_text_for_metrics
+from app.infra.entry_import import ImportFormat, get_import_job, start_import_job
+from app.infra.etag import entry_etag, if_match_version, list_etag, none_match
+from app.infra.metrics import (
+    build_excerpt,
+    count_words_chars,
+    extract_text_for_metrics,
+)
+from app.infra.redis import get_redis_client
 from app.infra.repository import ConflictError, EntryRepository, NotFoundError
-from app.infra.sa_models import Entry
-from app.services.entry_service import list_entries
+from app.infra.revisions import (
+    RevisionSource,
+    get_revision,
+    list_revisions,
+    record_revisions,
+)
+from app.infra.sa_models import Entry, Event
+from app.infra.serialization import (
+    encoded_json_response,
+    json_bytes,
+    json_response,
+)
+from app.infra.text_patch import (
+    PatchError,
+    TextEdit,
+    apply_edits,
+    char_count_delta,
+    validate_edits,
+    word_count_delta,
+)
+from app.services.entry_service import (
+    SUMMARY_COLUMNS,
+    InvalidCursorError,
+    decode_change_cursor,
+    decode_cursor,
+    encode_change_cursor,
+    encode_cursor,
+    get_entry_version,
+    list_entries,
+    list_entry_changes,
+    list_entry_summaries,
+    list_on_this_day,
+)
 from app.settings import settings
 
 
 router = APIRouter(prefix="/entries", tags=["entries"])
+logger = logging.getLogger(__name__)
 
 
 # ==============================
@@ -43,11 +93,74 @@ class EntryUpdate(BaseModel):
     content: str | None = None
     markdown_content: str | None = None
     content_version: int | None = None
+    expected_version: int | None = Field(
+        None, description="Expected version for optimistic locking (or If-Match)"
+    )
+
+
+# Upper bound on text edits in one patch request
+PATCH_MAX_EDITS = 1000
+
+
+class EntryTextEdit(BaseModel):
+    at: int = Field(ge=0, description="Offset in Unicode code points")
+    delete: int = Field(0, ge=0, description="Characters removed at the offset")
+    insert: str = ""
+
+
+class EntryPatch(BaseModel):
+    target: Literal["markdown_content", "content"] = "markdown_content"
+    edits: list[EntryTextEdit] = Field(
+        default_factory=list,
+        max_length=PATCH_MAX_EDITS,
+        description="Sorted, non-overlapping edits against expected_version",
+    )
+    title: str | None = Field(None, min_length=1)
+    expected_version: int | None = Field(
+        None, description="Version the edits apply to (or If-Match)"
+    )
+
+
+# Upper bound on operations (and on IDs per get) in one batch request
+BATCH_MAX_OPERATIONS = 100
+
+
+class BatchCreate(EntryCreate):
+    op: Literal["create"]
+
+
+class BatchUpdate(EntryUpdate):
+    op: Literal["update"]
+    id: UUID
+    expected_version: int = Field(
+        ..., description="Expected version for optimistic locking"
+    )
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
     expected_version: int = Field(
         ..., description="Expected version for optimistic locking"
     )
 
 
+class BatchGet(BaseModel):
+    op: Literal["get"]
+    ids: list[UUID] = Field(min_length=1, max_length=BATCH_MAX_OPERATIONS)
+
+
+BatchOperation = Annotated[
+    BatchCreate | BatchUpdate | BatchDelete | BatchGet, Field(discriminator="op")
+]
+
+
+class EntryBatch(BaseModel):
+    operations: list[BatchOperation] = Field(
+        min_length=1, max_length=BATCH_MAX_OPERATIONS
+    )
+
+
 class ContentBlock(BaseModel):
     html: str | None = None
     markdown: str | None = None
@@ -83,55 +196,252 @@ def _prefer_markdown(request: Request) -> bool:
     return (fmt or "").lower() == "markdown"
 
 
-def _entry_response(row: Entry, prefer_md: bool = False) -> dict[str, Any]:
-    """Create stable entry response with backward compatibility.
+def _representation(prefer_md: bool) -> str:
+    return "markdown" if prefer_md else "html"
+
+
+# Request headers that select the representation of an entry
+_VARY = "X-Editor-Mode, X-Content-Format, X-Client-Editor"
+
+
+def _check_not_modified(request: Request, response: Response, etag: str) -> None:
+    """Tag the response and answer 304 when the client already has it."""
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = _VARY
+    if none_match(request.headers.get("If-None-Match"), etag):
+        raise HTTPException(status_code=304, headers=dict(response.headers))
+
+
+async def _write_precondition(
+    request: Request, repo: EntryRepository, eid: UUID, expected_version: int | None
+) -> tuple[int, bool]:
+    """Resolve the version a write must match.
+
+    ``If-Match`` takes precedence over the legacy ``expected_version``.
 
     Returns:
-        Dictionary with entry data including content block and legacy fields.
+        The expected version and whether it came from ``If-Match``.
+
+    Raises:
+        HTTPException: 428 without any precondition, 412 when ``If-Match``
+            names no current tag of this entry.
     """
-    editor_mode: Literal["html", "markdown"] = "markdown" if prefer_md else "html"
-
-    # Create structured content block
-    content_block = ContentBlock(
-        html=row.content,
-        markdown=row.markdown_content,
-        format_preference="markdown" if prefer_md and row.markdown_content else "html",
-        version=row.content_version,
+    header = request.headers.get("If-Match")
+    if header is None:
+        if expected_version is None:
+            raise HTTPException(
+                status_code=428,
+                detail="If-Match header or expected_version is required",
+            )
+        return expected_version, False
+    if header.strip() == "*":
+        entry = await repo.get_by_id(eid)
+        if not entry or entry.is_deleted:
+            raise HTTPException(status_code=404, detail="Entry not found")
+        return entry.version, True
+    version = if_match_version(header, eid)
+    if version is None:
+        raise HTTPException(status_code=412, detail="Precondition Failed")
+    return version, True
+
+
+def _conflict_detail(c: ConflictError) -> dict[str, Any]:
+    return {
+        "message": str(c),
+        "expected_version": c.expected,
+        "actual_version": c.actual,
+    }
+
+
+def _conflict(c: ConflictError, from_if_match: bool) -> HTTPException:
+    return HTTPException(
+        # A failed If-Match is a precondition failure; the body field keeps 409
+        status_code=412 if from_if_match else 409,
+        detail=_conflict_detail(c),
     )
 
-    # Legacy content field for backward compatibility
-    legacy_content = (
-        row.markdown_content if prefer_md and row.markdown_content else row.content
+
+async def _create_data(body: EntryCreate, author_id: UUID) -> dict[str, Any]:
+    """Column values for a new entry: rendered HTML, metrics and excerpt."""
+    html_content = body.content or ""
+    md_content = body.markdown_content
+    # Use provided version or default based on content type
+    # content_version has default=1 in the model, so it's never None
+    version = body.content_version
+
+    # Generate HTML from markdown when markdown is provided
+    if md_content is not None:
+        html_content = await render_markdown(md_content)
+
+    # Calculate metrics
+    text_for_metrics = extract_text_for_metrics(html_content, md_content)
+    word_count, char_count = count_words_chars(text_for_metrics)
+
+    return {
+        "author_id": author_id,
+        "title": body.title,
+        "content": storable_html(html_content, md_content),
+        "markdown_content": md_content,
+        "excerpt": build_excerpt(html_content),
+        "content_version": version,
+        "word_count": word_count,
+        "char_count": char_count,
+    }
+
+
+async def _update_data(body: EntryUpdate) -> dict[str, Any]:
+    """Changed column values for an update, re-deriving HTML and metrics."""
+    # Prepare update data from body (excluding control fields)
+    update_data = body.model_dump(
+        exclude={"expected_version", "op", "id"}, exclude_unset=True
     )
 
-    # Create response using Pydantic model
-    response = EntryResponse(
-        id=row.id,
-        title=row.title,
-        content_block=content_block,
-        metrics={"word_count": row.word_count or 0, "char_count": row.char_count or 0},
+    # If markdown is provided, it takes priority and always generates HTML
+    if body.markdown_content is not None:
+        update_data["content"] = await render_markdown(body.markdown_content)
+        # Default content_version to 2 for markdown when not explicitly provided
+        if (
+            "content_version" not in update_data
+            or update_data["content_version"] is None
+        ):
+            update_data["content_version"] = 2
+
+    # Update metrics if content changed (HTML and/or markdown)
+    if "content" in update_data or "markdown_content" in update_data:
+        text_for_metrics = extract_text_for_metrics(
+            update_data.get("content"), update_data.get("markdown_content")
+        )
+        word_count, char_count = count_words_chars(text_for_metrics)
+        update_data["word_count"] = word_count
+        update_data["char_count"] = char_count
+    if "content" in update_data:
+        update_data["excerpt"] = build_excerpt(update_data["content"])
+        update_data["content"] = storable_html(
+            update_data["content"], update_data.get("markdown_content")
+        )
+    return update_data
+
+
+async def _patch_data(entry: Entry, body: EntryPatch) -> dict[str, Any]:
+    """Changed column values for a patch of a locked entry.
+
+    Raises:
+        PatchError: The edits do not apply to the entry's current text
+    """
+    update_data: dict[str, Any] = {}
+    if body.title is not None:
+        update_data["title"] = body.title
+    if not body.edits:
+        return update_data
+    if body.target == "content" and entry.markdown_content:
+        raise PatchError("entry is edited as markdown; patch markdown_content")
+
+    edits = [TextEdit(e.at, e.delete, e.insert) for e in body.edits]
+    before = getattr(entry, body.target) or ""
+    validate_edits(before, edits)
+    after = apply_edits(before, edits)
+    update_data[body.target] = after
+
+    if body.target == "markdown_content":
+        update_data["content"] = await render_markdown(after)
+        if entry.content_version < 2:
+            update_data["content_version"] = 2
+    update_data["excerpt"] = build_excerpt(update_data["content"])
+
+    # Adjust metrics from the edited regions when they were counted from the
+    # patched text (the char count doubles as a check that they still are)
+    markdown = update_data.get("markdown_content", entry.markdown_content)
+    counted_before = "markdown_content" if entry.markdown_content else "content"
+    counted_after = "markdown_content" if markdown else "content"
+    if (
+        counted_before == counted_after == body.target
+        and entry.word_count is not None
+        and entry.char_count == len(before)
+    ):
+        update_data["word_count"] = entry.word_count + word_count_delta(before, edits)
+        update_data["char_count"] = entry.char_count + char_count_delta(edits)
+    else:
+        text_for_metrics = extract_text_for_metrics(update_data["content"], markdown)
+        word_count, char_count = count_words_chars(text_for_metrics)
+        update_data["word_count"] = word_count
+        update_data["char_count"] = char_count
+    update_data["content"] = storable_html(update_data["content"], markdown)
+    return update_data
+
+
+async def _entry_response(row: Entry, prefer_md: bool = False) -> dict[str, Any]:
+    """Create stable entry response with backward compatibility.
+
+    Built directly in the shape of ``EntryResponse`` rather than through the
+    model: this runs once per item of every listing. HTML that is not stored
+    is rendered from markdown here (see ``entry_html``).
+
+    Returns:
+        Dictionary with entry data including content block and legacy fields.
+    """
+    html = await entry_html(row.id, row.version, row.content, row.markdown_content)
+    markdown = row.markdown_content
+    md_first = prefer_md and bool(markdown)
+    return {
+        "id": row.id,
+        "title": row.title,
+        "content_block": {
+            "html": html,
+            "markdown": markdown,
+            "format_preference": "markdown" if md_first else "html",
+            "version": row.content_version,
+        },
+        "metrics": {
+            "word_count": row.word_count or 0,
+            "char_count": row.char_count or 0,
+        },
         # Legacy fields
-        content=legacy_content,
-        markdown_content=row.markdown_content,
-        word_count=row.word_count,
-        char_count=row.char_count,
-        version=row.version,
-        author_id=row.author_id,
-        created_at=row.created_at,
-        updated_at=row.updated_at,
-        is_deleted=row.is_deleted,
-        content_version=row.content_version,
-        editor_mode=editor_mode,
-    )
+        "content": markdown if md_first else html,
+        "markdown_content": markdown,
+        "word_count": row.word_count,
+        "char_count": row.char_count,
+        "version": row.version,
+        "author_id": row.author_id,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "is_deleted": row.is_deleted,
+        "content_version": row.content_version,
+        "editor_mode": "markdown" if prefer_md else "html",
+    }
+
 
-    return response.model_dump()
+def _summary_response(row: RowMapping, fields: list[str]) -> dict[str, Any]:
+    """Build a lightweight listing item from summary columns only."""
+    item: dict[str, Any] = {"id": row["id"]}
+    for name in fields:
+        if name in {"word_count", "char_count"}:
+            item.setdefault("metrics", {})[name] = row[name] or 0
+        else:
+            item[name] = row[name]
+    return item
+
+
+def _summary_fields(view: str, fields: str | None) -> list[str] | None:
+    """Resolve requested summary fields; None means the full representation."""
+    if fields is None:
+        return list(SUMMARY_COLUMNS[1:]) if view == "summary" else None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(names) - set(SUMMARY_COLUMNS))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; "
+            f"allowed: {', '.join(SUMMARY_COLUMNS)}",
+        )
+    return [name for name in names if name != "id"]
 
 
-@router.get("")
+@router.get("", response_model=list[dict[str, Any]])
 async def get_entries(
     request: Request,
+    response: Response,
     user_id: Annotated[str, Depends(require_user)],
-    s: Annotated[AsyncSession, Depends(get_session)],
+    s: Annotated[AsyncSession, Depends(get_read_session)],
     # Support both skip and offset for pagination
     skip: Annotated[int, Query(ge=0, description="Number of entries to skip")] = 0,
     limit: Annotated[
@@ -140,28 +450,88 @@ async def get_entries(
     offset: Annotated[
         int | None, Query(ge=0, description="Legacy offset parameter")
     ] = None,
-) -> list[dict[str, Any]]:
+    cursor: Annotated[
+        str | None, Query(description="Opaque cursor from X-Next-Cursor")
+    ] = None,
+    view: Annotated[
+        Literal["full", "summary"],
+        Query(description="'summary' returns title, excerpt and metrics only"),
+    ] = "full",
+    fields: Annotated[
+        str | None, Query(description="Comma-separated summary fields to return")
+    ] = None,
+) -> Response:
     """List entries with pagination support.
 
-    Supports both 'skip' (preferred) and 'offset' (legacy) parameters.
+    Pages by ``cursor`` (preferred); 'skip' and 'offset' (legacy) are still
+    accepted when no cursor is given. The cursor for the following page is
+    returned in the ``X-Next-Cursor`` header while more entries may follow.
+
+    ``view=summary`` or ``fields=`` skip entry bodies entirely and read only
+    the stored excerpt and metadata.
 
     Returns:
         List of entry dictionaries with content and metrics.
     """
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
     # Use offset if provided (legacy support), otherwise use skip
     start = offset if offset is not None else skip
 
     # When user management is enabled, filter by user ID
     author_id = UUID(user_id) if settings.user_mgmt_enabled else None
-    rows = await list_entries(s, author_id=author_id, limit=limit, offset=start)
+    summary_fields = _summary_fields(view, fields)
+    if summary_fields is not None:
+        summaries = await list_entry_summaries(
+            s,
+            author_id=author_id,
+            limit=limit,
+            offset=start,
+            after=after,
+            fields=summary_fields,
+        )
+        if len(summaries) == limit:
+            last = summaries[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                last["created_at"], last["id"]
+            )
+        _check_not_modified(
+            request,
+            response,
+            list_etag(
+                ((r["id"], r["version"]) for r in summaries),
+                f"summary:{','.join(summary_fields)}",
+            ),
+        )
+        return json_response(
+            [_summary_response(r, summary_fields) for r in summaries], response
+        )
+
+    rows = await list_entries(
+        s, author_id=author_id, limit=limit, offset=start, after=after
+    )
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            rows[-1].created_at, rows[-1].id
+        )
     prefer_md = _prefer_markdown(request)
-    return [_entry_response(r, prefer_md) for r in rows]
+    _check_not_modified(
+        request,
+        response,
+        list_etag(((r.id, r.version) for r in rows), _representation(prefer_md)),
+    )
+    return json_response([await _entry_response(r, prefer_md) for r in rows], response)
 
 
 @router.post("", status_code=201)
 async def post_entry(
     body: EntryCreate,
     request: Request,
+    response: Response,
     user_id: Annotated[str, Depends(require_user)],
     s: Annotated[AsyncSession, Depends(get_session)],
 ) -> dict[str, Any]:
@@ -170,50 +540,347 @@ async def post_entry(
     Returns:
         Created entry dictionary with generated ID and metrics.
     """
-    html_content = body.content or ""
-    md_content = body.markdown_content
-    # Use provided version or default based on content type
-    # content_version has default=1 in the model, so it's never None
-    version = body.content_version
-
-    # Generate HTML from markdown when markdown is provided
-    if md_content is not None:
-        html_content = markdown_to_html(md_content)
-
-    # Calculate metrics
-    text_for_metrics = extract_text_for_metrics(html_content, md_content)
-    word_count, char_count = count_words_chars(text_for_metrics)
-
     # Create entry with repository pattern
     repo = EntryRepository(s)
-    entry_data = {
-        "author_id": UUID(user_id),
-        "title": body.title,
-        "content": html_content,
-        "markdown_content": md_content,
-        "content_version": version,
-        "word_count": word_count,
-        "char_count": char_count,
-    }
-
+    entry_data = await _create_data(body, UUID(user_id))
     entry = await repo.create(entry_data)
+    await record_revisions(s, [RevisionSource.of(entry)])
     await s.commit()
 
     # Generate embedding after commit
     await ensure_embedding_for_entry(entry, s)
 
-    return _entry_response(entry, _prefer_markdown(request))
+    prefer_md = _prefer_markdown(request)
+    response.headers["ETag"] = entry_etag(
+        entry.id, entry.version, _representation(prefer_md)
+    )
+    return await _entry_response(entry, prefer_md)
+
+
+def _entry_event(entry: Entry, event_type: str) -> dict[str, Any]:
+    """Outbox row for an entry write, inserted in bulk by the batch endpoint."""
+    data: dict[str, Any] = {"entry_id": str(entry.id), "version": entry.version}
+    if event_type == "entry.created":
+        data["title"] = entry.title
+    return {
+        "aggregate_id": entry.id,
+        "aggregate_type": "Entry",
+        "event_type": event_type,
+        "event_data": data,
+    }
+
+
+# Content types accepted by the import endpoint
+IMPORT_CONTENT_TYPES: dict[str, ImportFormat] = {
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/zip": "zip",
+    "application/x-zip-compressed": "zip",
+}
 
 
-@router.get("/{entry_id}")
+@router.post("/import", status_code=202)
+async def post_entries_import(
+    request: Request,
+    response: Response,
+    user_id: Annotated[str, Depends(require_user)],
+    fmt: Annotated[
+        ImportFormat | None,
+        Query(alias="format", description="Overrides the Content-Type"),
+    ] = None,
+) -> dict[str, Any]:
+    """Start a bulk import of a JSON Lines file or a zip of Markdown files.
+
+    The request body is the archive itself. It is spooled to disk and imported
+    by a background job; poll ``Location`` for progress.
+
+    Raises:
+        HTTPException: 415 for an unknown format, 413 when the body exceeds
+            ``import_max_bytes``, 400 for a body that is not a zip archive.
+    """
+    content_type = request.headers.get("Content-Type", "").split(";")[0].strip()
+    fmt = fmt or IMPORT_CONTENT_TYPES.get(content_type.lower())
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Send one of: {', '.join(IMPORT_CONTENT_TYPES)}",
+        )
+
+    fd, name = tempfile.mkstemp(prefix="journal-import-", suffix=f".{fmt}")
+    path = Path(name)
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as fh:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.import_max_bytes:
+                    raise HTTPException(status_code=413, detail="Archive too large")
+                fh.write(chunk)
+        if fmt == "zip" and not zipfile.is_zipfile(path):
+            raise HTTPException(status_code=400, detail="Body is not a zip archive")
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    job = start_import_job(sessionmaker_for(build_engine()), path, fmt, UUID(user_id))
+    response.headers["Location"] = f"{request.url.path}/{job.id}"
+    return job.as_dict()
+
+
+@router.get("/import/{job_id}")
+async def get_entries_import(
+    job_id: str,
+    user_id: Annotated[str, Depends(require_user)],
+) -> dict[str, Any]:
+    """Progress of an import job started by this user on this instance."""
+    job = get_import_job(job_id)
+    if job is None or job.author_id != UUID(user_id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.as_dict()
+
+
+@router.post("/batch")
+async def post_entries_batch(
+    body: EntryBatch,
+    request: Request,
+    user_id: Annotated[str, Depends(require_user)],
+    s: Annotated[AsyncSession, Depends(get_session)],
+) -> dict[str, Any]:
+    """Apply up to ``BATCH_MAX_OPERATIONS`` entry operations in one transaction.
+
+    Creates share one flush; updates and deletes share one locking SELECT
+    and one flush; gets are answered by one SELECT after the writes, so they
+    see the batch's own changes. Outbox events and revisions for all writes
+    are inserted in bulk and the batch commits once. A missing entry (404) or version
+    conflict (409) fails only its own operation.
+
+    Returns:
+        ``results`` in request order, each with ``index``, ``op`` and ``status``.
+    """
+    author_id = UUID(user_id)
+    owner = author_id if settings.user_mgmt_enabled else None
+    prefer_md = _prefer_markdown(request)
+    repo = EntryRepository(s)
+    representation = _representation(prefer_md)
+    ops = body.operations
+    results: list[dict[str, Any]] = [
+        {"index": i, "op": op.op} for i, op in enumerate(ops)
+    ]
+    events: list[dict[str, Any]] = []
+    revisions: list[RevisionSource] = []
+    embed: list[Entry] = []
+
+    async def _written(entry: Entry) -> dict[str, Any]:
+        # Serialized right away so repeated writes to one entry report each step
+        return {
+            "entry": await _entry_response(entry, prefer_md),
+            "etag": entry_etag(entry.id, entry.version, representation),
+        }
+
+    creates = [(i, op) for i, op in enumerate(ops) if isinstance(op, BatchCreate)]
+    if creates:
+        # Rendering of large documents overlaps in the render pool
+        rows = await asyncio.gather(*(_create_data(op, author_id) for _, op in creates))
+        entries = await repo.create_many(list(rows))
+        for (i, _op), entry in zip(creates, entries, strict=True):
+            results[i].update(status=201, **await _written(entry))
+            events.append(_entry_event(entry, "entry.created"))
+            revisions.append(RevisionSource.of(entry))
+            embed.append(entry)
+
+    writes = [
+        (i, op) for i, op in enumerate(ops) if isinstance(op, BatchUpdate | BatchDelete)
+    ]
+    if writes:
+        # Render before taking row locks so they are held only for the writes
+        updates = [(i, op) for i, op in writes if isinstance(op, BatchUpdate)]
+        prepared = dict(
+            zip(
+                [i for i, _ in updates],
+                await asyncio.gather(*(_update_data(op) for _, op in updates)),
+                strict=True,
+            )
+        )
+        locked = await repo.lock_many(sorted({op.id for _, op in writes}), owner)
+        for i, op in writes:
+            entry = locked.get(op.id)
+            try:
+                if entry is None:
+                    raise NotFoundError("entry", op.id)
+                if isinstance(op, BatchUpdate):
+                    data = prepared[i]
+                    repo.apply_update(entry, data, op.expected_version)
+                    results[i].update(status=200, **await _written(entry))
+                    events.append(_entry_event(entry, "entry.updated"))
+                    revisions.append(RevisionSource.of(entry))
+                    if "content" in data:
+                        embed.append(entry)
+                else:
+                    repo.apply_soft_delete(entry, op.expected_version)
+                    results[i]["status"] = 204
+                    events.append(_entry_event(entry, "entry.deleted"))
+            except NotFoundError:
+                results[i].update(status=404, detail="Entry not found")
+            except ConflictError as c:
+                results[i].update(status=409, detail=_conflict_detail(c))
+        await s.flush()
+
+    if events:
+        await s.execute(insert(Event), events)
+    if revisions:
+        await record_revisions(s, revisions)
+
+    gets = [(i, op) for i, op in enumerate(ops) if isinstance(op, BatchGet)]
+    if gets:
+        wanted = list({eid for _, op in gets for eid in op.ids})
+        found = {e.id: e for e in await repo.get_many(wanted, owner)}
+        for i, op in gets:
+            results[i].update(
+                status=200,
+                entries=[
+                    await _entry_response(found[eid], prefer_md)
+                    for eid in op.ids
+                    if eid in found
+                ],
+                missing=[eid for eid in op.ids if eid not in found],
+            )
+
+    await s.commit()
+
+    for entry in dict.fromkeys(embed):
+        await ensure_embedding_for_entry(entry, s)
+
+    return {"results": results}
+
+
+async def _change_item(row: Entry, prefer_md: bool) -> dict[str, Any]:
+    """Full entry for live rows, a tombstone for soft-deleted ones."""
+    if row.is_deleted:
+        return {
+            "id": row.id,
+            "version": row.version,
+            "is_deleted": True,
+            "updated_at": row.updated_at,
+        }
+    return await _entry_response(row, prefer_md)
+
+
+@router.get("/changes")
+async def get_entry_changes(
+    request: Request,
+    user_id: Annotated[str, Depends(require_user)],
+    s: Annotated[AsyncSession, Depends(get_session)],
+    since: Annotated[
+        str | None, Query(description="Cursor from a previous next_cursor")
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=500, description="Maximum changes to return")
+    ] = 100,
+) -> dict[str, Any]:
+    """Entries changed since a server-issued cursor, tombstones included.
+
+    Without ``since`` this is a full sync of live entries. Clients store
+    ``next_cursor`` and pass it back as ``since``; ``has_more`` tells them to
+    keep paging.
+
+    Returns:
+        ``changes``, ``next_cursor`` and ``has_more``.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    after = None
+    if since is not None:
+        try:
+            after = decode_change_cursor(since)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+    rows = await list_entry_changes(s, author_id=author_id, after=after, limit=limit)
+    if rows:
+        next_cursor = encode_change_cursor(rows[-1].change_xid, rows[-1].change_seq)
+    else:
+        next_cursor = since or encode_change_cursor(0, 0)
+
+    prefer_md = _prefer_markdown(request)
+    return {
+        "changes": [await _change_item(r, prefer_md) for r in rows],
+        "next_cursor": next_cursor,
+        "has_more": len(rows) == limit,
+    }
+
+
+def _seconds_to_midnight(now: datetime) -> int:
+    """Seconds until the next local midnight of the aware ``now``."""
+    midnight = datetime.combine(now.date() + timedelta(days=1), time(), now.tzinfo)
+    return max(1, int(midnight.timestamp() - now.timestamp()))
+
+
+@router.get("/on-this-day", response_model=list[dict[str, Any]])
+async def get_on_this_day(
+    response: Response,
+    user_id: Annotated[str, Depends(require_user)],
+    s: Annotated[AsyncSession, Depends(get_session)],
+    redis: Annotated[Redis, Depends(get_redis_client)],
+    tz: Annotated[str, Query(description="IANA time zone of the user")] = "UTC",
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum entries to return")
+    ] = 20,
+) -> Response:
+    """Entries written on today's calendar day in earlier years.
+
+    Returns summaries (no bodies), newest first. The answer is cached per
+    user until the next midnight in ``tz``; edits to the listed entries
+    show from the next day.
+
+    Raises:
+        HTTPException: If the time zone is unknown.
+    """
+    try:
+        now = datetime.now(ZoneInfo(tz))
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}") from exc
+
+    ttl = _seconds_to_midnight(now)
+    response.headers["Cache-Control"] = f"private, max-age={ttl}"
+    author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+    key = f"entries:on-this-day:{author_id or 'all'}:{tz}:{now.date()}:{limit}"
+    try:
+        cached = await redis.get(key)
+    except RedisError:
+        logger.warning("on-this-day cache unavailable", exc_info=True)
+        cached = None
+    if cached is not None:
+        return encoded_json_response(cached, response)
+
+    rows = await list_on_this_day(
+        s, now.date(), tz=tz, author_id=author_id, limit=limit
+    )
+    body = json_bytes([
+        {**row, "years_ago": now.year - row["created_at"].astimezone(now.tzinfo).year}
+        for row in rows
+    ])
+    try:
+        await redis.set(key, body, ex=ttl)
+    except RedisError:
+        logger.warning("on-this-day cache unavailable", exc_info=True)
+    return encoded_json_response(body, response)
+
+
+@router.get("/{entry_id}", response_model=EntryResponse)
 async def get_entry(
     entry_id: str,
     request: Request,
+    response: Response,
     user_id: Annotated[str, Depends(require_user)],
     s: Annotated[AsyncSession, Depends(get_session)],
-) -> dict[str, Any]:
+) -> Response:
     """Get a single entry by ID.
 
+    Answers ``304 Not Modified`` when ``If-None-Match`` carries the current
+    ETag, checked against the version alone before the entry body is loaded.
+
     Returns:
         Entry dictionary with content and metadata.
 
@@ -225,6 +892,15 @@ async def get_entry(
     except ValueError as e:
         raise HTTPException(status_code=404, detail="Entry not found") from e
 
+    representation = _representation(_prefer_markdown(request))
+    author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+    if request.headers.get("If-None-Match"):
+        version = await get_entry_version(s, eid, author_id)
+        if version is not None:
+            _check_not_modified(
+                request, response, entry_etag(eid, version, representation)
+            )
+
     repo = EntryRepository(s)
     entry = await repo.get_by_id(eid)
 
@@ -232,10 +908,87 @@ async def get_entry(
         raise HTTPException(status_code=404, detail="Entry not found")
 
     # Check ownership if user management is enabled
-    if settings.user_mgmt_enabled and str(entry.author_id) != user_id:
+    if author_id is not None and entry.author_id != author_id:
         raise HTTPException(status_code=404, detail="Entry not found")
 
-    return _entry_response(entry, _prefer_markdown(request))
+    _check_not_modified(
+        request, response, entry_etag(entry.id, entry.version, representation)
+    )
+    return json_response(
+        await _entry_response(entry, representation == "markdown"), response
+    )
+
+
+async def _revision_entry(s: AsyncSession, entry_id: str, user_id: str) -> UUID:
+    """ID of a live entry the user may read revisions of, else 404."""
+    try:
+        eid = UUID(entry_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail="Entry not found") from e
+    author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+    if await get_entry_version(s, eid, author_id) is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return eid
+
+
+@router.get("/{entry_id}/revisions")
+async def get_entry_revisions(
+    entry_id: str,
+    response: Response,
+    user_id: Annotated[str, Depends(require_user)],
+    s: Annotated[AsyncSession, Depends(get_session)],
+    before: Annotated[
+        int | None, Query(ge=1, description="Only revisions older than this version")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+) -> list[dict[str, Any]]:
+    """List kept revisions of an entry, newest first, without their text.
+
+    When the page is full, ``X-Next-Cursor`` holds the ``before`` value of the
+    next page.
+    """
+    eid = await _revision_entry(s, entry_id, user_id)
+    revisions = await list_revisions(s, eid, before, limit)
+    if len(revisions) == limit:
+        response.headers["X-Next-Cursor"] = str(revisions[-1]["version"])
+    return revisions
+
+
+@router.get("/{entry_id}/revisions/{version}")
+async def get_entry_revision(
+    entry_id: str,
+    version: int,
+    response: Response,
+    user_id: Annotated[str, Depends(require_user)],
+    s: Annotated[AsyncSession, Depends(get_session)],
+) -> dict[str, Any]:
+    """Get an entry as it was at ``version``.
+
+    Returns:
+        Title, text (``markdown_content`` and rendered ``content`` for markdown
+        revisions, ``content`` for HTML ones) and revision metadata.
+
+    Raises:
+        HTTPException: If the entry or that revision is not kept (404).
+    """
+    eid = await _revision_entry(s, entry_id, user_id)
+    found = await get_revision(s, eid, version)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    revision, text = found
+    markdown = revision.content_format == "markdown"
+    # A version's text never changes
+    response.headers["Cache-Control"] = "private, max-age=86400"
+    return {
+        "entry_id": eid,
+        "version": revision.version,
+        "title": revision.title,
+        "content_format": revision.content_format,
+        "content": await render_markdown(text) if markdown else text,
+        "markdown_content": text if markdown else None,
+        "autosave": revision.autosave,
+        "created_at": revision.created_at,
+    }
 
 
 @router.put("/{entry_id}")
@@ -243,16 +996,21 @@ async def update_entry(
     entry_id: str,
     body: EntryUpdate,
     request: Request,
+    response: Response,
     user_id: Annotated[str, Depends(require_user)],
     s: Annotated[AsyncSession, Depends(get_session)],
 ) -> dict[str, Any]:
     """Update entry with optimistic locking.
 
+    The expected version comes from ``If-Match`` (an ETag of the entry) or
+    from ``expected_version`` in the body.
+
     Returns:
         Updated entry dictionary with new version.
 
     Raises:
-        HTTPException: If entry not found or version conflict.
+        HTTPException: If entry not found, version conflict (409, or 412 for
+            If-Match) or no precondition given (428).
     """
     try:
         eid = UUID(entry_id)
@@ -260,54 +1018,109 @@ async def update_entry(
         raise HTTPException(status_code=404, detail="Entry not found") from e
 
     repo = EntryRepository(s)
+    expected_version, from_if_match = await _write_precondition(
+        request, repo, eid, body.expected_version
+    )
 
-    # Prepare update data from body (excluding control field)
-    update_data = body.model_dump(exclude={"expected_version"}, exclude_unset=True)
-
-    # If markdown is provided, it takes priority and always generates HTML
-    if body.markdown_content is not None:
-        update_data["content"] = markdown_to_html(body.markdown_content)
-        # Default content_version to 2 for markdown when not explicitly provided
-        if (
-            "content_version" not in update_data
-            or update_data["content_version"] is None
-        ):
-            update_data["content_version"] = 2
-
-    # Update metrics if content changed (HTML and/or markdown)
-    if "content" in update_data or "markdown_content" in update_data:
-        text_for_metrics = extract_text_for_metrics(
-            update_data.get("content"), update_data.get("markdown_content")
-        )
-        word_count, char_count = count_words_chars(text_for_metrics)
-        update_data["word_count"] = word_count
-        update_data["char_count"] = char_count
+    update_data = await _update_data(body)
 
     try:
         # Pass author_id for ownership check if user management is enabled
         author_id = UUID(user_id) if settings.user_mgmt_enabled else None
-        entry = await repo.update_entry(
-            eid, update_data, body.expected_version, author_id
-        )
+        entry = await repo.update_entry(eid, update_data, expected_version, author_id)
+        await record_revisions(s, [RevisionSource.of(entry)])
         await s.commit()
 
         # Generate embedding after successful update
         if "content" in update_data or "markdown_content" in update_data:
             await ensure_embedding_for_entry(entry, s)
 
-        return _entry_response(entry, _prefer_markdown(request))
+        prefer_md = _prefer_markdown(request)
+        response.headers["ETag"] = entry_etag(
+            entry.id, entry.version, _representation(prefer_md)
+        )
+        return await _entry_response(entry, prefer_md)
 
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail="Entry not found") from e
     except ConflictError as c:
-        raise HTTPException(
-            status_code=409,
-            detail={
-                "message": str(c),
-                "expected_version": c.expected,
-                "actual_version": c.actual,
-            },
-        ) from c
+        raise _conflict(c, from_if_match) from c
+
+
+@router.patch("/{entry_id}")
+async def patch_entry(
+    entry_id: str,
+    body: EntryPatch,
+    request: Request,
+    response: Response,
+    user_id: Annotated[str, Depends(require_user)],
+    s: Annotated[AsyncSession, Depends(get_session)],
+) -> dict[str, Any]:
+    """Apply text edits to an entry (autosave) with optimistic locking.
+
+    The edits are made against the version named by ``If-Match`` or
+    ``expected_version``; only the changed spans travel over the wire. Word and
+    character counts are adjusted from the edited regions.
+
+    Returns:
+        ``id``, ``version`` and ``metrics`` of the patched entry, or the full
+        entry when the request sends ``Prefer: return=representation``.
+
+    Raises:
+        HTTPException: If entry not found, version conflict (409, or 412 for
+            If-Match), no precondition given (428) or the edits do not apply
+            to that version (422).
+    """
+    try:
+        eid = UUID(entry_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail="Entry not found") from e
+    if not body.edits and body.title is None:
+        raise HTTPException(status_code=422, detail="Nothing to patch")
+
+    repo = EntryRepository(s)
+    expected_version, from_if_match = await _write_precondition(
+        request, repo, eid, body.expected_version
+    )
+
+    try:
+        # Pass author_id for ownership check if user management is enabled
+        author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+        entry = await repo.lock(eid, author_id)
+        if entry.is_deleted:
+            raise NotFoundError("entry", eid)
+        # Edits are only meaningful against the version they were made on
+        repo.check_version(entry, expected_version)
+        update_data = await _patch_data(entry, body)
+        repo.apply_update(entry, update_data, expected_version)
+        await record_revisions(s, [RevisionSource.of(entry)], autosave=True)
+        await s.flush()
+        await s.commit()
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail="Entry not found") from e
+    except ConflictError as c:
+        raise _conflict(c, from_if_match) from c
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    if body.edits:
+        await ensure_embedding_for_entry(entry, s)
+
+    prefer_md = _prefer_markdown(request)
+    response.headers["ETag"] = entry_etag(
+        entry.id, entry.version, _representation(prefer_md)
+    )
+    if "return=representation" in request.headers.get("Prefer", ""):
+        response.headers["Preference-Applied"] = "return=representation"
+        return await _entry_response(entry, prefer_md)
+    return {
+        "id": entry.id,
+        "version": entry.version,
+        "metrics": {
+            "word_count": entry.word_count or 0,
+            "char_count": entry.char_count or 0,
+        },
+    }
 
 
 @router.delete(
@@ -319,18 +1132,21 @@ async def update_entry(
 )
 async def delete_entry(
     entry_id: str,
-    expected_version: Annotated[
-        int, Query(description="Expected version for optimistic locking")
-    ],
+    request: Request,
     user_id: Annotated[str, Depends(require_user)],
     s: Annotated[AsyncSession, Depends(get_session)],
+    expected_version: Annotated[
+        int | None,
+        Query(description="Expected version for optimistic locking (or If-Match)"),
+    ] = None,
 ) -> None:
     """Soft delete entry with optimistic locking.
 
     Returns 204 No Content on success to match API expectations.
 
     Raises:
-        HTTPException: If entry not found or version conflict.
+        HTTPException: If entry not found, version conflict (409, or 412 for
+            If-Match) or no precondition given (428).
     """
     try:
         eid = UUID(entry_id)
@@ -338,11 +1154,14 @@ async def delete_entry(
         raise HTTPException(status_code=404, detail="Entry not found") from e
 
     repo = EntryRepository(s)
+    version, from_if_match = await _write_precondition(
+        request, repo, eid, expected_version
+    )
 
     try:
         # Pass author_id for ownership check if user management is enabled
         author_id = UUID(user_id) if settings.user_mgmt_enabled else None
-        await repo.soft_delete(eid, expected_version, author_id)
+        await repo.soft_delete(eid, version, author_id)
         await s.commit()
         # Return None for 204 No Content response
         return
@@ -350,14 +1169,7 @@ async def delete_entry(
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail="Entry not found") from e
     except ConflictError as c:
-        raise HTTPException(
-            status_code=409,
-            detail={
-                "message": str(c),
-                "expected_version": c.expected,
-                "actual_version": c.actual,
-            },
-        ) from c
+        raise _conflict(c, from_if_match) from c
 
 
 # Removed duplicate PUT and DELETE routes in favor of optimistic-locking variants above.
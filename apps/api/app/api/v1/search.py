@@ -3,29 +3,30 @@ from __future__ import annotations
 from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db import get_session
+from app.infra.db import get_read_session, get_session
 from app.infra.sa_models import Entry
 from app.infra.search_pgvector import (
     hybrid_search,
     semantic_search,
     upsert_entry_embedding,
 )
+from app.infra.serialization import json_response
 
 
 router = APIRouter(prefix="", tags=["search"])
 
 
-@router.get("/search")
+@router.get("/search", response_model=list[dict[str, Any]])
 async def search_hybrid(
     q: Annotated[str, Query(min_length=1, description="Search query")],
-    s: Annotated[AsyncSession, Depends(get_session)],
+    s: Annotated[AsyncSession, Depends(get_read_session)],
     k: Annotated[int, Query(ge=1, le=100, description="Number of results")] = 10,
     alpha: float = 0.6,
-) -> list[dict[str, Any]]:
+) -> Response:
     """Perform hybrid search combining keyword and semantic search.
 
     Args:
@@ -42,13 +43,13 @@ async def search_hybrid(
     """
     if not (0.0 <= float(alpha) <= 1.0):
         raise HTTPException(400, "alpha must be in [0,1]")
-    return await hybrid_search(s, q=q, k=k, alpha=alpha)
+    return json_response(await hybrid_search(s, q=q, k=k, alpha=alpha))
 
 
-@router.post("/search/semantic")
+@router.post("/search/semantic", response_model=list[dict[str, Any]])
 async def search_semantic(
-    body: dict[str, Any], s: Annotated[AsyncSession, Depends(get_session)]
-) -> list[dict[str, Any]]:
+    body: dict[str, Any], s: Annotated[AsyncSession, Depends(get_read_session)]
+) -> Response:
     """Perform semantic search using embeddings.
 
     Args:
@@ -65,7 +66,7 @@ async def search_semantic(
     k = int(body.get("k", 10))
     if not q:
         raise HTTPException(400, "Missing 'q'")
-    return await semantic_search(s, q=q, k=k)
+    return json_response(await semantic_search(s, q=q, k=k))
 
 
 @router.post("/search/entries/{entry_id}/embed")
@@ -91,6 +92,6 @@ async def embed_entry(
     row = (await s.execute(select(Entry).where(Entry.id == eid))).scalars().first()
     if not row:
         raise HTTPException(404, "Entry not found")
-    text_source = (row.title or "") + " " + (row.content or "")
+    text_source = (row.title or "") + " " + (row.content or row.markdown_content or "")
     await upsert_entry_embedding(s, entry_id=row.id, text_source=text_source)
     return {"status": "ok", "entry_id": str(row.id)}
@@ -9,17 +9,20 @@ This module demonstrates production-grade SQLAlchemy 2.0 query patterns with:
 
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import TypedDict
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import Integer, and_, cast, func, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db import get_session
+from app.infra.db import get_read_session
 from app.infra.enhanced_auth import require_user
-from app.infra.sa_models import Entry
+from app.infra.entry_stats import read_activity
+from app.infra.sa_models import UserEntryStatsDaily, UserEntryStatsTotal
+from app.settings import settings
 
 
 router = APIRouter(tags=["stats"])
@@ -54,78 +57,67 @@ class StatsResponse(BaseModel):
     favorite_entries: int = Field(default=0, ge=0, description="Favorite entries count")
 
 
-async def get_entry_stats(session: AsyncSession, user_id: str) -> StatsQueryResult:
-    """Get entry statistics using optimized SQLAlchemy 2.0 queries.
+class ActivityResponse(BaseModel):
+    """Per-day writing activity over a window of UTC days."""
 
-    This function demonstrates:
-    - Proper use of SQLAlchemy's comparison operators (== False instead of not)
-    - Efficient single-query aggregation with conditional counting
-    - Type-safe result handling with TypedDict
+    start: date = Field(..., description="Day of the first element of each list")
+    end: date = Field(..., description="Day of the last element (today, UTC)")
+    entries: list[int] = Field(..., description="Entries created per day")
+    words: list[int] = Field(..., description="Words in the entries of each day")
+    chars: list[int] = Field(..., description="Characters in the entries of each day")
+    current_streak: int = Field(
+        ..., ge=0, description="Consecutive days with entries up to today"
+    )
+    longest_streak: int = Field(
+        ..., ge=0, description="Longest run of consecutive days with entries"
+    )
+
+
+async def get_entry_stats(
+    session: AsyncSession, author_id: UUID | None
+) -> StatsQueryResult:
+    """Get entry statistics from the per-user daily counters.
+
+    Reads the running total from ``user_entry_stats_total`` and only the
+    days of the current week and month (and the last seven days) from
+    ``user_entry_stats_daily`` (see ``app.infra.entry_stats``), instead of
+    aggregating ``entries``. Days are UTC; "recent" counts entries last
+    updated on or after the day seven days ago.
 
     Args:
         session: Async database session
-        user_id: ID of the user requesting stats
+        author_id: Author whose entries are counted; None counts all authors
 
     Returns:
         TypedDict with all statistics
     """
-    now = _utcnow()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = now - timedelta(days=now.weekday())
-    week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    recent_cutoff = now - timedelta(days=7)
-
-    # Single optimized query using conditional aggregation
-    # This is more efficient than multiple queries and demonstrates
-    # advanced SQLAlchemy patterns
-    stats_query = select(
-        # Total entries (using proper SQLAlchemy comparison)
-        func.count(Entry.id).label("total_entries"),
-        # Conditional counts using CASE expressions
-        func.sum(
-            cast(
-                and_(
-                    Entry.created_at >= today_start,
-                    Entry.is_deleted == False,  # noqa: E712 - SQLAlchemy requires ==
-                ),
-                Integer,
-            )
-        ).label("entries_today"),
-        func.sum(
-            cast(
-                and_(
-                    Entry.created_at >= week_start,
-                    Entry.is_deleted == False,  # noqa: E712
-                ),
-                Integer,
-            )
-        ).label("entries_this_week"),
-        func.sum(
-            cast(
-                and_(
-                    Entry.created_at >= month_start,
-                    Entry.is_deleted == False,  # noqa: E712
-                ),
-                Integer,
-            )
-        ).label("entries_this_month"),
-        func.sum(
-            cast(
-                and_(
-                    Entry.updated_at >= recent_cutoff,
-                    Entry.is_deleted == False,  # noqa: E712
-                ),
-                Integer,
-            )
-        ).label("recent_entries"),
-    ).where(
-        Entry.is_deleted == False  # noqa: E712 - SQLAlchemy requires == for proper SQL generation
-    )
+    today = _utcnow().date()
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    recent_since = today - timedelta(days=7)
 
-    # Execute query and handle results with proper typing
-    result = await session.execute(stats_query)
-    row = result.one()
+    total_query = select(func.sum(UserEntryStatsTotal.entries))
+    if author_id is not None:
+        total_query = total_query.where(UserEntryStatsTotal.author_id == author_id)
+
+    daily = UserEntryStatsDaily
+    stats_query = select(
+        total_query.scalar_subquery().label("total_entries"),
+        func.sum(daily.created).filter(daily.day >= today).label("entries_today"),
+        func.sum(daily.created)
+        .filter(daily.day >= week_start)
+        .label("entries_this_week"),
+        func.sum(daily.created)
+        .filter(daily.day >= month_start)
+        .label("entries_this_month"),
+        func.sum(daily.updated)
+        .filter(daily.day >= recent_since)
+        .label("recent_entries"),
+    ).where(daily.day >= min(week_start, month_start, recent_since))
+    if author_id is not None:
+        stats_query = stats_query.where(daily.author_id == author_id)
+
+    row = (await session.execute(stats_query)).one()
 
     # Return typed result with null coalescing
     return StatsQueryResult(
@@ -146,7 +138,7 @@ async def get_entry_stats(session: AsyncSession, user_id: str) -> StatsQueryResu
 )
 async def get_stats(
     user_id: str = Depends(require_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> StatsResponse:
     """Get statistics about user's journal entries.
 
@@ -155,7 +147,9 @@ async def get_stats(
     - Efficient database query patterns
     - Clean separation of concerns
     """
-    stats = await get_entry_stats(session, user_id)
+    # When user management is enabled, count only the caller's entries
+    author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+    stats = await get_entry_stats(session, author_id)
 
     return StatsResponse(
         total_entries=stats["total_entries"],
@@ -165,3 +159,37 @@ async def get_stats(
         recent_entries=stats["recent_entries"],
         favorite_entries=0,  # Placeholder for future feature
     )
+
+
+@router.get(
+    "/stats/activity",
+    response_model=ActivityResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get writing activity",
+    description="Returns per-day entries, words and characters plus streaks",
+)
+async def get_activity(
+    days: int = Query(365, ge=1, le=731, description="Days to return, ending today"),
+    user_id: str = Depends(require_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> ActivityResponse:
+    """Calendar heatmap data and streaks from the user's activity row.
+
+    One row read (``user_entry_activity``) serves the whole response;
+    streaks span the user's full history, not just the window.
+    """
+    author_id = UUID(user_id) if settings.user_mgmt_enabled else None
+    activity = await read_activity(session, author_id)
+    today = _utcnow().date()
+    current, longest = activity.streaks(today)
+    window = activity.window(today - timedelta(days=days - 1), today)
+
+    return ActivityResponse(
+        start=window.first,
+        end=today,
+        entries=window.entries,
+        words=window.words,
+        chars=window.chars,
+        current_streak=current,
+        longest_streak=longest,
+    )
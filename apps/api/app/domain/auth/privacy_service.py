@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Callable
 import csv
 from datetime import UTC, datetime, timedelta
 import io
 import json
 import secrets
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
+import zipfile
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.auth.audit_service import AuditService
@@ -24,6 +26,119 @@ from app.infra.sa_models import (
 )
 
 
+ExportFormat = Literal["json", "csv", "zip"]
+
+# Rows fetched per server-side cursor round trip while exporting
+EXPORT_BATCH_SIZE = 500
+# Encoded output is handed on in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+CSV_FIELDS = [
+    "id",
+    "title",
+    "content",
+    "markdown_content",
+    "word_count",
+    "created_at",
+    "updated_at",
+]
+
+
+def _user_record(user: User) -> dict[str, Any]:
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "username": user.username,
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat(),
+    }
+
+
+def _entry_record(entry: Entry) -> dict[str, Any]:
+    return {
+        "id": str(entry.id),
+        "title": entry.title,
+        "content": entry.content,
+        "markdown_content": entry.markdown_content,
+        "word_count": entry.word_count,
+        "char_count": entry.char_count,
+        "created_at": entry.created_at.isoformat(),
+        "updated_at": entry.updated_at.isoformat(),
+    }
+
+
+def _device_record(device: UserDevice) -> dict[str, Any]:
+    return {
+        "id": str(device.id),
+        "device_name": device.device_name,
+        "browser": device.browser,
+        "os": device.os,
+        "location_region": device.location_region,
+        "trusted": device.trusted,
+        "last_seen_at": device.last_seen_at.isoformat(),
+        "created_at": device.created_at.isoformat(),
+    }
+
+
+def _session_record(session: UserSession) -> dict[str, Any]:
+    return {
+        "id": str(session.id),
+        "device_id": str(session.device_id) if session.device_id else None,
+        "user_agent": session.user_agent,
+        "ip_address": session.ip_address,
+        "issued_at": session.issued_at.isoformat(),
+        "last_used_at": session.last_used_at.isoformat(),
+        "expires_at": session.expires_at.isoformat(),
+        "revoked_at": session.revoked_at.isoformat() if session.revoked_at else None,
+    }
+
+
+def _audit_record(log: AuditLogEntry) -> dict[str, Any]:
+    return {
+        "id": str(log.id),
+        "event_type": log.event_type,
+        "event_data": log.event_data,
+        "ip_address": log.ip_address,
+        "user_agent": log.user_agent,
+        "device_id": str(log.device_id) if log.device_id else None,
+        "created_at": log.created_at.isoformat(),
+    }
+
+
+async def _buffered(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Coalesce small chunks into pieces of about ``EXPORT_CHUNK_BYTES``."""
+    pending: list[bytes] = []
+    size = 0
+    async for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield b"".join(pending)
+            pending.clear()
+            size = 0
+    if size:
+        yield b"".join(pending)
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable file zipfile writes to; output is drained as it is produced."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._parts: list[bytes] = []
+
+    def write(self, data: Any) -> int:
+        self._parts.append(bytes(data))
+        return len(self._parts[-1])
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
 class PrivacyService:
     """Service for privacy-related operations: data export and deletion."""
 
@@ -32,200 +147,176 @@ class PrivacyService:
         self.audit_service = AuditService(session)
 
     async def export_user_data(
-        self, user_id: UUID, export_format: str = "json"
+        self, user_id: UUID, export_format: ExportFormat = "json"
     ) -> tuple[str, str, bytes]:
-        """Export all user data in requested format.
+        """Export all user data in requested format, buffered in memory.
+
+        Convenience wrapper over ``stream_user_data`` for small accounts; serve
+        exports from the stream so memory does not grow with the account.
 
         Args:
             user_id: User ID to export data for
-            export_format: Export format ("json" or "csv")
+            export_format: Export format ("json", "csv" or "zip")
 
         Returns:
             Tuple of (filename, content_type, data_bytes)
         """
-        # Collect all user data
-        user_data = await self._collect_user_data(user_id)
-
-        # Log the export event
-        await self.audit_service.log_event(
-            user_id=user_id,
-            event_type=AuditService.EVENT_DATA_EXPORT,
-            event_data={
-                "format": export_format,
-                "timestamp": datetime.now(UTC).isoformat(),
-            },
+        filename, content_type, chunks = await self.stream_user_data(
+            user_id, export_format
         )
+        return filename, content_type, b"".join([chunk async for chunk in chunks])
 
-        # Format the data
-        if export_format == "csv":
-            return PrivacyService._export_as_csv(user_data, user_id)
-        return PrivacyService._export_as_json(user_data, user_id)
+    async def stream_user_data(
+        self, user_id: UUID, export_format: ExportFormat = "json"
+    ) -> tuple[str, str, AsyncIterator[bytes]]:
+        """Export all user data as a stream of byte chunks.
 
-    async def _collect_user_data(self, user_id: UUID) -> dict[str, Any]:
-        """Collect all user data from various tables.
+        Rows are read through server-side cursors ``EXPORT_BATCH_SIZE`` at a
+        time and encoded as they arrive, so memory stays flat however large
+        the account is. The session must stay open until the stream is
+        exhausted, e.g. for the lifetime of a ``StreamingResponse``.
 
         Args:
-            user_id: User ID
+            user_id: User ID to export data for
+            export_format: Export format ("json", "csv" or "zip")
 
         Returns:
-            Dictionary containing all user data
+            Tuple of (filename, content_type, chunks)
+
+        Raises:
+            ValueError: If the user does not exist
         """
-        # Get user profile
         user = await self.session.scalar(select(User).where(User.id == user_id))
         if not user:
             raise ValueError("User not found")
 
-        # Get entries (journal content)
-        entries_result = await self.session.scalars(
-            select(Entry).where(Entry.author_id == user_id)
-        )
-        entries = list(entries_result)
-
-        # Get devices
-        devices_result = await self.session.scalars(
-            select(UserDevice).where(UserDevice.user_id == user_id)
+        # Log the export event
+        await self.audit_service.log_event(
+            user_id=user_id,
+            event_type=AuditService.EVENT_DATA_EXPORT,
+            event_data={
+                "format": export_format,
+                "timestamp": datetime.now(UTC).isoformat(),
+            },
         )
-        devices = list(devices_result)
 
-        # Get sessions
-        sessions_result = await self.session.scalars(
-            select(UserSession).where(UserSession.user_id == user_id)
+        now = datetime.now(UTC)
+        stamp = now.strftime("%Y%m%d_%H%M%S")
+        if export_format == "csv":
+            return (
+                f"user_entries_{user_id}_{stamp}.csv",
+                "text/csv",
+                _buffered(self._csv_chunks(user_id)),
+            )
+        header = {"export_timestamp": now.isoformat(), "user": _user_record(user)}
+        if export_format == "zip":
+            return (
+                f"user_data_{user_id}_{stamp}.zip",
+                "application/zip",
+                _buffered(self._zip_chunks(user_id, header)),
+            )
+        return (
+            f"user_data_{user_id}_{stamp}.json",
+            "application/json",
+            _buffered(self._json_chunks(user_id, header)),
         )
-        sessions = list(sessions_result)
 
-        # Get audit log
-        audit_result = await self.session.scalars(
-            select(AuditLogEntry).where(AuditLogEntry.user_id == user_id)
+    async def _stream(
+        self, stmt: Select[Any], record: Callable[[Any], dict[str, Any]]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield ``record(row)`` for each row of ``stmt`` from a server-side cursor."""
+        rows = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
         )
-        audit_log = list(audit_result)
+        async for row in rows:
+            yield record(row)
 
+    def _sections(self, user_id: UUID) -> dict[str, AsyncIterator[dict[str, Any]]]:
+        """Record streams per export section; each query runs when first read."""
         return {
-            "export_timestamp": datetime.now(UTC).isoformat(),
-            "user": {
-                "id": str(user.id),
-                "email": user.email,
-                "username": user.username,
-                "is_active": user.is_active,
-                "is_verified": user.is_verified,
-                "created_at": user.created_at.isoformat(),
-                "updated_at": user.updated_at.isoformat(),
-            },
-            "entries": [
-                {
-                    "id": str(entry.id),
-                    "title": entry.title,
-                    "content": entry.content,
-                    "markdown_content": entry.markdown_content,
-                    "word_count": entry.word_count,
-                    "char_count": entry.char_count,
-                    "created_at": entry.created_at.isoformat(),
-                    "updated_at": entry.updated_at.isoformat(),
-                }
-                for entry in entries
-            ],
-            "devices": [
-                {
-                    "id": str(device.id),
-                    "device_name": device.device_name,
-                    "browser": device.browser,
-                    "os": device.os,
-                    "location_region": device.location_region,
-                    "trusted": device.trusted,
-                    "last_seen_at": device.last_seen_at.isoformat(),
-                    "created_at": device.created_at.isoformat(),
-                }
-                for device in devices
-            ],
-            "sessions": [
-                {
-                    "id": str(session.id),
-                    "device_id": str(session.device_id) if session.device_id else None,
-                    "user_agent": session.user_agent,
-                    "ip_address": session.ip_address,
-                    "issued_at": session.issued_at.isoformat(),
-                    "last_used_at": session.last_used_at.isoformat(),
-                    "expires_at": session.expires_at.isoformat(),
-                    "revoked_at": session.revoked_at.isoformat()
-                    if session.revoked_at
-                    else None,
-                }
-                for session in sessions
-            ],
-            "audit_log": [
-                {
-                    "id": str(log.id),
-                    "event_type": log.event_type,
-                    "event_data": log.event_data,
-                    "ip_address": log.ip_address,
-                    "user_agent": log.user_agent,
-                    "device_id": str(log.device_id) if log.device_id else None,
-                    "created_at": log.created_at.isoformat(),
-                }
-                for log in audit_log
-            ],
+            "entries": self._stream(
+                select(Entry)
+                .where(Entry.author_id == user_id)
+                .order_by(Entry.created_at, Entry.id),
+                _entry_record,
+            ),
+            "devices": self._stream(
+                select(UserDevice)
+                .where(UserDevice.user_id == user_id)
+                .order_by(UserDevice.created_at),
+                _device_record,
+            ),
+            "sessions": self._stream(
+                select(UserSession)
+                .where(UserSession.user_id == user_id)
+                .order_by(UserSession.issued_at),
+                _session_record,
+            ),
+            "audit_log": self._stream(
+                select(AuditLogEntry)
+                .where(AuditLogEntry.user_id == user_id)
+                .order_by(AuditLogEntry.created_at),
+                _audit_record,
+            ),
         }
 
-    @staticmethod
-    def _export_as_json(data: dict[str, Any], user_id: UUID) -> tuple[str, str, bytes]:
-        """Export data as JSON.
-
-        Args:
-            data: User data dictionary
-            user_id: User ID for filename
-
-        Returns:
-            Tuple of (filename, content_type, data_bytes)
-        """
-        json_data = json.dumps(data, indent=2, sort_keys=True)
-        filename = (
-            f"user_data_{user_id}_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.json"
-        )
-        return filename, "application/json", json_data.encode()
-
-    @staticmethod
-    def _export_as_csv(data: dict[str, Any], user_id: UUID) -> tuple[str, str, bytes]:
-        """Export data as CSV (simplified format).
-
-        Args:
-            data: User data dictionary
-            user_id: User ID for filename
-
-        Returns:
-            Tuple of (filename, content_type, data_bytes)
-        """
+    async def _json_chunks(
+        self, user_id: UUID, header: dict[str, Any]
+    ) -> AsyncIterator[bytes]:
+        """One JSON document, with keys in the order ``sort_keys`` gives."""
+        sections = self._sections(user_id)
+        for i, key in enumerate(sorted([*header, *sections])):
+            yield f"{'{' if i == 0 else ','}\n{json.dumps(key)}: ".encode()
+            if key in header:
+                yield json.dumps(header[key], sort_keys=True).encode()
+                continue
+            separator = "[\n"
+            async for record in sections[key]:
+                yield (separator + json.dumps(record, sort_keys=True)).encode()
+                separator = ",\n"
+            yield b"[]" if separator == "[\n" else b"\n]"
+        yield b"\n}\n"
+
+    async def _csv_chunks(self, user_id: UUID) -> AsyncIterator[bytes]:
+        """Entries as CSV rows (simplified format)."""
         output = io.StringIO()
-
-        # Export entries as main CSV content
-        if data["entries"]:
-            writer = csv.DictWriter(
-                output,
-                fieldnames=[
-                    "id",
-                    "title",
-                    "content",
-                    "markdown_content",
-                    "word_count",
-                    "created_at",
-                    "updated_at",
-                ],
-            )
-            writer.writeheader()
-            for entry in data["entries"]:
-                writer.writerow({
-                    "id": entry["id"],
-                    "title": entry["title"],
-                    "content": entry["content"] or "",
-                    "markdown_content": entry["markdown_content"] or "",
-                    "word_count": entry["word_count"] or 0,
-                    "created_at": entry["created_at"],
-                    "updated_at": entry["updated_at"],
-                })
-
-        csv_data = output.getvalue()
-        filename = (
-            f"user_entries_{user_id}_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.csv"
-        )
-        return filename, "text/csv", csv_data.encode()
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+        header_written = False
+        async for entry in self._sections(user_id)["entries"]:
+            if not header_written:
+                writer.writeheader()
+                header_written = True
+            writer.writerow({
+                "id": entry["id"],
+                "title": entry["title"],
+                "content": entry["content"] or "",
+                "markdown_content": entry["markdown_content"] or "",
+                "word_count": entry["word_count"] or 0,
+                "created_at": entry["created_at"],
+                "updated_at": entry["updated_at"],
+            })
+            yield output.getvalue().encode()
+            output.seek(0)
+            output.truncate()
+
+    async def _zip_chunks(
+        self, user_id: UUID, header: dict[str, Any]
+    ) -> AsyncIterator[bytes]:
+        """A zip of ``user.json`` plus one JSON Lines file per section.
+
+        ``entries.jsonl`` is in the shape ``app.infra.entry_import`` reads back.
+        """
+        sink = _ZipSink()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("user.json", json.dumps(header, indent=2, sort_keys=True))
+            for name, records in self._sections(user_id).items():
+                with zf.open(f"{name}.jsonl", "w", force_zip64=True) as member:
+                    async for record in records:
+                        member.write(json.dumps(record, sort_keys=True).encode())
+                        member.write(b"\n")
+                        if data := sink.drain():
+                            yield data
+        yield sink.drain()
 
     async def schedule_deletion(
         self, user_id: UUID, days_until_deletion: int = 30
@@ -402,5 +493,5 @@ class PrivacyService:
             },
             "deletion_status": deletion_status,
             "audit_log_integrity": integrity_valid,
-            "export_formats": ["json", "csv"],
+            "export_formats": ["json", "csv", "zip"],
         }
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 import strawberry
 
-from app.infra.db import get_session
+from app.infra.db import client_key, read_sessionmaker
 from app.infra.search_pgvector import hybrid_search
 
 
@@ -53,13 +53,12 @@ class Query:
     @strawberry.field
     @staticmethod
     async def search_entries(
-        q: str, k: int = 10, alpha: float = 0.6
+        info: strawberry.Info, q: str, k: int = 10, alpha: float = 0.6
     ) -> list[SearchHit]:
-        s: AsyncSession = await anext(get_session())
-        try:
+        request = info.context["request"]
+        client = client_key(request.headers.get("authorization"))
+        async with (await read_sessionmaker(client))() as s:
             return await _hybrid(s, q, k, alpha)
-        finally:
-            await s.close()
 
 
 schema = strawberry.Schema(query=Query)
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+from collections.abc import Hashable
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import html as html_module
 import logging
-import re
+import threading
+import time
+from typing import Any
+from uuid import UUID
+import weakref
 
 import bleach
 from markdown_it import MarkdownIt
 
+from app.infra import html_markdown
+from app.settings import settings
+from app.telemetry.metrics_runtime import inc as metrics_inc, observe
+
 
 # Safe markdown processing with proper parser and sanitization
 
@@ -57,18 +70,78 @@ _ALLOWED_ATTRIBUTES = {
 }
 
 
-def markdown_to_html(md: str) -> str:
-    """Convert markdown to sanitized HTML using proper parser.
-
-    Args:
-        md: Markdown text to convert
+class _RenderCache:
+    """LRU of rendered HTML keyed by a hash of the markdown source.
 
-    Returns:
-        Sanitized HTML string
+    Entries whose HTML is not stored are cached under ``(id, version)``
+    instead, which needs no hashing and changes with every write. Bounded by
+    the total size of cached HTML rather than entry count, so a few very long
+    documents cannot pin unbounded memory.
     """
-    if not md or not isinstance(md, str):
-        return ""
 
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self._items: OrderedDict[Hashable, str] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(md: str) -> bytes:
+        return hashlib.blake2b(md.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: Hashable) -> str | None:
+        with self._lock:
+            html = self._items.get(key)
+            if html is not None:
+                self._items.move_to_end(key)
+            return html
+
+    def put(self, key: Hashable, html: str) -> None:
+        if len(html) > self.max_chars // 8:
+            return  # One document must not flush most of the cache
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._chars -= len(old)
+            self._items[key] = html
+            self._chars += len(html)
+            while self._chars > self.max_chars:
+                _, evicted = self._items.popitem(last=False)
+                self._chars -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._chars = 0
+
+
+_render_cache = _RenderCache(settings.render_cache_max_chars)
+# Thread pool for large documents, shared by every event loop
+_render_pool: ThreadPoolExecutor | None = None
+# Slots bounding the pool backlog, per event loop: a semaphore is bound to
+# the first loop that waits on it (tests and CLIs run several loops)
+_render_slots: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+
+
+def _render_offload() -> tuple[ThreadPoolExecutor, asyncio.Semaphore]:
+    global _render_pool  # noqa: PLW0603
+    if _render_pool is None:
+        _render_pool = ThreadPoolExecutor(
+            max_workers=settings.render_pool_workers,
+            thread_name_prefix="md-render",
+        )
+    loop = asyncio.get_running_loop()
+    slots = _render_slots.get(loop)
+    if slots is None:
+        slots = _render_slots[loop] = asyncio.Semaphore(settings.render_max_pending)
+    return _render_pool, slots
+
+
+def _render(md: str, mode: str) -> str:
+    """Render and sanitize markdown, recording the render time."""
+    started = time.perf_counter()
     try:
         # Parse markdown to HTML
         html = _md_processor.render(md)
@@ -82,89 +155,134 @@ def markdown_to_html(md: str) -> str:
         # Fallback to escaped plain text if parsing fails
         logging.getLogger(__name__).warning("Markdown parsing failed: %s", e)
         return html_module.escape(md).replace("\n", "<br/>")
+    finally:
+        observe(
+            "markdown_render_seconds", time.perf_counter() - started, {"mode": mode}
+        )
 
 
-def html_to_markdown(html: str) -> str:
-    """Convert HTML back to markdown (basic implementation).
+def _cached(key: Hashable) -> str | None:
+    html = _render_cache.get(key)
+    metrics_inc(
+        "markdown_render_cache_total", {"result": "miss" if html is None else "hit"}
+    )
+    return html
 
-    Note: This is a lossy conversion and may not perfectly recreate the original markdown.
+
+async def _render_async(key: Hashable, md: str) -> str:
+    """Render a cache miss, offloading large documents, and cache the result."""
+    if len(md) < settings.render_offload_chars:
+        html = _render(md, "inline")
+    else:
+        pool, slots = _render_offload()
+        async with slots:
+            html = await asyncio.get_running_loop().run_in_executor(
+                pool, _render, md, "pool"
+            )
+    _render_cache.put(key, html)
+    return html
+
+
+def markdown_to_html(md: str) -> str:
+    """Convert markdown to sanitized HTML using proper parser.
+
+    Results are cached by content hash. Inside async code prefer
+    ``render_markdown``, which keeps large documents off the event loop.
 
     Args:
-        html: HTML text to convert
+        md: Markdown text to convert
 
     Returns:
-        Markdown string
+        Sanitized HTML string
     """
-    if not html or not isinstance(html, str):
+    if not md or not isinstance(md, str):
         return ""
 
-    try:
-        # Basic HTML to markdown conversion
-        out = html
-
-        # Headers with attributes
-        out = re.sub(r"<h1[^>]*>", "# ", out)
-        out = out.replace("</h1>", "\n\n")
-        out = re.sub(r"<h2[^>]*>", "## ", out)
-        out = out.replace("</h2>", "\n\n")
-        out = re.sub(r"<h3[^>]*>", "### ", out)
-        out = out.replace("</h3>", "\n\n")
-        out = re.sub(r"<h4[^>]*>", "#### ", out)
-        out = out.replace("</h4>", "\n\n")
-        out = re.sub(r"<h5[^>]*>", "##### ", out)
-        out = out.replace("</h5>", "\n\n")
-        out = re.sub(r"<h6[^>]*>", "###### ", out)
-        out = out.replace("</h6>", "\n\n")
-
-        # Code blocks
-        out = out.replace("<pre><code>", "```\n").replace("</code></pre>", "\n```")
-        out = out.replace("<pre>", "```\n").replace("</pre>", "\n```")
-
-        # Inline code
-        out = out.replace("<code>", "`").replace("</code>", "`")
-
-        # Bold and italic
-        out = out.replace("<strong>", "**").replace("</strong>", "**")
-        out = out.replace("<b>", "**").replace("</b>", "**")
-        out = out.replace("<em>", "*").replace("</em>", "*")
-        out = out.replace("<i>", "*").replace("</i>", "*")
-
-        # Lists
-        out = out.replace("<li>", "- ").replace("</li>", "\n")
-        out = out.replace("<ul>", "").replace("</ul>", "\n")
-        out = out.replace("<ol>", "").replace("</ol>", "\n")
-
-        # Paragraph handling and line breaks
-        out = out.replace("<p>", "").replace("</p>", "\n\n")
-        out = (
-            out.replace("<br>", "  \n")
-            .replace("<br/>", "  \n")
-            .replace("<br />", "  \n")
-        )
+    key = _RenderCache.key(md)
+    html = _cached(key)
+    if html is None:
+        html = _render(md, "inline")
+        _render_cache.put(key, html)
+    return html
+
 
-        # Links (handle various attribute formats)
-        link_pattern = r'<a\s+[^>]*href="([^"]+)"[^>]*>([^<]+)</a>'
-        out = re.sub(link_pattern, r"[\2](\1)", out)
+async def render_markdown(md: str) -> str:
+    """Async ``markdown_to_html``: cached, with large documents offloaded.
 
-        # Images
-        img_pattern = r'<img\s+[^>]*src="([^"]+)"[^>]*alt="([^"]*)"[^>]*/?>'
-        out = re.sub(img_pattern, r"![\2](\1)", out)
-        # Handle img tags without alt
-        img_pattern2 = r'<img\s+[^>]*src="([^"]+)"[^>]*/?>'
-        out = re.sub(img_pattern2, r"![](\1)", out)
+    Documents of at least ``render_offload_chars`` characters render on a
+    small thread pool. At most ``render_max_pending`` offloaded renders run or
+    queue at once; further callers wait, which bounds memory and pool backlog.
 
-        # Blockquotes
-        out = re.sub(r"<blockquote[^>]*>", "> ", out)
-        out = out.replace("</blockquote>", "\n\n")
+    Args:
+        md: Markdown text to convert
+
+    Returns:
+        Sanitized HTML string
+    """
+    if not md or not isinstance(md, str):
+        return ""
+
+    key = _RenderCache.key(md)
+    html = _cached(key)
+    return html if html is not None else await _render_async(key, md)
+
+
+def storable_html(html: str, md: str | None) -> str | None:
+    """HTML to write to ``entries.content`` for an entry rendered as ``html``.
+
+    With ``entry_html_storage = "rendered"`` markdown is the only stored
+    source and None is returned for markdown entries; ``entry_html`` renders
+    their HTML on read.
+    """
+    if md and settings.entry_html_storage == "rendered":
+        return None
+    return html
+
+
+async def entry_html(
+    entry_id: UUID, version: int, content: str | None, md: str | None
+) -> str | None:
+    """HTML of an entry: the stored ``content``, else rendered from markdown.
+
+    Renders are cached per ``(entry_id, version)``, so each version of an
+    entry is rendered at most once while it stays in the cache.
+    """
+    if content is not None or not md:
+        return content
+    key = (entry_id, version)
+    html = _cached(key)
+    return html if html is not None else await _render_async(key, md)
+
+
+async def with_entry_html(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Fill in ``content`` of ``entries`` rows read without stored HTML."""
+    for row in rows:
+        if row.get("content") is None and row.get("markdown_content"):
+            row["content"] = await entry_html(
+                row["id"], row["version"], None, row["markdown_content"]
+            )
+    return rows
 
-        # Clean up extra whitespace
-        out = re.sub(r"\n{3,}", "\n\n", out)
 
-        # Decode HTML entities back to literal characters
-        out = html_module.unescape(out)
+def html_to_markdown(html: str) -> str:
+    """Convert HTML back to markdown.
+
+    The document is tokenized once by ``html.parser`` and markdown is emitted
+    as elements open and close (see ``app.infra.html_markdown``), so the cost
+    is linear in the size of the input. Markup with no markdown equivalent is
+    dropped and its text kept; scripts and styles are dropped entirely.
 
-        return out.strip()
+    Args:
+        html: HTML text to convert
 
+    Returns:
+        Markdown string
+    """
+    if not html or not isinstance(html, str):
+        return ""
+
+    try:
+        return html_markdown.convert(html)
     except Exception as e:  # noqa: BLE001 - tolerant fallback for malformed HTML
         # Fallback - return original HTML if conversion fails
         logging.getLogger(__name__).warning("HTML to markdown conversion failed: %s", e)
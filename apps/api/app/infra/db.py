@@ -1,19 +1,83 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from functools import lru_cache
+import hashlib
+import logging
+import math
+import random
+import time
+from typing import Any
 
+from fastapi import Request
+from redis.exceptions import RedisError
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.infra.deadlines import time_left
+from app.infra.redis import get_redis_client
 from app.settings import settings
+from app.telemetry.metrics_runtime import inc, observe, set_gauge
+
+
+logger = logging.getLogger(__name__)
+
+# Checkout waits range from an idle connection to the full pool timeout
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection.
+
+    The wait covers queueing for a free connection, opening an overflow one
+    and the pre-ping, i.e. everything between asking and holding it.
+    """
+
+    def connect(self):  # type: ignore[no-untyped-def]
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            inc("db_pool_timeouts_total")
+            raise
+        finally:
+            observe(
+                "db_pool_wait_seconds",
+                time.perf_counter() - start,
+                buckets=POOL_WAIT_BUCKETS,
+            )
+
+
+def _create_engine(url: str, **connect_args: Any) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=MeteredPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+        connect_args={
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            **connect_args,
+        },
+        future=True,
+    )
 
 
 @lru_cache(maxsize=1)
 def build_engine(url: str | None = None) -> AsyncEngine:
-    return create_async_engine(url or settings.db_url, pool_pre_ping=True, future=True)
+    return _create_engine(url or settings.db_url)
 
 
 def sessionmaker_for(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -27,7 +91,211 @@ def get_async_engine() -> AsyncEngine:
     return build_engine()
 
 
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Session factory for the shared engine, built once per process."""
+    return sessionmaker_for(build_engine())
+
+
 async def get_session() -> AsyncGenerator[AsyncSession]:
-    sm = sessionmaker_for(build_engine())
-    async with sm() as s:
+    async with get_sessionmaker()() as s:
         yield s
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open up to ``connections`` pooled connections ahead of the first requests.
+
+    Connections are opened concurrently and returned to the pool straight
+    away. Failures are left for the first request to report.
+
+    Returns:
+        Number of connections opened
+    """
+
+    async def open_one() -> AsyncConnection:
+        return await engine.connect()
+
+    count = min(connections, settings.db_pool_size)
+    results = await asyncio.gather(
+        *(open_one() for _ in range(count)), return_exceptions=True
+    )
+    opened = [conn for conn in results if isinstance(conn, AsyncConnection)]
+    for conn in opened:
+        await conn.close()
+    return len(opened)
+
+
+def record_pool_metrics(
+    engine: AsyncEngine | None = None, labels: dict[str, str] | None = None
+) -> None:
+    """Export the pool's current occupancy as gauges (called per scrape)."""
+    pool = (engine or build_engine()).pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return
+    set_gauge("db_pool_size", pool.size(), labels)
+    set_gauge("db_pool_checked_out", pool.checkedout(), labels)
+    set_gauge("db_pool_checked_in", pool.checkedin(), labels)
+    # Negative while connections below pool_size have never been opened
+    set_gauge("db_pool_overflow", max(pool.overflow(), 0), labels)
+
+
+# --- Read replicas ---------------------------------------------------------
+#
+# Read-only endpoints take ``get_read_session``, which picks a random replica
+# from ``settings.db_read_urls`` whose replay lag is within bounds, or falls
+# back to the primary. A client that just committed a write is pinned to the
+# primary for ``db_read_pin_seconds`` (shared through Redis, so any API
+# process honours it) and reads its own writes. Without replicas configured
+# every read session is a primary session.
+
+# 0 when caught up with everything received, else time since the last replay
+REPLICA_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+# A replica that cannot answer this quickly is not worth routing to
+REPLICA_LAG_TIMEOUT = 1.0
+
+
+@dataclass
+class Replica:
+    """A read replica and its last measured replay lag (None: unreachable)."""
+
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    lag: float | None = None
+    checked_at: float = field(default=-math.inf)
+
+    @property
+    def usable(self) -> bool:
+        return self.lag is not None and self.lag <= settings.db_read_max_lag_seconds
+
+
+@lru_cache(maxsize=1)
+def read_replicas() -> tuple[Replica, ...]:
+    """Replica engines for ``settings.db_read_urls``, built once per process."""
+    replicas = []
+    for i, url in enumerate(settings.db_read_urls):
+        # Refuse writes even if a URL points at a primary by mistake
+        engine = _create_engine(
+            url, server_settings={"default_transaction_read_only": "on"}
+        )
+        replicas.append(Replica(f"replica{i}", engine, sessionmaker_for(engine)))
+    return tuple(replicas)
+
+
+async def check_replica_lag(replica: Replica) -> None:
+    # Mark first so concurrent requests keep routing on the previous reading
+    replica.checked_at = time.monotonic()
+    try:
+        async with asyncio.timeout(REPLICA_LAG_TIMEOUT):
+            async with replica.engine.connect() as conn:
+                lag = (await conn.execute(REPLICA_LAG)).scalar()
+        replica.lag = float(lag or 0)
+    except (exc.SQLAlchemyError, OSError, TimeoutError):
+        logger.warning("Replica %s lag check failed", replica.name, exc_info=True)
+        replica.lag = None
+    set_gauge(
+        "db_replica_lag_seconds",
+        -1 if replica.lag is None else replica.lag,
+        {"replica": replica.name},
+    )
+
+
+def client_key(authorization: str | None) -> str | None:
+    """Stable key for the client behind a request, from its credentials."""
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+def _pin_key(client: str) -> str:
+    return f"db:primary-pin:{client}"
+
+
+async def pin_to_primary(client: str) -> None:
+    """Route ``client``'s reads to the primary for the next few seconds."""
+    try:
+        await get_redis_client().set(
+            _pin_key(client), b"1", px=int(settings.db_read_pin_seconds * 1000)
+        )
+    except RedisError:
+        logger.warning("Could not pin client to the primary", exc_info=True)
+
+
+async def _pinned(client: str) -> bool:
+    try:
+        return bool(await get_redis_client().exists(_pin_key(client)))
+    except RedisError:
+        # Unknown: the primary is always consistent
+        return True
+
+
+async def read_sessionmaker(
+    client: str | None = None,
+) -> async_sessionmaker[AsyncSession]:
+    """Session factory for a read-only request by ``client``."""
+    replicas = read_replicas()
+    if not replicas:
+        return get_sessionmaker()
+    if client is not None and await _pinned(client):
+        inc("db_read_routed_total", {"target": "primary", "reason": "pinned"})
+        return get_sessionmaker()
+
+    now = time.monotonic()
+    stale = [
+        r for r in replicas if now - r.checked_at >= settings.db_read_lag_check_seconds
+    ]
+    if stale:
+        await asyncio.gather(*(check_replica_lag(r) for r in stale))
+    usable = [r for r in replicas if r.usable]
+    if not usable:
+        inc("db_read_routed_total", {"target": "primary", "reason": "lag"})
+        return get_sessionmaker()
+    inc("db_read_routed_total", {"target": "replica"})
+    return random.choice(usable).sessionmaker  # noqa: S311 - load spreading
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession]:
+    """Session for read-only endpoints: a replica when one is fresh enough."""
+    client = client_key(request.headers.get("authorization"))
+    async with (await read_sessionmaker(client))() as s:
+        yield s
+
+
+# Per-request flag raised when a primary session commits; see track_commits
+_request_commits: ContextVar[list[bool] | None] = ContextVar(
+    "db_request_commits", default=None
+)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_deadline(_session: Session, _transaction: Any, connection: Any) -> None:
+    # Postgres stops statements the request can no longer wait for; one
+    # parameterized set_config (SET LOCAL) keeps a single prepared statement
+    budget = time_left()
+    if budget is not None:
+        connection.execute(
+            text("SELECT set_config('statement_timeout', :ms, true)"),
+            {"ms": str(max(int(budget * 1000), 1))},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _note_commit(_session: Session) -> None:
+    committed = _request_commits.get()
+    if committed is not None:
+        committed.append(True)
+
+
+@contextmanager
+def track_commits() -> Iterator[list[bool]]:
+    """Collect commits made while handling one request (non-empty if any)."""
+    committed: list[bool] = []
+    token = _request_commits.set(committed)
+    try:
+        yield committed
+    finally:
+        _request_commits.reset(token)
@@ -0,0 +1,90 @@
+"""Per-request deadlines.
+
+``LoadSheddingMiddleware`` gives every request a deadline (see
+``settings.request_deadlines``) held in a contextvar. Anything that waits on
+the network asks ``time_left`` for its budget instead of using a fixed
+timeout: database transactions set ``statement_timeout``, Redis commands and
+embedding provider calls are cut off at the deadline. Work that cannot
+finish in time fails fast and frees its connection for requests that can.
+Background work started from a request must not inherit the deadline: use
+``create_detached_task``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from app.settings import settings
+
+
+class DeadlineExceeded(TimeoutError):  # noqa: N818 - reads as a timeout
+    """Raised when the current request's deadline has passed."""
+
+
+@dataclass
+class Deadline:
+    """Absolute deadline on the time.monotonic() clock (None once lifted)."""
+
+    at: float | None
+
+    def lift(self) -> None:
+        """Drop the deadline for the rest of the block (work after responding)."""
+        self.at = None
+
+
+_deadline: ContextVar[Deadline | None] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Run the block with a deadline ``seconds`` from now (or the outer one)."""
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None and outer.at is not None:
+        at = min(at, outer.at)
+    current = Deadline(at)
+    token = _deadline.set(current)
+    try:
+        yield current
+    finally:
+        _deadline.reset(token)
+
+
+def create_detached_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task[Any]:
+    """Start background work outside the current request's context.
+
+    A task copies the context it is created in, so work spawned by a
+    request would otherwise inherit its deadline (and stop when it passes).
+    """
+    return asyncio.create_task(coro, context=Context())
+
+
+def time_left(cap: float | None = None) -> float | None:
+    """Seconds until the current deadline, at most ``cap``.
+
+    Returns None when there is neither a deadline nor a cap.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    current = _deadline.get()
+    if current is None or current.at is None:
+        return cap
+    left = current.at - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    return left if cap is None else min(left, cap)
+
+
+def deadline_for(path: str) -> float:
+    """Budget for a request path: the longest matching prefix, or the default."""
+    matches = [p for p in settings.request_deadlines if path.startswith(p)]
+    if not matches:
+        return settings.request_deadline_seconds
+    return settings.request_deadlines[max(matches, key=len)]
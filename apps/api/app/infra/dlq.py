@@ -0,0 +1,254 @@
+"""Inspection and bulk replay of dead-lettered outbox events.
+
+Events that exhaust their retries are kept in `events` with ``state='dead'``
+(and mirrored to ``journal.dlq``). Replay resets their retry bookkeeping in
+one UPDATE per batch and republishes them to their original subject through
+the same pipelined path as the relay. The admin API runs replays as
+background jobs (``start_replay_job``) and reports their progress.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import logging
+import time
+from typing import Any, Literal
+from uuid import UUID, uuid4
+
+from sqlalchemy import any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.infra.deadlines import create_detached_task
+from app.infra.outbox import SUBJECT_MAP, SessionFactory, _publish_rows
+from app.infra.sa_models import Event
+from app.telemetry.metrics_runtime import inc as metrics_inc
+
+
+logger = logging.getLogger(__name__)
+
+# Event IDs a dry run reports; the count covers all selected events
+MAX_REPORTED_IDS = 1000
+
+
+@dataclass(frozen=True)
+class DeadEventFilter:
+    """Selection of dead events; unset fields do not filter."""
+
+    event_type: str | None = None
+    error_contains: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    ids: list[UUID] | None = None
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of a replay run."""
+
+    selected: int = 0
+    published: int = 0
+    failed: int = 0
+    batches: int = 0
+    dry_run: bool = False
+    event_ids: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "selected": self.selected,
+            "published": self.published,
+            "failed": self.failed,
+            "batches": self.batches,
+            "dry_run": self.dry_run,
+        }
+        if self.dry_run:
+            out["event_ids"] = self.event_ids
+            out["event_ids_truncated"] = self.selected > len(self.event_ids)
+        return out
+
+
+def _dead_events_query(flt: DeadEventFilter) -> Select[tuple[Event]]:
+    stmt = select(Event).where(Event.state == "dead")
+    if flt.event_type:
+        stmt = stmt.where(Event.event_type == flt.event_type)
+    if flt.error_contains:
+        stmt = stmt.where(
+            Event.last_error.icontains(flt.error_contains, autoescape=True)
+        )
+    # occurred_at is the partition key, so a window prunes old partitions
+    if flt.since is not None:
+        stmt = stmt.where(Event.occurred_at >= flt.since)
+    if flt.until is not None:
+        stmt = stmt.where(Event.occurred_at < flt.until)
+    if flt.ids:
+        stmt = stmt.where(
+            Event.id == any_(bindparam("dlq_ids", flt.ids, type_=ARRAY(PGUUID())))
+        )
+    return stmt.order_by(Event.seq)
+
+
+def serialize_dead_event(ev: Event) -> dict[str, Any]:
+    return {
+        "id": str(ev.id),
+        "aggregate_type": ev.aggregate_type,
+        "aggregate_id": str(ev.aggregate_id),
+        "event_type": ev.event_type,
+        "subject": SUBJECT_MAP.get(ev.aggregate_type, "journal.events"),
+        "attempts": ev.attempts,
+        "last_error": ev.last_error,
+        "occurred_at": ev.occurred_at.isoformat(),
+    }
+
+
+async def list_dead_events(
+    s: AsyncSession,
+    flt: DeadEventFilter,
+    limit: int = 100,
+    after_seq: int | None = None,
+) -> list[Event]:
+    """Return dead events matching ``flt`` in outbox order.
+
+    ``after_seq`` continues a listing from the last ``seq`` already seen.
+    """
+    stmt = _dead_events_query(flt)
+    if after_seq is not None:
+        stmt = stmt.where(Event.seq > after_seq)
+    return list((await s.execute(stmt.limit(limit))).scalars().all())
+
+
+async def _claim_dead_batch(
+    s: AsyncSession, flt: DeadEventFilter, batch_size: int, after_seq: int | None
+) -> list[Event]:
+    """Lock a batch of dead events and reset their retry bookkeeping in bulk."""
+    stmt = _dead_events_query(flt).with_only_columns(Event.id)
+    if after_seq is not None:
+        stmt = stmt.where(Event.seq > after_seq)
+    ids = list(
+        (
+            await s.execute(stmt.limit(batch_size).with_for_update(skip_locked=True))
+        ).scalars()
+    )
+    if not ids:
+        return []
+    result = await s.execute(
+        update(Event)
+        .where(Event.id == any_(bindparam("ids", ids, type_=ARRAY(PGUUID()))))
+        .values(state="pending", attempts=0, next_attempt_at=None, last_error=None)
+        .returning(Event)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    return sorted(result.scalars().all(), key=lambda ev: ev.seq)
+
+
+async def replay_dead_events(
+    session_factory: SessionFactory,
+    flt: DeadEventFilter,
+    batch_size: int = 500,
+    max_per_second: float | None = None,
+    limit: int | None = None,
+    dry_run: bool = False,
+    report: ReplayReport | None = None,
+) -> ReplayReport:
+    """Republish dead events to their original subject in batches.
+
+    Each batch is claimed with ``FOR UPDATE SKIP LOCKED``, reset to
+    ``pending`` with one UPDATE, published concurrently and committed in its
+    own transaction. Events that fail again go back through the normal retry
+    bookkeeping. ``max_per_second`` caps the publish rate across batches.
+    ``report`` is updated as batches complete, for progress reporting.
+    """
+    report = report or ReplayReport()
+    report.dry_run = dry_run
+    after_seq: int | None = None
+    while limit is None or report.selected < limit:
+        size = batch_size if limit is None else min(batch_size, limit - report.selected)
+        started = time.monotonic()
+        async with session_factory() as s:
+            if dry_run:
+                rows = await list_dead_events(s, flt, size, after_seq)
+            else:
+                rows = await _claim_dead_batch(s, flt, size, after_seq)
+            if not rows:
+                break
+            after_seq = rows[-1].seq
+            report.selected += len(rows)
+            report.batches += 1
+            if dry_run:
+                room = MAX_REPORTED_IDS - len(report.event_ids)
+                report.event_ids += [str(ev.id) for ev in rows[: max(room, 0)]]
+            else:
+                published = await _publish_rows(s, rows, retry_enabled=True)
+                await s.commit()
+                report.published += published
+                report.failed += len(rows) - published
+                metrics_inc("outbox_dlq_replayed_total", value=float(published))
+        if max_per_second:
+            # Pace batches so the average rate stays under the cap
+            delay = len(rows) / max_per_second - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+    logger.info("DLQ replay: %s", report.as_dict())
+    return report
+
+
+# -- background jobs -------------------------------------------------------
+
+
+@dataclass
+class ReplayJob:
+    id: str
+    status: Literal["running", "succeeded", "failed"] = "running"
+    report: ReplayReport = field(default_factory=ReplayReport)
+    error: str | None = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    finished_at: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            **self.report.as_dict(),
+        }
+
+
+# Jobs of this process; finished ones beyond the limit are forgotten oldest first
+_jobs: dict[str, ReplayJob] = {}
+_job_tasks: set[asyncio.Task[None]] = set()
+MAX_TRACKED_JOBS = 100
+
+
+def get_replay_job(job_id: str) -> ReplayJob | None:
+    return _jobs.get(job_id)
+
+
+def start_replay_job(
+    session_factory: SessionFactory, flt: DeadEventFilter, **options: Any
+) -> ReplayJob:
+    """Run ``replay_dead_events`` in the background (same ``options``)."""
+    job = ReplayJob(id=str(uuid4()))
+    job.report.dry_run = bool(options.get("dry_run"))
+
+    async def run() -> None:
+        try:
+            await replay_dead_events(session_factory, flt, report=job.report, **options)
+            job.status = "succeeded"
+        except Exception as e:
+            logger.exception("DLQ replay job %s failed", job.id)
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = datetime.now(UTC)
+
+    finished = [j for j in _jobs.values() if j.finished_at is not None]
+    for old in finished[: max(len(_jobs) + 1 - MAX_TRACKED_JOBS, 0)]:
+        del _jobs[old.id]
+    _jobs[job.id] = job
+    task = create_detached_task(run())
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return job
@@ -7,6 +7,7 @@ import os
 import random
 import time
 
+from app.infra.deadlines import time_left
 from app.telemetry.metrics_runtime import inc as metrics_inc
 
 
@@ -18,6 +19,8 @@ PROVIDER = os.getenv("JOURNAL_EMBED_PROVIDER", "fake").lower()
 EMBED_DIM = int(os.getenv("JOURNAL_EMBED_DIM", "1536"))
 OPENAI_MODEL = os.getenv("JOURNAL_EMBED_MODEL", "text-embedding-3-small")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Seconds per provider call; shortened to what is left of a request's deadline
+OPENAI_TIMEOUT = float(os.getenv("JOURNAL_EMBED_TIMEOUT", "30"))
 
 # Simple in-process circuit breaker (optional)
 _CB_ENABLED = os.getenv("EMBED_CB_ENABLED", "0") == "1"
@@ -75,7 +78,9 @@ def _openai_embed(text: str, dim: int) -> list[float]:
     if not OPENAI_API_KEY:
         raise RuntimeError("Set OPENAI_API_KEY for JOURNAL_EMBED_PROVIDER=openai")
     client = OpenAI(api_key=OPENAI_API_KEY)
-    resp = client.embeddings.create(model=OPENAI_MODEL, input=text)
+    resp = client.embeddings.create(
+        model=OPENAI_MODEL, input=text, timeout=time_left(OPENAI_TIMEOUT)
+    )
     vec = resp.data[0].embedding
     if len(vec) < dim:
         vec += [0.0] * (dim - len(vec))
@@ -0,0 +1,406 @@
+"""Bulk import of journal archives.
+
+Sources are JSON Lines (one entry object per line) or a zip of Markdown
+files. Raw records are grouped into chunks; a process pool parses and
+renders each chunk, and every prepared chunk is ``COPY``-loaded into a
+transaction-scoped staging table and merged into ``entries`` with one
+statement that also writes the ``entry.created`` outbox events.
+
+Entry IDs are deterministic (the record's own ``id``, or a UUIDv5 of author
+and content), so re-running an import skips what is already there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Any, Literal
+from uuid import UUID, uuid4, uuid5
+import zipfile
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.conversion import html_to_markdown, markdown_to_html, storable_html
+from app.infra.deadlines import create_detached_task
+from app.infra.metrics import build_excerpt, count_words_chars
+from app.infra.outbox import SessionFactory
+from app.settings import settings
+from app.telemetry.metrics_runtime import inc as metrics_inc
+
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["jsonl", "zip"]
+# (source name, raw record) handed to the pool
+RawRecord = tuple[str, str]
+
+# Namespace of content-derived entry IDs
+IMPORT_NAMESPACE = UUID("5b0c8a52-6f1e-4d36-9a8e-3c2f1d7e4b90")
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+# Parse errors kept on a report; the count covers the rest
+MAX_REPORTED_ERRORS = 50
+
+STAGE_COLUMNS = (
+    "id",
+    "author_id",
+    "title",
+    "content",
+    "markdown_content",
+    "excerpt",
+    "content_version",
+    "word_count",
+    "char_count",
+    "created_at",
+    "updated_at",
+)
+
+_CREATE_STAGE = text(
+    """
+    CREATE TEMP TABLE IF NOT EXISTS entry_import_stage (
+        id uuid,
+        author_id uuid,
+        title text,
+        content text,
+        markdown_content text,
+        excerpt text,
+        content_version int,
+        word_count int,
+        char_count int,
+        created_at timestamptz,
+        updated_at timestamptz
+    ) ON COMMIT DROP
+    """
+)
+
+# Existing IDs (earlier runs, duplicates within the archive) are skipped
+_MERGE_STAGE = text(
+    """
+    WITH inserted AS (
+        INSERT INTO entries (
+            id, author_id, title, content, markdown_content, excerpt,
+            content_version, word_count, char_count, created_at, updated_at,
+            is_deleted, version
+        )
+        SELECT id, author_id, title, content, markdown_content, excerpt,
+               content_version, word_count, char_count, created_at, updated_at,
+               false, 1
+        FROM entry_import_stage
+        ON CONFLICT (id) DO NOTHING
+        RETURNING id, title
+    ), events AS (
+        INSERT INTO events (
+            id, aggregate_id, aggregate_type, event_type, event_data,
+            occurred_at, state, attempts
+        )
+        SELECT gen_random_uuid(), id, 'Entry', 'entry.created',
+               jsonb_build_object('entry_id', id::text, 'version', 1, 'title', title),
+               now(), 'pending', 0
+        FROM inserted
+        RETURNING 1
+    )
+    SELECT count(*) FROM events
+    """
+)
+
+
+@dataclass
+class ImportReport:
+    """Progress and outcome of an import."""
+
+    records: int = 0
+    imported: int = 0
+    skipped: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def add_errors(self, errors: list[str]) -> None:
+        self.failed += len(errors)
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        self.errors += errors[: max(room, 0)]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "records": self.records,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "chunks": self.chunks,
+            "errors": self.errors,
+        }
+
+
+# -- reading sources (event loop side: I/O only) ---------------------------
+
+
+def iter_jsonl(path: Path) -> Iterator[RawRecord]:
+    with path.open(encoding="utf-8", errors="replace") as fh:
+        for line_no, line in enumerate(fh, start=1):
+            if line.strip():
+                yield f"line {line_no}", line
+
+
+def iter_markdown_zip(path: Path) -> Iterator[RawRecord]:
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(MARKDOWN_SUFFIXES):
+                continue
+            yield info.filename, zf.read(info).decode("utf-8", errors="replace")
+
+
+def iter_source(path: Path, fmt: ImportFormat) -> Iterator[RawRecord]:
+    return iter_markdown_zip(path) if fmt == "zip" else iter_jsonl(path)
+
+
+def _chunks(records: Iterator[RawRecord], size: int) -> Iterator[list[RawRecord]]:
+    chunk: list[RawRecord] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# -- preparing records (process pool side: CPU only) -----------------------
+
+
+def _timestamp(value: Any, default: datetime) -> datetime:
+    if value is None or value == "":
+        return default
+    ts = datetime.fromisoformat(str(value))
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC)
+
+
+def _front_matter(md: str) -> tuple[dict[str, str], str]:
+    """Split simple ``key: value`` front matter off a Markdown document."""
+    if not md.startswith("---\n"):
+        return {}, md
+    end = md.find("\n---", 4)
+    if end < 0:
+        return {}, md
+    meta: dict[str, str] = {}
+    for line in md[4:end].splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            meta[key.strip().lower()] = value.strip().strip("\"'")
+    return meta, md[end + 4 :].lstrip("\n")
+
+
+def _markdown_record(name: str, raw: str) -> dict[str, Any]:
+    meta, body = _front_matter(raw)
+    title = meta.get("title")
+    if not title:
+        first = body.lstrip().split("\n", 1)[0]
+        title = first.lstrip("#").strip() if first.startswith("#") else ""
+    return {
+        "title": title or Path(name).stem.replace("-", " ").replace("_", " "),
+        "markdown_content": body,
+        "created_at": meta.get("created_at") or meta.get("date"),
+        "updated_at": meta.get("updated_at"),
+    }
+
+
+def _stage_row(author_id: UUID, data: dict[str, Any], now: datetime) -> tuple:
+    title = str(data.get("title") or "").strip()
+    if not title:
+        raise ValueError("title is required")
+    markdown = data.get("markdown_content", data.get("markdown"))
+    if markdown is None:
+        # Legacy HTML archives are stored as markdown like the v1->v2 backfill
+        markdown = html_to_markdown(str(data.get("content") or ""))
+    markdown = str(markdown)
+    html = markdown_to_html(markdown)
+    created_at = _timestamp(data.get("created_at"), now)
+    updated_at = _timestamp(data.get("updated_at"), created_at)
+    if data.get("id"):
+        entry_id = UUID(str(data["id"]))
+    else:
+        # From the source values only, so a re-run derives the same ID
+        source_created = data.get("created_at") or ""
+        entry_id = uuid5(
+            IMPORT_NAMESPACE, f"{author_id}\n{title}\n{source_created}\n{markdown}"
+        )
+    word_count, char_count = count_words_chars(markdown)
+    return (
+        entry_id,
+        author_id,
+        title,
+        storable_html(html, markdown),
+        markdown,
+        build_excerpt(html),
+        2,
+        word_count,
+        char_count,
+        created_at,
+        updated_at,
+    )
+
+
+def prepare_chunk(
+    author_id: str, fmt: ImportFormat, records: list[RawRecord]
+) -> tuple[list[tuple], list[str]]:
+    """Parse and render one chunk of raw records into staging rows.
+
+    Runs in a pool process; failures are reported per record.
+    """
+    author = UUID(author_id)
+    now = datetime.now(UTC)
+    rows: list[tuple] = []
+    errors: list[str] = []
+    for name, raw in records:
+        try:
+            data = _markdown_record(name, raw) if fmt == "zip" else json.loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            rows.append(_stage_row(author, data, now))
+        except (ValueError, TypeError) as e:
+            errors.append(f"{name}: {e}")
+    return rows, errors
+
+
+# -- loading ---------------------------------------------------------------
+
+
+async def copy_and_merge(s: AsyncSession, rows: list[tuple]) -> int:
+    """COPY rows into the staging table and merge them into ``entries``.
+
+    Returns:
+        Number of entries inserted (and outbox events written).
+    """
+    await s.execute(_CREATE_STAGE)
+    conn = await s.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "entry_import_stage", records=rows, columns=STAGE_COLUMNS
+    )
+    return int((await s.execute(_MERGE_STAGE)).scalar_one())
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    # Spawned workers: forking an event loop process with live threads and
+    # sockets is unsafe
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+async def import_entries(
+    session_factory: SessionFactory,
+    path: Path,
+    fmt: ImportFormat,
+    author_id: UUID,
+    chunk_size: int | None = None,
+    workers: int | None = None,
+    report: ImportReport | None = None,
+    executor_factory: Callable[[int], Any] = _pool,
+) -> ImportReport:
+    """Import an archive for ``author_id``.
+
+    Up to two chunks per worker are prepared ahead of the loader, so parsing,
+    rendering and loading overlap. Each chunk commits on its own.
+    """
+    chunk_size = chunk_size or settings.import_chunk_size
+    workers = workers or settings.import_workers
+    report = report or ImportReport()
+    loop = asyncio.get_running_loop()
+
+    async def load(prepared: asyncio.Future[tuple[list[tuple], list[str]]]) -> None:
+        rows, errors = await prepared
+        report.add_errors(errors)
+        if rows:
+            async with session_factory() as s:
+                inserted = await copy_and_merge(s, rows)
+                await s.commit()
+            report.imported += inserted
+            report.skipped += len(rows) - inserted
+            metrics_inc("entries_imported_total", value=float(inserted))
+        report.chunks += 1
+
+    with executor_factory(workers) as pool:
+        in_flight: deque[asyncio.Future[tuple[list[tuple], list[str]]]] = deque()
+        for chunk in _chunks(iter_source(path, fmt), chunk_size):
+            report.records += len(chunk)
+            in_flight.append(
+                loop.run_in_executor(pool, prepare_chunk, str(author_id), fmt, chunk)
+            )
+            if len(in_flight) >= workers * 2:
+                await load(in_flight.popleft())
+        while in_flight:
+            await load(in_flight.popleft())
+
+    logger.info("Entry import from %s: %s", path.name, report.as_dict())
+    return report
+
+
+# -- background jobs -------------------------------------------------------
+
+
+@dataclass
+class ImportJob:
+    id: str
+    author_id: UUID
+    status: Literal["running", "succeeded", "failed"] = "running"
+    report: ImportReport = field(default_factory=ImportReport)
+    error: str | None = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    finished_at: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            **self.report.as_dict(),
+        }
+
+
+# Jobs of this process; finished ones beyond the limit are forgotten oldest first
+_jobs: dict[str, ImportJob] = {}
+_job_tasks: set[asyncio.Task[None]] = set()
+MAX_TRACKED_JOBS = 100
+
+
+def get_import_job(job_id: str) -> ImportJob | None:
+    return _jobs.get(job_id)
+
+
+def start_import_job(
+    session_factory: SessionFactory, path: Path, fmt: ImportFormat, author_id: UUID
+) -> ImportJob:
+    """Run an import in the background; ``path`` is deleted when it finishes."""
+    job = ImportJob(id=str(uuid4()), author_id=author_id)
+
+    async def run() -> None:
+        try:
+            await import_entries(
+                session_factory, path, fmt, author_id, report=job.report
+            )
+            job.status = "succeeded"
+        except Exception as e:
+            logger.exception("Entry import job %s failed", job.id)
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = datetime.now(UTC)
+            path.unlink(missing_ok=True)
+
+    finished = [j for j in _jobs.values() if j.finished_at is not None]
+    for old in finished[: max(len(_jobs) + 1 - MAX_TRACKED_JOBS, 0)]:
+        del _jobs[old.id]
+    _jobs[job.id] = job
+    task = create_detached_task(run())
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return job
@@ -0,0 +1,205 @@
+"""Per-user daily entry counters behind ``/stats`` and ``/stats/activity``.
+
+``user_entry_stats_daily`` holds, per author and UTC day, the number of live
+entries created that day and the number last updated that day, and
+``user_entry_stats_total`` each author's running count of live entries.
+``user_entry_activity`` holds one row per author with dense per-day arrays
+of entries created, words and characters. Triggers on ``entries``
+(migrations 009, 012 and 013) keep them current on every write, so reading a
+user's stats never scans their entries, however many the platform holds.
+The activity triggers run once per statement and add that statement's
+per-day deltas, so bulk imports rewrite each author's row once.
+``rebuild_entry_stats`` recounts from ``entries`` for backfills and repairs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import (
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    union,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.outbox import SessionFactory
+from app.infra.sa_models import (
+    Entry,
+    UserEntryActivity,
+    UserEntryStatsDaily,
+    UserEntryStatsTotal,
+)
+
+
+# Day of element 0 of the user_entry_activity arrays
+ACTIVITY_EPOCH = date(2000, 1, 1)
+
+
+@dataclass(frozen=True)
+class Activity:
+    """Entries created, words and characters per day from ``first`` on."""
+
+    first: date
+    entries: list[int]
+    words: list[int]
+    chars: list[int]
+
+    def _entries_on(self, i: int) -> int:
+        return self.entries[i] if 0 <= i < len(self.entries) else 0
+
+    def window(self, start: date, end: date) -> Activity:
+        """Days ``start`` to ``end`` inclusive; zero where nothing is stored."""
+        offset = (start - self.first).days
+        span = range(offset, offset + (end - start).days + 1)
+
+        def cut(values: list[int]) -> list[int]:
+            return [values[i] if 0 <= i < len(values) else 0 for i in span]
+
+        return Activity(start, cut(self.entries), cut(self.words), cut(self.chars))
+
+    def streaks(self, today: date) -> tuple[int, int]:
+        """Current and longest runs of consecutive days with entries.
+
+        A current streak is still alive when today has no entry yet but
+        yesterday has.
+        """
+        longest = run = 0
+        for count in self.entries:
+            run = run + 1 if count else 0
+            longest = max(longest, run)
+        end = (today - self.first).days
+        if not self._entries_on(end):
+            end -= 1
+        current = 0
+        while self._entries_on(end - current):
+            current += 1
+        return current, longest
+
+
+async def read_activity(s: AsyncSession, author_id: UUID | None) -> Activity:
+    """Activity of one author (a single row), or of all authors summed."""
+    query = select(
+        func.array_lower(UserEntryActivity.entries, 1),
+        UserEntryActivity.entries,
+        UserEntryActivity.words,
+        UserEntryActivity.chars,
+    ).where(func.cardinality(UserEntryActivity.entries) > 0)
+    if author_id is not None:
+        query = query.where(UserEntryActivity.author_id == author_id)
+    rows = (await s.execute(query)).all()
+    if not rows:
+        return Activity(ACTIVITY_EPOCH, [], [], [])
+
+    lower = min(row[0] for row in rows)
+    size = max(row[0] + len(row[1]) for row in rows) - lower
+    sums = [[0] * size for _ in range(3)]
+    for start, *arrays in rows:
+        for total, values in zip(sums, arrays, strict=True):
+            for i, value in enumerate(values, start - lower):
+                total[i] += value or 0
+    return Activity(ACTIVITY_EPOCH + timedelta(days=lower), *sums)
+
+
+async def rebuild_entry_stats(s: AsyncSession, author_id: UUID | None = None) -> int:
+    """Recount the counters and activity of one author, or all (no commit).
+
+    The tables are locked against concurrent trigger updates first, so
+    writes that commit meanwhile are applied on top of the recount rather
+    than lost or counted twice. Writers wait until the caller commits.
+
+    Returns:
+        Number of daily counter rows written
+    """
+    await s.execute(
+        text(
+            "LOCK TABLE user_entry_stats_daily, user_entry_stats_total, "
+            "user_entry_activity IN EXCLUSIVE MODE"
+        )
+    )
+    clear = delete(UserEntryStatsDaily)
+    clear_total = delete(UserEntryStatsTotal)
+    clear_activity = delete(UserEntryActivity)
+    live = [Entry.is_deleted == False]  # noqa: E712
+    if author_id is not None:
+        clear = clear.where(UserEntryStatsDaily.author_id == author_id)
+        clear_total = clear_total.where(UserEntryStatsTotal.author_id == author_id)
+        clear_activity = clear_activity.where(UserEntryActivity.author_id == author_id)
+        live.append(Entry.author_id == author_id)
+    await s.execute(clear)
+    await s.execute(clear_total)
+    await s.execute(clear_activity)
+
+    await s.execute(
+        insert(UserEntryStatsTotal).from_select(
+            ["author_id", "entries"],
+            select(Entry.author_id, func.count())
+            .where(*live)
+            .group_by(Entry.author_id),
+        )
+    )
+
+    active_days = (
+        select(Entry.author_id, func.utc_day(Entry.created_at).label("day"))
+        .where(*live)
+        .distinct()
+        .subquery()
+    )
+    await s.execute(
+        select(func.entry_activity_refresh(active_days.c.author_id, active_days.c.day))
+    )
+
+    days = union_all(
+        select(
+            Entry.author_id,
+            func.utc_day(Entry.created_at).label("day"),
+            literal_column("1").label("created"),
+            literal_column("0").label("updated"),
+        ).where(*live),
+        select(
+            Entry.author_id,
+            func.utc_day(Entry.updated_at),
+            literal_column("0"),
+            literal_column("1"),
+        ).where(*live),
+    ).subquery()
+    result = await s.execute(
+        insert(UserEntryStatsDaily).from_select(
+            ["author_id", "day", "created", "updated"],
+            select(
+                days.c.author_id,
+                days.c.day,
+                func.sum(days.c.created),
+                func.sum(days.c.updated),
+            ).group_by(days.c.author_id, days.c.day),
+        )
+    )
+    return result.rowcount
+
+
+async def rebuild_all_entry_stats(session_factory: SessionFactory) -> int:
+    """Rebuild every author's counters, one short transaction per author."""
+    async with session_factory() as s:
+        author_ids = (
+            await s.scalars(
+                union(
+                    select(Entry.author_id),
+                    select(UserEntryStatsDaily.author_id),
+                    select(UserEntryStatsTotal.author_id),
+                    select(UserEntryActivity.author_id),
+                )
+            )
+        ).all()
+    rows = 0
+    for author_id in author_ids:
+        async with session_factory() as s:
+            rows += await rebuild_entry_stats(s, author_id)
+            await s.commit()
+    return rows
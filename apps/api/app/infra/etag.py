@@ -0,0 +1,65 @@
+"""Entity tags for conditional entry requests.
+
+Entry ETags are strong and derived from (id, version, representation). The
+version is kept readable as a prefix so an ``If-Match`` header can stand in
+for ``expected_version`` on writes; the hash binds the tag to one entry.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import hashlib
+from uuid import UUID
+
+
+REPRESENTATIONS = ("html", "markdown")
+
+
+def _digest(*parts: object) -> str:
+    return hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()[:16]
+
+
+def entry_etag(entry_id: UUID, version: int, representation: str) -> str:
+    """Strong ETag of one entry in one representation."""
+    return f'"{version}-{_digest(entry_id, version, representation)}"'
+
+
+def list_etag(items: Iterable[tuple[UUID, int]], representation: str) -> str:
+    """Strong ETag of a listing page from the (id, version) of its items."""
+    h = hashlib.sha256(representation.encode())
+    for entry_id, version in items:
+        h.update(f"{entry_id}:{version};".encode())
+    return f'"{h.hexdigest()[:24]}"'
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: str | None, etag: str) -> bool:
+    """True when ``If-None-Match`` matches ``etag`` (weak comparison)."""
+    if not header:
+        return False
+    return any(
+        tag in {"*", etag} or tag.removeprefix("W/") == etag for tag in _tags(header)
+    )
+
+
+def if_match_version(header: str, entry_id: UUID) -> int | None:
+    """Version named by an ``If-Match`` header for this entry.
+
+    Returns:
+        The version of the first tag issued for ``entry_id``, or None when no
+        tag matches (including weak tags, which never match for writes).
+    """
+    for tag in _tags(header):
+        if tag.startswith("W/"):
+            continue
+        version, _, _digest_part = tag.strip('"').partition("-")
+        if not version.isdigit():
+            continue
+        if any(
+            tag == entry_etag(entry_id, int(version), rep) for rep in REPRESENTATIONS
+        ):
+            return int(version)
+    return None
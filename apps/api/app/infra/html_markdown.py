@@ -0,0 +1,499 @@
+"""Single-pass HTML to Markdown conversion.
+
+``MarkdownWriter`` is an ``html.parser`` tokenizer callback that emits
+Markdown chunks as tags and text arrive, so a document is scanned once and
+the output is joined once at the end. Block structure (paragraphs, headings,
+nested lists, blockquotes, fenced code, tables) is tracked with small stacks
+instead of being reconstructed from the flat text afterwards.
+
+Inline elements whose delimiters depend on their content (emphasis, links,
+inline code, table cells) are written into a nested buffer that is spliced
+into its parent when the element closes; every character is copied at most
+once per level of nesting.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import html as html_module
+from html.parser import HTMLParser
+import re
+
+
+_HTML_SPACE = re.compile(r"[ \t\n\r\f]+")
+# Characters that would otherwise start inline markup (or a raw HTML tag /
+# entity) when the text is rendered back
+_INLINE_ESCAPE = re.compile(
+    r"[\\`*\[\]]|~(?=~)|(?<!\w)_|_(?!\w)|<(?=[A-Za-z/!?])|&(?=#?\w+;)"
+)
+# Text that would be read as a block marker at the start of a line
+_BLOCK_MARKER = re.compile(r"#{1,6}(?=\s|$)|>|[-+=]+(?=\s|$)|\d{1,9}(?=[.)](?:\s|$))")
+_BACKTICKS = re.compile(r"`+")
+
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_EMPHASIS = {
+    "strong": "**",
+    "b": "**",
+    "em": "*",
+    "i": "*",
+    "del": "~~",
+    "s": "~~",
+    "strike": "~~",
+}
+_INLINE = {*_EMPHASIS, "a", "code"}
+_BLOCKS = {
+    "address",
+    "article",
+    "aside",
+    "dd",
+    "details",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "footer",
+    "header",
+    "main",
+    "nav",
+    "p",
+    "section",
+    "summary",
+}
+_SKIPPED = {"head", "noscript", "script", "style", "template", "title"}
+
+
+@dataclass
+class _Frame:
+    """An element whose output is buffered until it closes."""
+
+    tag: str
+    parent: list[str]
+    attrs: dict[str, str] = field(default_factory=dict)
+    # Line state of the parent, restored when a table cell closes
+    line: tuple[bool, bool, bool, bool] | None = None
+
+
+@dataclass
+class _List:
+    ordered: bool
+    counter: int
+    item_open: bool = False
+
+
+@dataclass
+class _Table:
+    rows: list[list[str]] = field(default_factory=list)
+    row: list[str] | None = None
+
+
+def _code_language(attrs: dict[str, str]) -> str:
+    for cls in attrs.get("class", "").split():
+        if cls.startswith(("language-", "lang-")):
+            return cls.partition("-")[2]
+    return ""
+
+
+def _fence(text: str, char: str = "`") -> str:
+    longest = max((len(m) for m in _BACKTICKS.findall(text)), default=0)
+    return char * max(3 if char == "`" and "\n" in text else 1, longest + 1)
+
+
+def _destination(url: str) -> str:
+    if any(c in url for c in " ()<>\t\n"):
+        return "<" + url.replace("<", "%3C").replace(">", "%3E") + ">"
+    return url
+
+
+class MarkdownWriter(HTMLParser):
+    """Tokenizer callbacks that write CommonMark while the HTML is parsed."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        self._frames: list[_Frame] = []
+        # (owner tag, line prefix) for blockquotes and list item continuation
+        self._prefixes: list[tuple[str, str]] = []
+        self._lists: list[_List] = []
+        self._tables: list[_Table] = []
+        self._pre: list[str] | None = None
+        self._pre_lang = ""
+        self._heading = False
+        self._code = 0
+        self._cell = 0
+        self._skip = 0
+        # Newlines owed before the next output (1 = line break, 2 = blank line)
+        self._pending = 0
+        self._hard_break = False
+        # Newlines already at the end of the output
+        self._newlines = 0
+        self._written = False
+        self._line_start = True
+        self._line_has_text = False
+        self._space_ok = False
+        self._trim = False
+        # Text seen inside skipped elements (scripts, styles, ...)
+        self.skipped_text = False
+
+    # -- output primitives ---------------------------------------------
+
+    def _prefix(self) -> str:
+        return "".join(prefix for _, prefix in self._prefixes)
+
+    def _flush(self) -> None:
+        """Emit the newlines owed by the last block or line break."""
+        n, self._pending = self._pending, 0
+        owed = n - self._newlines
+        if owed <= 0 or not self._written or self._cell:
+            return
+        blank = self._prefix().rstrip()
+        if not self._newlines:
+            if self._trim and self._out:
+                self._out[-1] = self._out[-1].rstrip(" ")
+            if self._hard_break and n == 1 and self._line_has_text:
+                self._out.append("\\")
+            self._out.append("\n")
+            owed -= 1
+        self._out.append((blank + "\n") * owed)
+        self._newlines = n
+        self._hard_break = False
+        self._line_start = True
+        self._line_has_text = False
+        self._space_ok = False
+        self._trim = False
+
+    def _begin_line(self) -> None:
+        self._flush()
+        if self._line_start:
+            self._line_start = False
+            self._newlines = 0
+            if not self._cell:
+                self._out.append(self._prefix())
+
+    def _raw(self, text: str, *, is_text: bool = True) -> None:
+        """Write ``text`` verbatim (markers, fences, code lines)."""
+        self._begin_line()
+        self._out.append(text)
+        self._written = True
+        self._line_has_text = self._line_has_text or is_text
+        self._space_ok = bool(text) and not text.endswith(" ")
+        self._trim = False
+
+    def _text(self, text: str) -> None:
+        """Write document text, collapsing whitespace and escaping markup."""
+        text = _HTML_SPACE.sub(" ", text)
+        if self._pending or self._line_start or not self._space_ok:
+            text = text.lstrip(" ")
+        if not text:
+            return
+        if not self._code:
+            text = _INLINE_ESCAPE.sub(r"\\\g<0>", text)
+        self._begin_line()
+        if not self._line_has_text and not self._cell:
+            m = _BLOCK_MARKER.match(text)
+            if m:
+                cut = m.end() if m.group()[0].isdigit() else 0
+                text = f"{text[:cut]}\\{text[cut:]}"
+        self._out.append(text)
+        self._written = True
+        self._line_has_text = True
+        self._space_ok = not text.endswith(" ")
+        self._trim = True
+
+    def _block_start(self, n: int = 2) -> None:
+        self._close_inline()
+        # A block opening right after a list marker shares the marker's line
+        if self._cell or (not self._line_start and not self._line_has_text):
+            return
+        self._pending = max(self._pending, n)
+
+    def _block_end(self, n: int = 2) -> None:
+        self._close_inline()
+        if not self._cell:
+            self._pending = max(self._pending, n)
+
+    # -- buffered elements ---------------------------------------------
+
+    def _open_frame(self, tag: str, attrs: dict[str, str]) -> None:
+        line = None
+        if tag == "td":
+            line = (self._line_start, self._line_has_text, self._space_ok, self._trim)
+        else:
+            self._begin_line()
+            self._line_has_text = True
+        self._frames.append(_Frame(tag, self._out, attrs, line))
+        self._out = []
+
+    def _close_frame(self) -> None:
+        frame = self._frames.pop()
+        inner, self._out = "".join(self._out), frame.parent
+        if frame.line is not None:
+            self._line_start, self._line_has_text, self._space_ok, self._trim = (
+                frame.line
+            )
+            self._end_cell(inner)
+            return
+        stripped = inner.strip(" ")
+        if frame.tag == "code":
+            self._code -= 1
+            if stripped:
+                fence = _fence(inner)
+                pad = " " if inner.startswith("`") or inner.endswith("`") else ""
+                inner = f"{fence}{pad}{inner}{pad}{fence}"
+        elif frame.tag == "a":
+            href = frame.attrs.get("href", "")
+            if href and stripped:
+                lead = inner[: len(inner) - len(inner.lstrip(" "))]
+                tail = inner[len(inner.rstrip(" ")) :]
+                dest = _destination(href)
+                inner = f"{lead}[{stripped}]({dest}){tail}"
+        elif stripped:
+            mark = _EMPHASIS[frame.tag]
+            lead = inner[: len(inner) - len(inner.lstrip(" "))]
+            tail = inner[len(inner.rstrip(" ")) :]
+            inner = f"{lead}{mark}{stripped}{mark}{tail}"
+        self._out.append(inner)
+        self._trim = True
+
+    def _close_inline(self, tag: str | None = None) -> None:
+        """Close buffered inline elements, up to ``tag`` when given."""
+        if tag is not None and not any(f.tag == tag for f in self._frames):
+            return
+        while self._frames and self._frames[-1].tag in _INLINE:
+            closing = self._frames[-1].tag
+            self._close_frame()
+            if closing == tag:
+                return
+
+    # -- lists, quotes, tables -----------------------------------------
+
+    def _pop_prefix(self, owner: str) -> None:
+        while self._prefixes:
+            if self._prefixes.pop()[0] == owner:
+                return
+
+    def _end_item(self) -> None:
+        if self._lists and self._lists[-1].item_open:
+            self._lists[-1].item_open = False
+            self._pop_prefix("li")
+            self._block_end(1)
+
+    def _start_item(self) -> None:
+        if not self._lists:
+            self._lists.append(_List(ordered=False, counter=1))
+        self._end_item()
+        lst = self._lists[-1]
+        self._pending = max(self._pending, 1)
+        self._close_inline()
+        self._flush()
+        marker = f"{lst.counter}. " if lst.ordered else "- "
+        lst.counter += 1
+        lst.item_open = True
+        self._raw(marker, is_text=False)
+        self._space_ok = False
+        self._prefixes.append(("li", " " * len(marker)))
+
+    def _end_cell(self, inner: str) -> None:
+        self._cell -= 1
+        table = self._tables[-1]
+        if table.row is None:
+            table.row = []
+        cell = _HTML_SPACE.sub(" ", inner.replace("|", "\\|")).strip()
+        table.row.append(cell)
+
+    def _end_row(self) -> None:
+        if self._frames and self._frames[-1].tag == "td":
+            self._close_frame()
+        table = self._tables[-1]
+        if table.row is not None:
+            table.rows.append(table.row)
+            table.row = None
+
+    def _end_table(self) -> None:
+        self._close_inline()
+        while self._frames and self._frames[-1].tag == "td":
+            self._close_frame()
+        self._end_row()
+        table = self._tables.pop()
+        if not table.rows:
+            return
+        width = max(len(row) for row in table.rows)
+        rows = [row + [""] * (width - len(row)) for row in table.rows]
+        rows.insert(1, ["---"] * width)
+        self._block_start(2)
+        for row in rows:
+            self._raw("| " + " | ".join(row) + " |")
+            self._pending = 1
+        self._block_end(2)
+
+    # -- tokenizer callbacks -------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED:
+            self._skip += 1
+        if self._skip:
+            return
+        attr = {k: v or "" for k, v in attrs}
+        if self._pre is not None:
+            if tag == "br":
+                self._pre.append("\n")
+            elif tag == "code":
+                self._pre_lang = self._pre_lang or _code_language(attr)
+            return
+        if self._code and tag != "br":
+            return  # formatting inside inline code is not representable
+        if tag in _EMPHASIS or tag in {"a", "code"}:
+            if tag == "code":
+                self._code += 1
+            self._open_frame(tag, attr)
+        elif tag in _HEADINGS and not self._heading:
+            self._block_start(2)
+            self._raw("#" * _HEADINGS[tag] + " ", is_text=False)
+            self._space_ok = False
+            self._heading = True
+        elif tag in _BLOCKS:
+            self._block_start(2)
+        elif tag == "br":
+            if self._heading or self._cell:
+                self._text(" ")
+            elif self._hard_break:
+                self._pending, self._hard_break = 2, False
+            elif self._written:
+                self._pending = max(self._pending, 1)
+                self._hard_break = self._pending == 1
+        elif tag == "hr":
+            self._block_start(2)
+            self._raw("---")
+            self._block_end(2)
+        elif tag == "img":
+            src = attr.get("src", "")
+            if src:
+                alt = _INLINE_ESCAPE.sub(r"\\\g<0>", attr.get("alt", ""))
+                self._raw(f"![{alt}]({_destination(src)})")
+        elif tag == "blockquote":
+            self._block_start(2)
+            self._flush()
+            self._prefixes.append(("blockquote", "> "))
+        elif tag in {"ul", "ol"}:
+            self._block_start(1 if self._lists else 2)
+            start = attr.get("start", "1")
+            counter = int(start) if start.isdigit() else 1
+            self._lists.append(_List(ordered=tag == "ol", counter=counter))
+        elif tag == "li":
+            self._start_item()
+        elif tag == "pre":
+            self._block_start(2)
+            self._pre = []
+            self._pre_lang = _code_language(attr)
+        elif tag == "table":
+            self._close_inline()
+            self._tables.append(_Table())
+        elif tag == "tr" and self._tables:
+            self._end_row()
+            self._tables[-1].row = []
+        elif tag in {"td", "th"} and self._tables:
+            self._close_inline()
+            if self._frames and self._frames[-1].tag == "td":
+                self._close_frame()
+            self._cell += 1
+            self._open_frame("td", attr)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._skip:
+            return
+        if self._pre is not None:
+            if tag == "pre":
+                self._end_pre()
+            return
+        if tag in _INLINE:
+            self._close_inline(tag)
+        elif tag in _HEADINGS:
+            self._heading = False
+            self._block_end(2)
+        elif tag in _BLOCKS:
+            self._block_end(2)
+        elif tag == "blockquote":
+            self._close_inline()
+            self._pop_prefix("blockquote")
+            self._block_end(2)
+        elif tag == "li":
+            self._close_inline()
+            self._end_item()
+        elif tag in {"ul", "ol"} and self._lists:
+            self._close_inline()
+            self._end_item()
+            self._lists.pop()
+            self._block_end(1 if self._lists else 2)
+        elif tag in {"td", "th"}:
+            self._close_inline()
+            if self._frames and self._frames[-1].tag == "td":
+                self._close_frame()
+        elif tag == "tr" and self._tables:
+            self._close_inline()
+            self._end_row()
+        elif tag == "table" and self._tables:
+            self._end_table()
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            self.skipped_text = self.skipped_text or bool(data.strip())
+            return
+        if self._pre is not None:
+            self._pre.append(data)
+        elif self._tables and not self._cell:
+            return  # whitespace between table tags
+        else:
+            self._text(data)
+
+    def _end_pre(self) -> None:
+        code, self._pre = "".join(self._pre or ()), None
+        code = code.removeprefix("\n").rstrip("\n")
+        fence = _fence(code + "\n")
+        self._raw(fence + self._pre_lang)
+        # Blank code lines are owed newlines so they carry no indentation
+        breaks = 1
+        for line in code.split("\n"):
+            if not line:
+                breaks += 1
+                continue
+            self._pending, breaks = breaks, 1
+            self._raw(line)
+        self._pending = breaks
+        self._raw(fence)
+        self._block_end(2)
+
+    def close(self) -> None:
+        super().close()
+        # Unwind whatever the document left open
+        if self._pre is not None:
+            self._end_pre()
+        while self._frames:
+            if self._frames[-1].tag == "td":
+                self._close_frame()
+            else:
+                self._close_inline()
+        while self._tables:
+            self._end_table()
+
+    def markdown(self) -> str:
+        return "".join(self._out).strip()
+
+
+def convert(html: str) -> str:
+    """Convert an HTML document to Markdown in one tokenizer pass.
+
+    Empty documents (``<p></p>``, ``<br>``) convert to ``""``. A document
+    whose only text is inside dropped elements (e.g. a lone script block)
+    comes back as its source escaped to inert text, rather than as an empty
+    entry.
+    """
+    writer = MarkdownWriter()
+    writer.feed(html)
+    writer.close()
+    md = writer.markdown()
+    if md or not writer.skipped_text:
+        return md
+    return html_module.escape(html.strip(), quote=False)
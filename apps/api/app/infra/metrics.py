@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import html
 import re
 from typing import Any
 
@@ -51,3 +52,34 @@ def extract_text_for_metrics(
         return str(content["content"])
     # Fallback to string representation
     return str(content)
+
+
+_SKIP_BLOCKS = re.compile(
+    r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_TAGS = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+EXCERPT_LENGTH = 200
+
+
+def build_excerpt(html_content: str | None, length: int = EXCERPT_LENGTH) -> str:
+    """Build a one-line plain-text excerpt of rendered entry content.
+
+    Args:
+        html_content: Rendered HTML of the entry
+        length: Maximum excerpt length in characters
+
+    Returns:
+        Whitespace-collapsed text, cut at a word boundary with an ellipsis
+    """
+    if not html_content:
+        return ""
+    text = _TAGS.sub(" ", _SKIP_BLOCKS.sub(" ", html_content))
+    text = _WHITESPACE.sub(" ", html.unescape(text)).strip()
+    if len(text) <= length:
+        return text
+    cut = text[: length - 1]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:") + "…"
@@ -23,7 +23,8 @@ class Entry(SQLModel, table=True):
     """Journal entry model aligned with Alembic migrations.
 
     Notes:
-    - `content` is a plain text string for simplicity and FTS compatibility.
+    - `content` is a plain text string for simplicity and FTS compatibility;
+      it is NULL for markdown entries whose HTML is rendered on read.
     - `search_vector` is a generated TSVECTOR in the database (not represented here).
     - `word_count` is optional and may be populated by services or triggers.
     - `version` enables optimistic locking via SQLAlchemy.
@@ -34,8 +35,9 @@ class Entry(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     author_id: UUID = Field(index=True)
     title: str = Field(default="")
-    content: str = Field(default="")
+    content: str | None = Field(default="")
     markdown_content: str | None = Field(default=None)
+    excerpt: str | None = Field(default=None)
     content_version: int = Field(default=1)
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,19 +1,119 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+import logging
+from typing import Any
 
+import nats
 from nats.aio.client import Client as NatsClient
+from nats.js import JetStreamContext
 
 from app.settings import settings
+from app.telemetry.metrics_runtime import inc as metrics_inc
+
+
+logger = logging.getLogger(__name__)
+
+
+class NatsManager:
+    """Process-wide NATS client that connects once and reconnects on its own.
+
+    The client is created lazily (or at startup via ``connect``) and shared by
+    the outbox relay, admin endpoints and workers, so publishes reuse one
+    connection instead of paying a TCP+TLS handshake each time.
+    """
+
+    def __init__(self) -> None:
+        self._nc: NatsClient | None = None
+        self._js: JetStreamContext | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def client(self) -> NatsClient | None:
+        return self._nc
+
+    @property
+    def is_connected(self) -> bool:
+        return self._nc is not None and bool(self._nc.is_connected)
+
+    async def connect(self) -> NatsClient:
+        """Return the shared client, connecting on first use."""
+        if self._nc is not None and not self._nc.is_closed:
+            return self._nc
+        async with self._lock:
+            if self._nc is None or self._nc.is_closed:
+                self._nc = await nats.connect(
+                    servers=[settings.nats_url],
+                    max_reconnect_attempts=-1,  # keep trying; readyz reports state
+                    reconnect_time_wait=2,
+                    disconnected_cb=self._on_disconnected,
+                    reconnected_cb=self._on_reconnected,
+                    error_cb=self._on_error,
+                )
+                self._js = None
+                logger.info("Connected to NATS")
+        return self._nc
+
+    def attach(self, nc: NatsClient) -> None:
+        """Share a connection opened elsewhere (e.g. by a worker's retry loop)."""
+        self._nc = nc
+        self._js = None
+
+    def jetstream(self) -> JetStreamContext:
+        """Return the cached JetStream context of the shared client."""
+        if self._nc is None:
+            raise RuntimeError("NATS is not connected")
+        if self._js is None:
+            self._js = self._nc.jetstream()
+        return self._js
+
+    def jetstream_for(self, nc: NatsClient) -> JetStreamContext:
+        """Cached context for the shared client, a fresh one for any other."""
+        if nc is self._nc:
+            return self.jetstream()
+        return nc.jetstream()
+
+    def status(self) -> str:
+        """Connection state for health reporting."""
+        if self._nc is None:
+            return "not_started"
+        if self._nc.is_connected:
+            return "connected"
+        if self._nc.is_reconnecting:
+            return "reconnecting"
+        return "closed" if self._nc.is_closed else "disconnected"
+
+    async def close(self) -> None:
+        """Drain and close the shared client (shutdown only)."""
+        nc, self._nc, self._js = self._nc, None, None
+        if nc is not None and not nc.is_closed:
+            try:
+                await nc.drain()
+            except Exception:  # noqa: BLE001 - shutdown is best-effort
+                logger.debug("NATS drain failed", exc_info=True)
+
+    @staticmethod
+    async def _on_disconnected() -> None:
+        logger.warning("NATS disconnected")
+        metrics_inc("nats_connection_events_total", {"event": "disconnected"})
+
+    @staticmethod
+    async def _on_reconnected() -> None:
+        logger.info("NATS reconnected")
+        metrics_inc("nats_connection_events_total", {"event": "reconnected"})
+
+    @staticmethod
+    async def _on_error(exc: Any) -> None:
+        logger.warning("NATS client error: %s", exc)
+        metrics_inc("nats_connection_events_total", {"event": "error"})
+
+
+nats_manager = NatsManager()
 
 
 @asynccontextmanager
 async def nats_conn() -> AsyncIterator[NatsClient]:
-    nc = NatsClient()
-    await nc.connect(servers=[settings.nats_url])
-    try:
-        yield nc
-    finally:
-        await nc.drain()
-        await nc.close()
+    """Yield the shared NATS client; the connection outlives the block."""
+    yield await nats_manager.connect()
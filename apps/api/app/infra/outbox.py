@@ -3,7 +3,6 @@ from __future__ import annotations
 # Standard library imports
 import asyncio
 from contextlib import AbstractAsyncContextManager
-from datetime import UTC, datetime, timedelta
 import json
 
 # Local imports
@@ -11,14 +10,16 @@ import logging
 import os
 import random
 from typing import Protocol, runtime_checkable
+from uuid import UUID
 
 # Third-party imports
 from nats.aio.client import Client as NatsClient
 from nats.js import JetStreamContext
-from sqlalchemy import func, select, text, text as _text, update
+from sqlalchemy import any_, bindparam, func, select, text, text as _text, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.nats_bus import nats_conn
+from app.infra.nats_bus import nats_conn, nats_manager
 from app.infra.sa_models import Event
 from app.telemetry.metrics_runtime import inc as metrics_inc
 
@@ -37,57 +38,163 @@ class SessionFactory(Protocol):
         ...
 
 
-async def _publish_rows(
-    s: AsyncSession, rows: list[Event], retry_enabled: bool
+def _encode_event(ev: Event) -> tuple[str, bytes]:
+    """Return the subject and wire payload for an outbox row."""
+    subject = SUBJECT_MAP.get(ev.aggregate_type, "journal.events")
+    # Normalize timestamp to naive ISO without offset for compatibility
+    ts = ev.occurred_at.replace(tzinfo=None).isoformat(timespec="seconds")
+    payload = json.dumps({
+        "id": str(ev.id),
+        "event_type": ev.event_type,
+        "event_data": ev.event_data,
+        "ts": ts,
+    }).encode("utf-8")
+    return subject, payload
+
+
+def _jetstream(nc: NatsClient) -> JetStreamContext | None:
+    try:
+        # Cached context when nc is the shared connection
+        return nats_manager.jetstream_for(nc)
+    except Exception:  # noqa: BLE001 - tolerate missing JetStream
+        return None
+
+
+async def _publish_one(
+    nc: NatsClient,
+    js: JetStreamContext | None,
+    subject: str,
+    payload: bytes,
+    msg_id: str,
 ) -> None:
-    """Publish rows to NATS (JetStream if available) and mark as published."""
+    if js:
+        # De-dupe via headers if supported (msg_id deprecated)
+        await js.publish(subject, payload, headers={"Nats-Msg-Id": msg_id})
+    else:
+        await nc.publish(subject, payload)
+
+
+async def _publish_all(
+    nc: NatsClient, messages: list[tuple[str, bytes, str]]
+) -> list[BaseException | None]:
+    """Publish ``(subject, payload, msg_id)`` triples concurrently.
+
+    JetStream publishes are fired together so their acks are pipelined over the
+    single connection instead of paying one round trip each. Returns one entry
+    per message: ``None`` on success, the raised exception otherwise.
+    """
+    # Prefer JetStream publish with de-dupe if available
+    js = _jetstream(nc)
+    results = await asyncio.gather(
+        *(
+            _publish_one(nc, js, subject, payload, msg_id)
+            for subject, payload, msg_id in messages
+        ),
+        return_exceptions=True,
+    )
+    return [r if isinstance(r, BaseException) else None for r in results]
+
+
+class _BlockedByPredecessorError(Exception):
+    """Not attempted because an earlier event of the same aggregate failed."""
+
+
+async def _publish_ordered(
+    nc: NatsClient, rows: list[Event]
+) -> list[BaseException | None]:
+    """Publish rows preserving order within each aggregate.
+
+    Events of one aggregate are published one after another in row order, while
+    different aggregates are pipelined concurrently. When a publish fails, the
+    remaining events of that aggregate are reported as
+    ``_BlockedByPredecessorError`` and left untouched for a later batch.
+    """
+    js = _jetstream(nc)
+    results: list[BaseException | None] = [None] * len(rows)
+    chains: dict[UUID, list[int]] = {}
+    for i, ev in enumerate(rows):
+        chains.setdefault(ev.aggregate_id, []).append(i)
+
+    async def _chain(indexes: list[int]) -> None:
+        for pos, i in enumerate(indexes):
+            subject, payload = _encode_event(rows[i])
+            try:
+                await _publish_one(nc, js, subject, payload, str(rows[i].id))
+            except Exception as exc:  # noqa: BLE001 - reported per event
+                results[i] = exc
+                for j in indexes[pos + 1 :]:
+                    results[j] = _BlockedByPredecessorError()
+                return
+
+    await asyncio.gather(*(_chain(indexes) for indexes in chains.values()))
+    return results
+
+
+async def _mark_published(s: AsyncSession, ids: list[UUID]) -> None:
+    """Mark a set of events as published with a single UPDATE.
+
+    RETURNING the entity with ``populate_existing`` refreshes instances already
+    in the identity map, replacing the per-row ``refresh`` round trips.
+    """
+    await s.execute(
+        update(Event)
+        .where(Event.id == any_(bindparam("ids", ids, type_=ARRAY(PGUUID()))))
+        .values(published_at=func.now())
+        .returning(Event)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+async def _publish_rows(
+    s: AsyncSession, rows: list[Event], retry_enabled: bool, ordered: bool = False
+) -> int:
+    """Publish rows to NATS (JetStream if available) and mark as published.
+
+    The whole batch is published concurrently, successes are acknowledged with
+    one UPDATE and failures go through retry bookkeeping in bulk. With
+    ``ordered`` the events of each aggregate are published in row order and
+    stop at the first failure. Returns the number of events published.
+    """
     # Support monkeypatched nats_conn that returns a coroutine yielding a
     # context manager
     ctx = nats_conn()
     if asyncio.iscoroutine(ctx):
         ctx = await ctx
     async with ctx as nc:
-        # Prefer JetStream publish with de-dupe if available
-        js: JetStreamContext | None = None
-        try:
-            js = nc.jetstream()
-        except Exception:  # noqa: BLE001 - tolerate missing JetStream
-            js = None
-        for ev in rows:
-            subject = SUBJECT_MAP.get(ev.aggregate_type, "journal.events")
-            # Normalize timestamp to naive ISO without offset for compatibility
-            ts = ev.occurred_at.replace(tzinfo=None).isoformat(timespec="seconds")
-            payload = json.dumps({
-                "id": str(ev.id),
-                "event_type": ev.event_type,
-                "event_data": ev.event_data,
-                "ts": ts,
-            }).encode("utf-8")
-            try:
-                metrics_inc("outbox_publish_attempts_total", {"stage": "attempt"})
-                if js:
-                    # De-dupe via headers if supported (msg_id deprecated)
-                    await js.publish(
-                        subject, payload, headers={"Nats-Msg-Id": str(ev.id)}
-                    )
-                else:
-                    await nc.publish(subject, payload)
-
-                # Mark as published in DB, then refresh instance for identity map
-                await s.execute(
-                    update(Event)
-                    .where(Event.id == ev.id)
-                    .values(published_at=func.now())
-                )
-                await s.refresh(ev)
-                metrics_inc("outbox_publish_attempts_total", {"result": "ok"})
-            except Exception as e:  # noqa: BLE001 - operational resilience
-                # Compute backoff and schedule retry if enabled; otherwise, best-effort log
-                if retry_enabled:
-                    await _schedule_retry_or_dead(s, ev, e, nc)
-                else:
-                    _log_only(e)
-                metrics_inc("outbox_publish_attempts_total", {"result": "error"})
+        metrics_inc(
+            "outbox_publish_attempts_total", {"stage": "attempt"}, float(len(rows))
+        )
+        if ordered:
+            results = await _publish_ordered(nc, rows)
+        else:
+            messages = [(*_encode_event(ev), str(ev.id)) for ev in rows]
+            results = await _publish_all(nc, messages)
+
+        ok_ids = [ev.id for ev, err in zip(rows, results, strict=True) if err is None]
+        failures = [
+            (ev, err)
+            for ev, err in zip(rows, results, strict=True)
+            if isinstance(err, Exception)
+            and not isinstance(err, _BlockedByPredecessorError)
+        ]
+        if ok_ids:
+            await _mark_published(s, ok_ids)
+            metrics_inc(
+                "outbox_publish_attempts_total", {"result": "ok"}, float(len(ok_ids))
+            )
+        if failures:
+            # Compute backoff and schedule retry if enabled; otherwise, best-effort log
+            if retry_enabled:
+                await _schedule_retries_or_dead(s, failures, nc)
+            else:
+                for _ev, err in failures:
+                    _log_only(err)
+            metrics_inc(
+                "outbox_publish_attempts_total",
+                {"result": "error"},
+                float(len(failures)),
+            )
+        return len(ok_ids)
 
 
 async def relay_outbox(
@@ -117,8 +224,14 @@ async def relay_outbox(
                         .with_for_update(skip_locked=True)
                     )
                 else:
-                    # Legacy behavior: any unpublished
-                    stmt = select(Event).where(Event.published_at.is_(None)).limit(50)
+                    # Legacy behavior: any unpublished; SKIP LOCKED so concurrent
+                    # relays never claim the same rows
+                    stmt = (
+                        select(Event)
+                        .where(Event.published_at.is_(None))
+                        .limit(50)
+                        .with_for_update(skip_locked=True)
+                    )
                 rows = (await s.execute(stmt)).scalars().all()
                 if not rows:
                     await asyncio.sleep(poll_seconds)
@@ -131,60 +244,97 @@ async def relay_outbox(
             await asyncio.sleep(poll_seconds)
 
 
+# Two-key advisory lock namespace for outbox partitions ("outb")
+OUTBOX_LOCK_NAMESPACE = 0x6F757462
+
+# Pending events of one partition (hash of aggregate_id), in seq order. The
+# running bool_and cuts each aggregate off at its first event that is not yet
+# due, so a failed event is never overtaken by its successors.
+_CLAIM_PARTITION_SQL = text(
+    "SELECT * FROM ("
+    "SELECT events.*, bool_and(COALESCE(next_attempt_at, now()) <= now()) "
+    "OVER (PARTITION BY aggregate_id ORDER BY seq) AS due "
+    "FROM events WHERE published_at IS NULL AND state = 'pending' "
+    "AND mod(abs(hashtext(aggregate_id::text)), :partitions) = :partition"
+    ") AS pending WHERE due ORDER BY seq LIMIT :limit"
+)
+
+
+async def _claim_partition_batch(
+    s: AsyncSession, partition: int, partitions: int, limit: int
+) -> list[Event] | None:
+    """Lock one outbox partition for this transaction and load its next batch.
+
+    Returns ``None`` when another relay holds the partition.
+    """
+    locked = (
+        await s.execute(
+            text("SELECT pg_try_advisory_xact_lock(:ns, :partition)"),
+            {"ns": OUTBOX_LOCK_NAMESPACE, "partition": partition},
+        )
+    ).scalar()
+    if not locked:
+        return None
+
+    result = await s.execute(
+        select(Event).from_statement(_CLAIM_PARTITION_SQL),
+        {"partitions": partitions, "partition": partition, "limit": limit},
+    )
+    return list(result.scalars().all())
+
+
+async def relay_outbox_partitioned(
+    session_factory: SessionFactory,
+    partitions: int,
+    poll_seconds: float = 1.0,
+    batch_size: int = 50,
+) -> None:
+    """Relay loop that shares the outbox with other relays by partition.
+
+    Events are assigned to ``partitions`` buckets by hash of ``aggregate_id``.
+    Each batch holds a transaction-scoped advisory lock on its partition, so at
+    most one relay publishes a partition at a time, and events of an aggregate
+    are published in ``seq`` order. Relays start at different offsets and skip
+    partitions held by others, so throughput grows with the number of relays.
+    """
+    start = random.randrange(partitions)  # noqa: S311 - load spreading, non-crypto
+    while True:
+        published_any = False
+        for step in range(partitions):
+            partition = (start + step) % partitions
+            try:
+                async with session_factory() as s:
+                    rows = await _claim_partition_batch(
+                        s, partition, partitions, batch_size
+                    )
+                    if not rows:
+                        await s.rollback()
+                        continue
+                    await _publish_rows(s, rows, retry_enabled=True, ordered=True)
+                    await s.commit()
+                    published_any = True
+            except Exception:  # noqa: BLE001 - keep relay running on unexpected errors
+                logging.getLogger(__name__).debug(
+                    "partition %s relay batch failed", partition, exc_info=True
+                )
+        if not published_any:
+            await asyncio.sleep(poll_seconds)
+
+
 async def process_outbox_batch(session_factory: SessionFactory) -> int:
     """Process a single batch of unpublished events.
 
-    Publishes each event to NATS and marks it as published.
+    Publishes the batch to NATS and marks successful events as published.
     Returns the number of events published.
     """
-    published = 0
     async with session_factory() as s:
         stmt = select(Event).where(Event.published_at.is_(None)).limit(100)
         rows = (await s.execute(stmt)).scalars().all()
         if not rows:
             return 0
 
-        ctx = nats_conn()
-        if asyncio.iscoroutine(ctx):
-            ctx = await ctx
-        async with ctx as nc:
-            js: JetStreamContext | None = None
-            try:
-                js = nc.jetstream()
-            except Exception:  # noqa: BLE001 - tolerate missing JetStream
-                js = None
-            for ev in rows:
-                subject = SUBJECT_MAP.get(ev.aggregate_type, "journal.events")
-                ts = ev.occurred_at.replace(tzinfo=None).isoformat(timespec="seconds")
-                payload = json.dumps({
-                    "id": str(ev.id),
-                    "event_type": ev.event_type,
-                    "event_data": ev.event_data,
-                    "ts": ts,
-                }).encode("utf-8")
-                try:
-                    metrics_inc("outbox_publish_attempts_total", {"stage": "attempt"})
-                    if js:
-                        # Use headers for message ID (msg_id deprecated)
-                        await js.publish(
-                            subject, payload, headers={"Nats-Msg-Id": str(ev.id)}
-                        )
-                    else:
-                        await nc.publish(subject, payload)
-                    await s.execute(
-                        update(Event)
-                        .where(Event.id == ev.id)
-                        .values(published_at=func.now())
-                    )
-                    await s.refresh(ev)
-                    published += 1
-                    metrics_inc("outbox_publish_attempts_total", {"result": "ok"})
-                except Exception as e:  # noqa: BLE001 - operational resilience
-                    if os.getenv("OUTBOX_RETRY_ENABLED", "0") == "1":
-                        await _schedule_retry_or_dead(s, ev, e, nc)
-                    else:
-                        _log_only(e)
-                    metrics_inc("outbox_publish_attempts_total", {"result": "error"})
+        retry_enabled = os.getenv("OUTBOX_RETRY_ENABLED", "0") == "1"
+        published = await _publish_rows(s, list(rows), retry_enabled)
         await s.commit()
     return published
 
@@ -207,10 +357,10 @@ def _log_only(error: Exception) -> None:
         logger.debug("logging failed: %s", exc)
 
 
-async def _schedule_retry_or_dead(
-    session: AsyncSession, ev: Event, error: Exception, nc: NatsClient
+async def _schedule_retries_or_dead(
+    session: AsyncSession, failures: list[tuple[Event, Exception]], nc: NatsClient
 ) -> None:
-    """Best-effort update of retry bookkeeping; tolerant if columns are missing.
+    """Best-effort bulk update of retry bookkeeping; tolerant if columns are missing.
 
     Columns: attempts (int), next_attempt_at (timestamptz), last_error (text), state (text)
     """
@@ -235,89 +385,63 @@ async def _schedule_retry_or_dead(
             logging.getLogger(__name__).debug(
                 "DDL ensure columns failed or not needed: %s", exc
             )
-        # Read current attempts; if column missing this will fail and we fall back silently
-        now = datetime.now(UTC)
         base = float(os.getenv("OUTBOX_RETRY_BASE_SECS", "0.25"))
         factor = float(os.getenv("OUTBOX_RETRY_FACTOR", "2.0"))
         cap = float(os.getenv("OUTBOX_RETRY_MAX_BACKOFF_SECS", "15"))
         max_attempts = int(os.getenv("OUTBOX_RETRY_MAX_ATTEMPTS", "6"))
 
-        # single UPDATE with computed next_attempt from attempts+1
-        # We approximate backoff by using attempts stored; if missing, first failure uses base.
-        # Note: use COALESCE for missing attempts.
-        # Fetch attempts if column exists
-        attempts = 0
-        try:
-            row = (
-                await session.execute(
-                    _text("SELECT attempts FROM events WHERE id = :id"), {"id": ev.id}
-                )
-            ).scalar_one()
-            attempts = int(row or 0)
-        except Exception as exc:  # noqa: BLE001 - attempts column may not exist yet
-            logging.getLogger(__name__).debug(
-                "attempts fetch failed (assuming 0): %s", exc
-            )
-            attempts = 0
-
-        next_delay = min(cap, base * (factor ** max(attempts, 0)))
-        # Full jitter
-        next_delay = random.random() * next_delay  # noqa: S311 - jitter backoff, non-crypto
-        next_at = now + timedelta(seconds=next_delay)
-        # Truncate error message to reasonable length
-        err_str = repr(error)
-        if len(err_str) > 500:
-            err_str = err_str[:500]
-
-        # Attempt update; if columns missing, ignore
-        await session.execute(
+        # Truncate error messages to reasonable length
+        errors = {ev.id: repr(err)[:500] for ev, err in failures}
+
+        # One UPDATE for the whole batch: bump attempts, schedule the next
+        # attempt with capped exponential backoff and full jitter computed from
+        # the stored attempts, and mark rows dead once the threshold is reached.
+        result = await session.execute(
             _text(
-                "UPDATE events SET attempts = COALESCE(attempts, 0) + 1, "
-                "next_attempt_at = :next_at, last_error = :err, "
-                "state = COALESCE(state, 'pending') WHERE id = :id"
+                "UPDATE events AS e SET attempts = COALESCE(e.attempts, 0) + 1, "
+                "next_attempt_at = now() + make_interval(secs => random() * LEAST("
+                "CAST(:cap AS double precision), CAST(:base AS double precision) * "
+                "power(CAST(:factor AS double precision), COALESCE(e.attempts, 0)))), "
+                "last_error = f.err, "
+                "state = CASE WHEN COALESCE(e.attempts, 0) + 1 >= :max_attempts "
+                "THEN 'dead' ELSE COALESCE(e.state, 'pending') END "
+                "FROM unnest(CAST(:ids AS uuid[]), CAST(:errs AS text[])) AS f(id, err) "
+                "WHERE e.id = f.id RETURNING e.id, e.attempts, e.state"
             ),
-            {"id": ev.id, "next_at": next_at, "err": err_str},
+            {
+                "ids": list(errors),
+                "errs": list(errors.values()),
+                "cap": cap,
+                "base": base,
+                "factor": factor,
+                "max_attempts": max_attempts,
+            },
         )
-
-        # If exceeded threshold, best-effort mark dead and publish to DLQ via separate process
-        if attempts + 1 >= max_attempts:
-            try:
-                await session.execute(
-                    _text("UPDATE events SET state = 'dead' WHERE id = :id"),
-                    {"id": ev.id},
-                )
-            except Exception as exc:  # noqa: BLE001 - tolerate optional columns
-                logging.getLogger(__name__).debug(
-                    "mark dead state failed (optional column): %s", exc
-                )
-            # DLQ if enabled
-            if os.getenv("OUTBOX_DLQ_ENABLED", "0") == "1":
-                try:
-                    js: JetStreamContext | None = None
-                    try:
-                        js = nc.jetstream()
-                    except Exception:  # noqa: BLE001 - tolerate missing JetStream
-                        js = None
-                    envelope = {
-                        "original_subject": SUBJECT_MAP.get(
-                            ev.aggregate_type, "journal.events"
-                        ),
-                        "payload": ev.event_data,
-                        "reason": err_str,
-                        "attempts": attempts + 1,
-                        "event_id": str(ev.id),
-                    }
-                    data = json.dumps(envelope).encode("utf-8")
-                    if js:
-                        await js.publish(
-                            "journal.dlq", data, headers={"Nats-Msg-Id": str(ev.id)}
-                        )
-                    else:
-                        await nc.publish("journal.dlq", data)
+        dead = [(row[0], int(row[1])) for row in result.all() if row[2] == "dead"]
+
+        # DLQ if enabled; exhausted events are published as one pipelined batch
+        if dead and os.getenv("OUTBOX_DLQ_ENABLED", "0") == "1":
+            by_id = {ev.id: ev for ev, _err in failures}
+            messages: list[tuple[str, bytes, str]] = []
+            for event_id, attempts in dead:
+                ev = by_id[event_id]
+                envelope = {
+                    "original_subject": SUBJECT_MAP.get(
+                        ev.aggregate_type, "journal.events"
+                    ),
+                    "payload": ev.event_data,
+                    "reason": errors[event_id],
+                    "attempts": attempts,
+                    "event_id": str(event_id),
+                }
+                data = json.dumps(envelope).encode("utf-8")
+                messages.append(("journal.dlq", data, str(event_id)))
+            for err in await _publish_all(nc, messages):
+                if err is None:
                     metrics_inc("outbox_dlq_total")
-                except Exception as exc:  # noqa: BLE001 - DLQ best-effort
+                else:
                     logging.getLogger(__name__).debug(
-                        "DLQ publish best-effort failed: %s", exc
+                        "DLQ publish best-effort failed: %s", err
                     )
     except Exception as exc:  # noqa: BLE001 - do not crash relay on bookkeeping failure
         # swallow to avoid crashing outbox relay
@@ -0,0 +1,212 @@
+"""Maintenance of the time-partitioned `events` and `processed_events` tables.
+
+Both tables are range-partitioned by month (see migration 003). This module
+creates upcoming partitions ahead of time and retires partitions whose whole
+range is older than the retention window, either dropping them or detaching
+them into the `archive` schema.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.outbox import SessionFactory
+from app.settings import settings
+from app.telemetry.metrics_runtime import inc as metrics_inc
+
+
+logger = logging.getLogger(__name__)
+
+# Two-key advisory lock so only one process runs maintenance DDL at a time ("part")
+PARTITION_LOCK_NAMESPACE = 0x70617274
+
+ARCHIVE_SCHEMA = "archive"
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """A monthly range-partitioned table and its retention policy."""
+
+    name: str
+    column: str
+    retention_days: int
+    # Partitions are kept while any row matches this predicate
+    keep_if: str | None = None
+
+
+def partitioned_tables() -> list[PartitionedTable]:
+    return [
+        PartitionedTable(
+            name="events",
+            column="occurred_at",
+            retention_days=settings.events_retention_days,
+            keep_if="published_at IS NULL",
+        ),
+        PartitionedTable(
+            name="processed_events",
+            column="processed_at",
+            retention_days=settings.processed_events_retention_days,
+        ),
+    ]
+
+
+def _month_start(moment: datetime, offset: int = 0) -> datetime:
+    index = moment.year * 12 + (moment.month - 1) + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+async def ensure_partitions(
+    s: AsyncSession,
+    table: PartitionedTable,
+    months_ahead: int,
+    now: datetime | None = None,
+) -> list[str]:
+    """Create the current and next ``months_ahead`` monthly partitions.
+
+    Returns:
+        Names of the partitions that were created.
+    """
+    now = now or datetime.now(UTC)
+    existing = set(await _partitions(s, table.name))
+    created: list[str] = []
+    for offset in range(months_ahead + 1):
+        start = _month_start(now, offset)
+        name = partition_name(table.name, start)
+        if name in existing:
+            continue
+        try:
+            async with s.begin_nested():
+                await s.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table.name} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') "
+                        f"TO ('{_month_start(start, 1).isoformat()}')"
+                    )
+                )
+        except Exception as exc:  # noqa: BLE001 - overlapping range (e.g. legacy partition)
+            logger.debug("partition %s not created: %s", name, exc)
+            continue
+        created.append(name)
+    return created
+
+
+async def expire_partitions(
+    s: AsyncSession,
+    table: PartitionedTable,
+    archive: bool,
+    now: datetime | None = None,
+) -> list[str]:
+    """Drop or archive partitions whose whole range is past retention.
+
+    Partitions still holding rows matched by ``keep_if`` are left alone.
+
+    Returns:
+        Names of the partitions that were retired.
+    """
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=table.retention_days)
+    retired: list[str] = []
+    for name, bound in (await _partitions(s, table.name)).items():
+        match = _UPPER_BOUND.search(bound)
+        if not match:
+            # DEFAULT partition has no upper bound
+            continue
+        upper = datetime.fromisoformat(match.group(1))
+        if upper.tzinfo is None:
+            upper = upper.replace(tzinfo=UTC)
+        if upper > cutoff:
+            continue
+        if table.keep_if:
+            pending = (
+                await s.execute(
+                    text(f"SELECT 1 FROM {name} WHERE {table.keep_if} LIMIT 1")  # noqa: S608 - internal identifiers
+                )
+            ).first()
+            if pending:
+                logger.info("keeping expired partition %s: rows pending", name)
+                continue
+        if archive:
+            await s.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            await s.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {name}"))
+            await s.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        else:
+            await s.execute(text(f"DROP TABLE {name}"))
+        retired.append(name)
+    return retired
+
+
+async def run_partition_maintenance(s: AsyncSession) -> dict[str, list[str]]:
+    """Run one maintenance pass over all partitioned tables.
+
+    Returns:
+        Created and retired partition names, empty when another process holds
+        the maintenance lock.
+    """
+    report: dict[str, list[str]] = {"created": [], "retired": []}
+    locked = (
+        await s.execute(
+            text("SELECT pg_try_advisory_xact_lock(:ns, 0)"),
+            {"ns": PARTITION_LOCK_NAMESPACE},
+        )
+    ).scalar()
+    if not locked:
+        return report
+
+    for table in partitioned_tables():
+        report["created"] += await ensure_partitions(
+            s, table, settings.partition_months_ahead
+        )
+        report["retired"] += await expire_partitions(
+            s, table, settings.partition_archive
+        )
+    await s.commit()
+
+    metrics_inc("partitions_created_total", value=float(len(report["created"])))
+    metrics_inc("partitions_retired_total", value=float(len(report["retired"])))
+    return report
+
+
+async def partition_maintenance_loop(
+    session_factory: SessionFactory, interval_seconds: float = 3600.0
+) -> None:
+    """Periodically create upcoming partitions and retire expired ones."""
+    while True:
+        try:
+            async with session_factory() as s:
+                report = await run_partition_maintenance(s)
+            if report["created"] or report["retired"]:
+                logger.info(
+                    "partition maintenance: created=%s retired=%s",
+                    report["created"],
+                    report["retired"],
+                )
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            logger.exception("Partition maintenance failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def _partitions(s: AsyncSession, parent: str) -> dict[str, str]:
+    """Map each partition of ``parent`` to its bound expression."""
+    rows = await s.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": parent},
+    )
+    return dict(rows.tuples().all())
@@ -2,14 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
 from functools import lru_cache
-from typing import cast
+from typing import Any, cast
 
 from redis.asyncio import Redis
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from app.infra.deadlines import time_left
 from app.settings import settings
 
 
+class DeadlineRedis(Redis):
+    """Redis client whose commands give up at the request deadline.
+
+    Overruns raise redis' own TimeoutError, so callers that already treat
+    Redis as optional (``except RedisError``) degrade the same way.
+    """
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        budget = time_left()
+        if budget is None:
+            return await super().execute_command(*args, **options)
+        try:
+            async with asyncio.timeout(budget):
+                return await super().execute_command(*args, **options)
+        except TimeoutError as exc:
+            raise RedisTimeoutError("request deadline exceeded") from exc
+
+
 @lru_cache(maxsize=1)
 def get_redis_pool() -> Redis:
     """Create and cache Redis connection pool.
@@ -19,7 +40,7 @@ def get_redis_pool() -> Redis:
     """
     return cast(
         "Redis",
-        Redis.from_url(
+        DeadlineRedis.from_url(
             settings.redis_url,
             encoding="utf-8",
             decode_responses=False,  # Return bytes for flexibility
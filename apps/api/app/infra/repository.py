@@ -55,6 +55,66 @@ class EntryRepository:
         await self.session.flush()
         return entry
 
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[Entry]:
+        """Create several entries with a single flush."""
+        entries = [Entry(**data) for data in rows]
+        self.session.add_all(entries)
+        await self.session.flush()
+        return entries
+
+    async def get_many(
+        self, entry_ids: list[UUID], author_id: UUID | None = None
+    ) -> list[Entry]:
+        """Get live (not soft-deleted) entries by ID in one query.
+
+        Args:
+            entry_ids: IDs to load; unknown IDs are skipped
+            author_id: If provided, only return entries of this author
+        """
+        conditions = [Entry.id.in_(entry_ids), Entry.is_deleted == False]  # noqa: E712
+        if author_id is not None:
+            conditions.append(Entry.author_id == author_id)
+        result = await self.session.execute(select(Entry).where(*conditions))
+        return list(result.scalars().all())
+
+    async def lock_many(
+        self, entry_ids: list[UUID], author_id: UUID | None = None
+    ) -> dict[UUID, Entry]:
+        """Row-lock entries for a batch of writes in one query.
+
+        Rows are locked in ID order so concurrent batches cannot deadlock.
+
+        Args:
+            entry_ids: IDs to lock
+            author_id: If provided, only lock entries of this author
+        """
+        conditions = [Entry.id.in_(entry_ids)]
+        if author_id is not None:
+            conditions.append(Entry.author_id == author_id)
+        result = await self.session.execute(
+            select(Entry).where(*conditions).order_by(Entry.id).with_for_update()
+        )
+        return {entry.id: entry for entry in result.scalars().all()}
+
+    async def lock(self, entry_id: UUID, author_id: UUID | None = None) -> Entry:
+        """Get an entry with a row lock for the rest of the transaction.
+
+        Raises:
+            NotFoundError: Entry doesn't exist or doesn't belong to author
+        """
+        conditions = [Entry.id == entry_id]
+        if author_id is not None:
+            conditions.append(Entry.author_id == author_id)
+
+        result = await self.session.execute(
+            select(Entry).where(*conditions).with_for_update()
+        )
+        entry = result.scalar_one_or_none()
+
+        if not entry:
+            raise NotFoundError("entry", entry_id)
+        return entry
+
     async def update_entry(
         self,
         entry_id: UUID,
@@ -77,34 +137,8 @@ class EntryRepository:
             NotFoundError: Entry doesn't exist or doesn't belong to author
             ConflictError: Version mismatch (concurrent modification)
         """
-        # Get entry with row lock
-        conditions = [Entry.id == entry_id]
-        if author_id is not None:
-            conditions.append(Entry.author_id == author_id)
-
-        stmt = select(Entry).where(*conditions).with_for_update()
-        result = await self.session.execute(stmt)
-        entry = result.scalar_one_or_none()
-
-        if not entry:
-            raise NotFoundError("entry", entry_id)
-
-        # Check version for optimistic locking
-        if entry.version != expected_version:
-            raise ConflictError(
-                "Entry was modified by another user",
-                expected=expected_version,
-                actual=entry.version,
-            )
-
-        # Apply updates
-        for key, value in data.items():
-            if key != "version":  # Don't allow manual version setting
-                setattr(entry, key, value)
-
-        # Increment version
-        entry.version += 1
-
+        entry = await self.lock(entry_id, author_id)
+        self.apply_update(entry, data, expected_version)
         await self.session.flush()
         return entry
 
@@ -122,19 +156,14 @@ class EntryRepository:
             author_id: If provided, verify entry belongs to this author
         """
         # Lock the row to avoid races
-        conditions = [Entry.id == entry_id]
-        if author_id is not None:
-            conditions.append(Entry.author_id == author_id)
-
-        result = await self.session.execute(
-            select(Entry).where(*conditions).with_for_update()
-        )
-        entry = result.scalar_one_or_none()
-
-        if not entry or entry.is_deleted:
-            # Either missing or already deleted -> behave as not found
-            raise NotFoundError("entry", entry_id)
+        entry = await self.lock(entry_id, author_id)
+        self.apply_soft_delete(entry, expected_version)
+        await self.session.flush()
+        return entry
 
+    @staticmethod
+    def check_version(entry: Entry, expected_version: int) -> None:
+        """Raise ConflictError unless the entry is at ``expected_version``."""
         if entry.version != expected_version:
             raise ConflictError(
                 "Entry was modified by another user",
@@ -142,7 +171,36 @@ class EntryRepository:
                 actual=entry.version,
             )
 
+    def apply_update(
+        self, entry: Entry, data: dict[str, Any], expected_version: int
+    ) -> None:
+        """Apply an update to an already locked entry (no flush).
+
+        Raises:
+            ConflictError: Version mismatch (concurrent modification)
+        """
+        # Check version for optimistic locking
+        self.check_version(entry, expected_version)
+
+        # Apply updates
+        for key, value in data.items():
+            if key != "version":  # Don't allow manual version setting
+                setattr(entry, key, value)
+
+        # Increment version
+        entry.version += 1
+
+    def apply_soft_delete(self, entry: Entry, expected_version: int) -> None:
+        """Soft delete an already locked entry (no flush).
+
+        Raises:
+            NotFoundError: Entry is already deleted
+            ConflictError: Version mismatch (concurrent modification)
+        """
+        if entry.is_deleted:
+            # Already deleted -> behave as not found
+            raise NotFoundError("entry", entry.id)
+
+        self.check_version(entry, expected_version)
         entry.is_deleted = True
         entry.version += 1
-        await self.session.flush()
-        return entry
@@ -0,0 +1,343 @@
+"""Entry revision history stored as compressed reverse deltas.
+
+Every write of an entry records a revision of its title and text (markdown,
+or HTML for legacy entries). The newest revision is a zlib-compressed
+snapshot. When a newer one arrives, the old head is usually rewritten as a
+reverse delta: the text edits that turn the newer text back into it. It stays
+a snapshot instead when that would put more than ``revision_snapshot_every``
+deltas below a snapshot, or make them larger than the snapshot itself. So:
+
+- reading any version touches at most ``revision_snapshot_every + 1`` rows;
+- appending touches only the current head;
+- storage per snapshot is at most about twice the compressed document.
+
+``thin_revisions`` drops old autosaves down to one per hour and then one per
+day, re-encoding the deltas that pointed at dropped versions.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from difflib import SequenceMatcher
+import json
+from typing import Any
+from uuid import UUID
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.outbox import SessionFactory
+from app.infra.sa_models import Entry, EntryRevision
+from app.infra.text_patch import TextEdit, apply_edits
+from app.settings import settings
+
+
+# Above this many line pairs the changed region is replaced wholesale rather
+# than diffed, which keeps SequenceMatcher's worst case off the write path
+MAX_DIFF_CELLS = 4_000_000
+
+
+@dataclass(frozen=True)
+class RevisionSource:
+    """State of an entry at one version, captured right after a write."""
+
+    entry_id: UUID
+    version: int
+    title: str
+    content_format: str
+    text: str
+
+    @classmethod
+    def of(cls, entry: Entry) -> RevisionSource:
+        if entry.markdown_content is not None:
+            fmt, text = "markdown", entry.markdown_content
+        else:
+            fmt, text = "html", entry.content or ""
+        return cls(entry.id, entry.version, entry.title, fmt, text)
+
+
+def _trimmed(src: str, dst: str, at: int) -> TextEdit:
+    """Replacement of ``src`` (at offset ``at``) by ``dst``, minus shared ends."""
+    pre = 0
+    limit = min(len(src), len(dst))
+    while pre < limit and src[pre] == dst[pre]:
+        pre += 1
+    suf = 0
+    while suf < limit - pre and src[-1 - suf] == dst[-1 - suf]:
+        suf += 1
+    return TextEdit(at + pre, len(src) - pre - suf, dst[pre : len(dst) - suf])
+
+
+def diff(src: str, dst: str) -> list[TextEdit]:
+    """Sorted, non-overlapping edits that turn ``src`` into ``dst``.
+
+    Lines are matched first; each changed run of lines is then narrowed to
+    the characters that differ, so an edit inside a long paragraph stays
+    small.
+    """
+    a = src.splitlines(keepends=True)
+    b = dst.splitlines(keepends=True)
+    # Autosaves change a small region: skip the shared head and tail cheaply
+    pre = 0
+    limit = min(len(a), len(b))
+    while pre < limit and a[pre] == b[pre]:
+        pre += 1
+    suf = 0
+    while suf < limit - pre and a[-1 - suf] == b[-1 - suf]:
+        suf += 1
+    a_mid, b_mid = a[pre : len(a) - suf], b[pre : len(b) - suf]
+
+    offsets = [0]
+    for line in a:
+        offsets.append(offsets[-1] + len(line))
+
+    if len(a_mid) * len(b_mid) > MAX_DIFF_CELLS:
+        opcodes = [("replace", 0, len(a_mid), 0, len(b_mid))]
+    else:
+        opcodes = SequenceMatcher(None, a_mid, b_mid).get_opcodes()
+    edits: list[TextEdit] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        start, end = offsets[pre + i1], offsets[pre + i2]
+        edit = _trimmed(src[start:end], "".join(b_mid[j1:j2]), start)
+        if edit.delete or edit.insert:
+            edits.append(edit)
+    return edits
+
+
+def _pack_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"))
+
+
+def _unpack_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def _pack_edits(edits: Sequence[TextEdit]) -> bytes:
+    raw = json.dumps([[e.at, e.delete, e.insert] for e in edits], separators=(",", ":"))
+    return zlib.compress(raw.encode("utf-8"))
+
+
+def _unpack_edits(data: bytes) -> list[TextEdit]:
+    return [TextEdit(*item) for item in json.loads(zlib.decompress(data))]
+
+
+def _extends_chain(head: EntryRevision, delta: bytes, snapshot: bytes) -> bool:
+    """Whether one more delta may hang below ``head``'s snapshot."""
+    if head.chain >= settings.revision_snapshot_every:
+        return False
+    return head.chain_bytes + len(delta) <= len(snapshot)
+
+
+async def record_revisions(
+    s: AsyncSession, sources: Sequence[RevisionSource], autosave: bool = False
+) -> list[EntryRevision]:
+    """Add revisions for the given entry states (no flush).
+
+    The current heads of all touched entries are read with one query; several
+    states of one entry (e.g. repeated writes in a batch) chain in memory.
+    """
+    ordered = sorted(sources, key=lambda src: (str(src.entry_id), src.version))
+    existing = {src.entry_id for src in ordered if src.version > 1}
+    heads: dict[UUID, EntryRevision] = {}
+    if existing:
+        rows = await s.scalars(
+            select(EntryRevision)
+            .where(EntryRevision.entry_id.in_(existing))
+            .order_by(EntryRevision.entry_id, EntryRevision.version.desc())
+            .distinct(EntryRevision.entry_id)
+        )
+        heads = {row.entry_id: row for row in rows}
+    texts: dict[UUID, str] = {}
+
+    revisions: list[EntryRevision] = []
+    for src in ordered:
+        snapshot = _pack_text(src.text)
+        revision = EntryRevision(
+            entry_id=src.entry_id,
+            version=src.version,
+            title=src.title,
+            content_format=src.content_format,
+            text_length=len(src.text),
+            is_snapshot=True,
+            chain=0,
+            chain_bytes=0,
+            data=snapshot,
+            autosave=autosave,
+        )
+        head = heads.get(src.entry_id)
+        if head is not None and head.version < src.version:
+            head_text = texts.get(src.entry_id)
+            if head_text is None:
+                head_text = _unpack_text(head.data)
+            delta = _pack_edits(diff(src.text, head_text))
+            if _extends_chain(head, delta, snapshot):
+                revision.chain = head.chain + 1
+                revision.chain_bytes = head.chain_bytes + len(delta)
+                head.is_snapshot, head.data = False, delta
+                head.chain = head.chain_bytes = 0
+        heads[src.entry_id] = revision
+        texts[src.entry_id] = src.text
+        revisions.append(revision)
+    s.add_all(revisions)
+    return revisions
+
+
+async def list_revisions(
+    s: AsyncSession, entry_id: UUID, before: int | None = None, limit: int = 50
+) -> list[dict[str, Any]]:
+    """Revision metadata, newest first, without reading any revision data."""
+    query = (
+        select(
+            EntryRevision.version,
+            EntryRevision.title,
+            EntryRevision.content_format,
+            EntryRevision.text_length,
+            EntryRevision.autosave,
+            EntryRevision.created_at,
+        )
+        .where(EntryRevision.entry_id == entry_id)
+        .order_by(EntryRevision.version.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        query = query.where(EntryRevision.version < before)
+    return [dict(row) for row in (await s.execute(query)).mappings()]
+
+
+async def get_revision(
+    s: AsyncSession, entry_id: UUID, version: int
+) -> tuple[EntryRevision, str] | None:
+    """A revision and its reconstructed text, or None if it is not kept.
+
+    Reads the revision and the deltas up to the nearest newer snapshot: at
+    most ``revision_snapshot_every + 1`` rows.
+    """
+    rows = (
+        await s.scalars(
+            select(EntryRevision)
+            .where(EntryRevision.entry_id == entry_id, EntryRevision.version >= version)
+            .order_by(EntryRevision.version)
+            .limit(settings.revision_snapshot_every + 1)
+        )
+    ).all()
+    if not rows or rows[0].version != version:
+        return None
+    base = next(i for i, row in enumerate(rows) if row.is_snapshot)
+    text = _unpack_text(rows[base].data)
+    for row in reversed(rows[:base]):
+        text = apply_edits(text, _unpack_edits(row.data))
+    return rows[0], text
+
+
+def _thinned(rows: Sequence[tuple[int, datetime, bool]], now: datetime) -> set[int]:
+    """Versions to drop from ``(version, created_at, autosave)``, newest first.
+
+    Autosaves older than ``revision_keep_all_hours`` are dropped when a newer
+    revision shares their hour (within ``revision_hourly_days``) or their day.
+    The newest revision and explicit saves are always kept.
+    """
+    keep_all_since = now - timedelta(hours=settings.revision_keep_all_hours)
+    hourly_since = now - timedelta(days=settings.revision_hourly_days)
+    buckets: set[datetime | date] = set()
+    drop: set[int] = set()
+    for i, (version, created_at, autosave) in enumerate(rows):
+        bucket = (
+            created_at.replace(minute=0, second=0, microsecond=0)
+            if created_at >= hourly_since
+            else created_at.date()
+        )
+        if i and autosave and created_at < keep_all_since and bucket in buckets:
+            drop.add(version)
+        buckets.add(bucket)
+    return drop
+
+
+async def thin_revisions(
+    s: AsyncSession, entry_id: UUID, now: datetime | None = None
+) -> int:
+    """Drop thinned-out autosaves of one entry (no commit).
+
+    Surviving revisions are re-encoded against their new neighbours in one
+    newest-to-oldest pass holding two texts at a time.
+
+    Returns:
+        Number of revisions removed
+    """
+    now = now or datetime.now(UTC)
+    meta = (
+        await s.execute(
+            select(
+                EntryRevision.version, EntryRevision.created_at, EntryRevision.autosave
+            )
+            .where(EntryRevision.entry_id == entry_id)
+            .order_by(EntryRevision.version.desc())
+        )
+    ).all()
+    if not _thinned([tuple(row) for row in meta], now):
+        return 0
+
+    # Serialize with writers appending to this entry's history
+    await s.execute(select(Entry.id).where(Entry.id == entry_id).with_for_update())
+    rows = (
+        await s.scalars(
+            select(EntryRevision)
+            .where(EntryRevision.entry_id == entry_id)
+            .order_by(EntryRevision.version.desc())
+        )
+    ).all()
+    drop = _thinned([(r.version, r.created_at, r.autosave) for r in rows], now)
+
+    text = ""
+    above: str | None = None  # text of the nearest newer kept revision
+    segment: EntryRevision  # snapshot the current run of deltas leads down from
+    for row in rows:
+        if row.is_snapshot:
+            text = _unpack_text(row.data)
+        else:
+            text = apply_edits(text, _unpack_edits(row.data))
+        if row.version in drop:
+            await s.delete(row)
+            continue
+        if above is None:
+            row.chain = row.chain_bytes = 0
+            segment = row
+        else:
+            snapshot = _pack_text(text)
+            delta = _pack_edits(diff(above, text))
+            if _extends_chain(segment, delta, snapshot):
+                segment.chain += 1
+                segment.chain_bytes += len(delta)
+                row.is_snapshot, row.data = False, delta
+            else:
+                row.is_snapshot, row.data = True, snapshot
+                row.chain = row.chain_bytes = 0
+                segment = row
+        above = text
+    return len(drop)
+
+
+async def thin_all_revisions(
+    session_factory: SessionFactory, now: datetime | None = None
+) -> int:
+    """Thin the history of every entry with old autosaves, one commit each."""
+    now = now or datetime.now(UTC)
+    since = now - timedelta(hours=settings.revision_keep_all_hours)
+    async with session_factory() as s:
+        entry_ids = (
+            await s.scalars(
+                select(EntryRevision.entry_id)
+                .where(EntryRevision.autosave, EntryRevision.created_at < since)
+                .distinct()
+            )
+        ).all()
+    removed = 0
+    for entry_id in entry_ids:
+        async with session_factory() as s:
+            removed += await thin_revisions(s, entry_id, now)
+            await s.commit()
+    return removed
@@ -6,12 +6,25 @@ with Mapped[...] typing for full mypy compatibility.
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    FetchedValue,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infra.base import Base
@@ -179,6 +192,8 @@ class Entry(Base):
     title: Mapped[str] = mapped_column(String, nullable=False)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     markdown_content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Plain-text preview computed on write; served by summary listings
+    excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
     word_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     char_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     content_version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
@@ -192,11 +207,92 @@ class Entry(Base):
         Boolean, default=False, nullable=False, index=True
     )
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    # Stamped by the entries_track_change trigger on every write; ordered
+    # together they drive the delta sync feed
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
 
     # Relationships
     author: Mapped[User] = relationship(back_populates="entries")
 
 
+class EntryRevision(Base):
+    """Past version of an entry's title and text (see app.infra.revisions).
+
+    The newest revision of an entry is always a compressed snapshot; older
+    ones are snapshots or compressed reverse deltas against the next newer
+    revision.
+    """
+
+    __tablename__ = "entry_revisions"
+
+    entry_id: Mapped[UUID] = mapped_column(
+        ForeignKey("entries.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    # "markdown" or "html": which entry field the text was taken from
+    content_format: Mapped[str] = mapped_column(String(16), nullable=False)
+    text_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    is_snapshot: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # On snapshots: count and size of the deltas that lead down from it
+    chain: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    chain_bytes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    autosave: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
+    )
+
+
+class UserEntryStatsDaily(Base):
+    """Per-author counts of live entries by UTC day (see app.infra.entry_stats).
+
+    Maintained by the ``entries_stats_rollup`` triggers on ``entries``.
+    """
+
+    __tablename__ = "user_entry_stats_daily"
+
+    author_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Live entries created on ``day``, and live entries last updated on it
+    created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class UserEntryStatsTotal(Base):
+    """Per-author count of live entries (see app.infra.entry_stats).
+
+    Maintained by the ``entries_stats_rollup`` triggers on ``entries``.
+    """
+
+    __tablename__ = "user_entry_stats_total"
+
+    author_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    entries: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class UserEntryActivity(Base):
+    """Per-author activity by UTC day as dense arrays (see app.infra.entry_stats).
+
+    Element ``i`` of each array is day ``ACTIVITY_EPOCH + i``; arrays start at
+    the author's first active day and NULL marks days never written. Kept by
+    the statement-level ``entries_activity_rollup_*`` triggers on ``entries``.
+    """
+
+    __tablename__ = "user_entry_activity"
+
+    author_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    # Live entries created per day, and their words and characters
+    entries: Mapped[list[int | None]] = mapped_column(ARRAY(Integer), nullable=False)
+    words: Mapped[list[int | None]] = mapped_column(ARRAY(Integer), nullable=False)
+    chars: Mapped[list[int | None]] = mapped_column(ARRAY(Integer), nullable=False)
+
+
 class Event(Base):
     """Event model for event sourcing with SQLAlchemy 2.0 typing."""
 
@@ -215,6 +311,12 @@ class Event(Base):
         default=datetime.utcnow, index=True, nullable=False
     )
     published_at: Mapped[datetime | None] = mapped_column(index=True, nullable=True)
+    # Monotonic insert order; the partitioned relay publishes each aggregate by seq
+    seq: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("nextval('events_seq_seq')"),
+        nullable=False,
+    )
 
     # Outbox retry fields
     attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -13,6 +13,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Local imports
+from app.infra.conversion import with_entry_html
 from app.infra.embeddings import get_embedding
 
 
@@ -58,7 +59,7 @@ async def hybrid_search(
     )
     res = await s.execute(sql, {"q": q, "k": k, "alpha": alpha, "qvec": q_vec})
     rows = res.mappings().all()
-    return [dict(r) for r in rows]
+    return await with_entry_html([dict(r) for r in rows])
 
 
 async def semantic_search(s: AsyncSession, q: str, k: int = 10) -> list[dict[str, Any]]:
@@ -87,7 +88,7 @@ async def semantic_search(s: AsyncSession, q: str, k: int = 10) -> list[dict[str
         """
     )
     res = await s.execute(sql, {"k": k, "qvec": q_vec})
-    return [dict(r) for r in res.mappings().all()]
+    return await with_entry_html([dict(r) for r in res.mappings().all()])
 
 
 async def keyword_search(s: AsyncSession, q: str, k: int = 10) -> list[dict[str, Any]]:
@@ -107,7 +108,7 @@ async def keyword_search(s: AsyncSession, q: str, k: int = 10) -> list[dict[str,
         """
     )
     res = await s.execute(sql, {"q": q, "k": k})
-    return [dict(r) for r in res.mappings().all()]
+    return await with_entry_html([dict(r) for r in res.mappings().all()])
 
 
 async def upsert_entry_embedding(
@@ -0,0 +1,40 @@
+"""Direct-to-bytes JSON responses for hot read endpoints.
+
+Handlers that return plain dicts still pay for FastAPI validating the whole
+payload against the return annotation before encoding it. List endpoints
+instead build dicts of plain values (str, int, UUID, datetime, ...) and
+return ``json_response``: one pass through pydantic-core with an adapter
+built once at import, and the same bytes FastAPI would have produced.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+_JSON: TypeAdapter[Any] = TypeAdapter(Any)
+
+
+def json_bytes(content: Any) -> bytes:
+    """Compact JSON encoding of ``content`` (UUIDs and datetimes as strings)."""
+    return _JSON.dump_json(content)
+
+
+def json_response(content: Any, response: Response | None = None) -> Response:
+    """JSON response for ``content``.
+
+    Returning a response bypasses the one FastAPI injects into the handler,
+    so headers already set on ``response`` (ETag, cursors) are carried over.
+    """
+    return encoded_json_response(json_bytes(content), response)
+
+
+def encoded_json_response(body: bytes, response: Response | None = None) -> Response:
+    """Like ``json_response`` for a body that is already encoded (cached)."""
+    out = Response(body, media_type="application/json")
+    if response is not None:
+        out.headers.raw.extend(response.headers.raw)
+    return out
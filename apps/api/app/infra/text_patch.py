@@ -0,0 +1,100 @@
+"""Positional text edits for partial entry updates.
+
+An edit replaces ``delete`` characters at offset ``at`` with ``insert``.
+Offsets are Unicode code points into the text of the version the patch was
+made against, and edits are sorted and non-overlapping, so a whole patch is
+applied in one pass over the document.
+
+Word counts are updated from the words around each edit instead of rescanning
+the document; ``count_words_chars`` stays the definition they agree with.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import re
+
+from app.infra.metrics import count_words_chars
+
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class PatchError(ValueError):
+    """A patch does not apply to the text it was made against."""
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    at: int
+    delete: int = 0
+    insert: str = ""
+
+
+def validate_edits(text: str, edits: Sequence[TextEdit]) -> None:
+    """Check that ``edits`` are in range, sorted and non-overlapping.
+
+    Raises:
+        PatchError: Naming the first offending edit
+    """
+    prev_end = 0
+    for i, edit in enumerate(edits):
+        end = edit.at + edit.delete
+        if edit.at < 0 or edit.delete < 0 or end > len(text):
+            raise PatchError(
+                f"edit {i} spans {edit.at}..{end}, text has {len(text)} characters"
+            )
+        if edit.at < prev_end:
+            raise PatchError(f"edit {i} overlaps or precedes the previous edit")
+        prev_end = end
+
+
+def apply_edits(text: str, edits: Sequence[TextEdit]) -> str:
+    """Apply validated edits to ``text`` in a single pass."""
+    parts: list[str] = []
+    pos = 0
+    for edit in edits:
+        parts += (text[pos : edit.at], edit.insert)
+        pos = edit.at + edit.delete
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _is_word(text: str, i: int) -> bool:
+    return 0 <= i < len(text) and _WORD_CHAR.match(text, i) is not None
+
+
+def word_count_delta(text: str, edits: Sequence[TextEdit]) -> int:
+    """Change in ``count_words_chars`` words when ``edits`` are applied.
+
+    Each edit is widened to the word boundaries around it, windows that touch
+    are merged, and only the windows are counted before and after.
+    """
+    windows: list[tuple[int, int, list[TextEdit]]] = []
+    for edit in edits:
+        start, end = edit.at, edit.at + edit.delete
+        while _is_word(text, start - 1):
+            start -= 1
+        while _is_word(text, end):
+            end += 1
+        if windows and start <= windows[-1][1]:
+            prev_start, prev_end, grouped = windows[-1]
+            windows[-1] = (prev_start, max(prev_end, end), [*grouped, edit])
+        else:
+            windows.append((start, end, [edit]))
+
+    delta = 0
+    for start, end, grouped in windows:
+        local = [TextEdit(e.at - start, e.delete, e.insert) for e in grouped]
+        before = text[start:end]
+        delta += (
+            count_words_chars(apply_edits(before, local))[0]
+            - count_words_chars(before)[0]
+        )
+    return delta
+
+
+def char_count_delta(edits: Sequence[TextEdit]) -> int:
+    """Change in length when ``edits`` are applied."""
+    return sum(len(edit.insert) - edit.delete for edit in edits)
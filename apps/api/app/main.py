@@ -31,10 +31,21 @@ from app.api.v1 import (
     webauthn as webauthn_api,
 )
 from app.graphql.schema import schema
-from app.infra.db import build_engine, sessionmaker_for
+from app.infra.db import (
+    build_engine,
+    get_sessionmaker,
+    read_replicas,
+    record_pool_metrics,
+    warm_pool,
+)
 from app.infra.ip_extraction import configure_trusted_proxies
-from app.infra.outbox import relay_outbox
+from app.infra.nats_bus import nats_manager
+from app.infra.outbox import relay_outbox, relay_outbox_partitioned
+from app.infra.partitions import partition_maintenance_loop
 from app.infra.secrets.auth_bootstrap import ensure_authenticated
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
 from app.services.monitoring_scheduler import (
     start_monitoring_scheduler,
     stop_monitoring_scheduler,
@@ -70,8 +81,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Pin clients that just wrote to the primary while replicas catch up
+app.add_middleware(ReadYourWritesMiddleware)
+
+# SQL statement counts and DB time per route, with N+1 warnings
+app.add_middleware(QueryStatsMiddleware)
+
+# Outermost: shed load before any other work, then bound the rest by deadline
+app.add_middleware(LoadSheddingMiddleware)
+
 # Enhanced JWT middleware for EdDSA token validation
 # Note: EnhancedJWTMiddleware is used via require_scopes dependency, not as middleware
 
@@ -101,6 +122,9 @@ app.include_router(security_api.router, prefix="/internal")
 @app.get("/metrics")
 async def metrics() -> PlainTextResponse:
     # Minimal Prometheus exposition format
+    record_pool_metrics()
+    for replica in read_replicas():
+        record_pool_metrics(replica.engine, {"pool": replica.name})
     return PlainTextResponse(render_prom(), media_type="text/plain; version=0.0.4")
 
 
@@ -126,10 +150,35 @@ async def _startup() -> None:
     # Background outbox relay publisher (skip in tests or when disabled via env)
     disable_startup = os.getenv("JOURNAL_DISABLE_STARTUP") == "1"
     if not settings.testing and not disable_startup:
-        session_maker = sessionmaker_for(build_engine())
-        task = asyncio.create_task(relay_outbox(session_maker))
+        # Shared NATS connection; reconnects on its own and is reused by publishers
+        try:
+            await nats_manager.connect()
+        except Exception:
+            logger.exception("NATS connect failed at startup; will retry on first use")
+
+        # Open pooled connections now rather than on the first requests
+        try:
+            opened = await warm_pool(build_engine(), settings.db_pool_warmup)
+            logger.info("Warmed DB pool with %d connections", opened)
+        except Exception:
+            logger.exception("DB pool warm-up failed")
+
+        session_maker = get_sessionmaker()
+        # OUTBOX_PARTITIONS > 0 shares the outbox with other relay processes
+        partitions = int(os.getenv("OUTBOX_PARTITIONS", "0"))
+        if partitions > 0:
+            task = asyncio.create_task(
+                relay_outbox_partitioned(session_maker, partitions)
+            )
+        else:
+            task = asyncio.create_task(relay_outbox(session_maker))
         app.state.outbox_task = task
 
+        # Create upcoming event partitions and retire expired ones
+        app.state.partition_task = asyncio.create_task(
+            partition_maintenance_loop(session_maker)
+        )
+
         # Start Infisical monitoring scheduler
         await start_monitoring_scheduler()
         logger.info("Infisical monitoring scheduler started")
@@ -146,3 +195,11 @@ async def _shutdown() -> None:
         app.state.outbox_task.cancel()
         with suppress(asyncio.CancelledError):
             await app.state.outbox_task
+
+    if hasattr(app.state, "partition_task"):
+        app.state.partition_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.partition_task
+
+    # Close the shared NATS connection after publishers have stopped
+    await nats_manager.close()
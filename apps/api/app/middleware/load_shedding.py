@@ -0,0 +1,123 @@
+"""Deadline and load-shedding middleware.
+
+Under overload, queueing every request means every request times out.
+This middleware instead turns new work away with ``503`` and
+``Retry-After`` while too many requests are in flight or the event loop is
+lagging. Admitted requests run under a per-route deadline (see
+``app.infra.deadlines``) and answer ``504`` when they miss it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import exc
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infra.deadlines import deadline, deadline_for
+from app.settings import settings
+from app.telemetry.metrics_runtime import inc, set_gauge
+
+
+# Probes and scrapes must answer even (especially) when overloaded
+EXEMPT_PREFIXES = ("/health", "/metrics")
+# How often the event loop lag is sampled
+LAG_INTERVAL = 0.1
+# Postgres query_canceled: statement_timeout fired
+QUERY_CANCELED = "57014"
+
+
+def _statement_timed_out(err: exc.DBAPIError) -> bool:
+    orig = err.orig
+    return QUERY_CANCELED in {
+        getattr(orig, "sqlstate", None),
+        getattr(orig, "pgcode", None),
+    }
+
+
+class LoadSheddingMiddleware:
+    """Reject work early under overload; bound admitted work by a deadline."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.in_flight = 0
+        self.loop_lag = 0.0
+        self._lag_task: asyncio.Task[None] | None = None
+        self._lag_loop: asyncio.AbstractEventLoop | None = None
+
+    async def _watch_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.loop_lag = max(loop.time() - start - LAG_INTERVAL, 0.0)
+            set_gauge("event_loop_lag_seconds", self.loop_lag)
+
+    def _ensure_lag_watch(self) -> None:
+        loop = asyncio.get_running_loop()
+        if (
+            self._lag_loop is not loop
+            or self._lag_task is None
+            or self._lag_task.done()
+        ):
+            self._lag_loop = loop
+            self.loop_lag = 0.0
+            self._lag_task = loop.create_task(self._watch_loop_lag())
+
+    def _shed_reason(self) -> str | None:
+        if self.in_flight >= settings.shed_max_in_flight:
+            return "in_flight"
+        if self.loop_lag > settings.shed_max_loop_lag_seconds:
+            return "loop_lag"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        self._ensure_lag_watch()
+        reason = self._shed_reason()
+        if reason is not None:
+            inc("http_requests_shed_total", {"reason": reason})
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(settings.shed_retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = False
+        budget = deadline_for(scope["path"])
+        self.in_flight += 1
+        set_gauge("http_requests_in_flight", self.in_flight)
+        try:
+            with deadline(budget) as request_deadline:
+                async with asyncio.timeout(budget) as timeout:
+
+                    async def send_tracked(message: Message) -> None:
+                        nonlocal started
+                        if message["type"] == "http.response.start":
+                            started = True
+                        await send(message)
+                        if message["type"] == "http.response.body" and not message.get(
+                            "more_body", False
+                        ):
+                            # Background tasks run after this; nobody waits on them
+                            request_deadline.lift()
+                            timeout.reschedule(None)
+
+                    await self.app(scope, receive, send_tracked)
+        except (TimeoutError, exc.DBAPIError) as err:
+            # DeadlineExceeded is a TimeoutError too
+            timed_out = isinstance(err, TimeoutError) or _statement_timed_out(err)
+            if started or not timed_out:
+                raise
+            inc("http_deadline_exceeded_total")
+            response = JSONResponse({"detail": "Request deadline exceeded"}, 504)
+            await response(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            set_gauge("http_requests_in_flight", self.in_flight)
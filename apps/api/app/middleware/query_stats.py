@@ -0,0 +1,26 @@
+"""Per-request SQL statistics middleware (see ``app.telemetry.sql_stats``)."""
+
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.telemetry.sql_stats import collect_queries, report_request
+
+
+class QueryStatsMiddleware:
+    """Count each request's SQL statements and report them by route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with collect_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # Route templates keep the label set bounded (no raw paths)
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                report_request(f"{scope['method']} {route}", stats)
@@ -0,0 +1,38 @@
+"""Read-your-writes middleware for replica routing.
+
+When a request commits to the primary, its client is pinned to the primary
+before the response starts, so the client's next reads cannot land on a
+replica that has not replayed the write yet. See ``app.infra.db``.
+"""
+
+from __future__ import annotations
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infra.db import client_key, pin_to_primary, read_replicas, track_commits
+
+
+class ReadYourWritesMiddleware:
+    """Pin clients that write to the primary (no-op without replicas)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not read_replicas():
+            await self.app(scope, receive, send)
+            return
+        client = client_key(Headers(scope=scope).get("authorization"))
+        if client is None:
+            await self.app(scope, receive, send)
+            return
+
+        with track_commits() as committed:
+
+            async def send_pinned(message: Message) -> None:
+                if message["type"] == "http.response.start" and committed:
+                    await pin_to_primary(client)
+                await send(message)
+
+            await self.app(scope, receive, send_pinned)
@@ -6,20 +6,29 @@ Markdown formatting and metadata.
 
 import asyncio
 import logging
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlmodel import select
 
+from app.infra.conversion import html_to_markdown
 from app.infra.db import get_async_engine
 from app.infra.models import Entry
 
 
+logger = logging.getLogger(__name__)
+
+
 async def backfill_markdown_content(
     session: AsyncSession | None = None, batch_size: int = 100, dry_run: bool = False
 ) -> int:
-    """Convert legacy HTML entries to Markdown in batches.
+    """Convert legacy HTML entries (content_version 1) to Markdown in batches.
 
-    Returns the number of updated rows.
+    Entries are walked in id order, one keyset page per batch, and each batch
+    commits on its own. An entry whose HTML converts to nothing is logged and
+    left as is rather than being selected again.
+
+    Returns the number of converted rows (that would be converted on a dry run).
     """
     if session is None:
         engine = get_async_engine()
@@ -29,28 +38,36 @@ async def backfill_markdown_content(
         async with sm() as sess:
             return await backfill_markdown_content(sess, batch_size, dry_run)
 
-    # SELECT entries that need conversion (content_version = 1 and no markdown_content)
-    query = (
-        select(Entry)
-        .where((Entry.content_version == 1) & (Entry.markdown_content.is_(None)))  # type: ignore[union-attr]
-        .limit(batch_size)
-    )
-
-    result = await session.execute(query)
-    entries = result.scalars().all()
-
-    if dry_run:
-        return len(entries)
-
     updated = 0
-    for entry in entries:
-        # Simple conversion: treat existing content as markdown and update version
-        entry.markdown_content = entry.content
-        entry.content_version = 2
-        session.add(entry)
-        updated += 1
-
-    await session.commit()
+    last_id: UUID | None = None
+    while True:
+        # SELECT entries that need conversion (content_version = 1 and no markdown_content)
+        query = (
+            select(Entry)
+            .where((Entry.content_version == 1) & (Entry.markdown_content.is_(None)))  # type: ignore[union-attr]
+            .order_by(Entry.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(Entry.id > last_id)
+        entries = (await session.execute(query)).scalars().all()
+        if not entries:
+            break
+        last_id = entries[-1].id
+
+        for entry in entries:
+            md = html_to_markdown(entry.content or "")
+            if not md.strip():
+                logger.warning("Empty conversion for entry %s", entry.id)
+                continue
+            updated += 1
+            if not dry_run:
+                entry.markdown_content = md
+                entry.content_version = 2
+                session.add(entry)
+
+        if not dry_run:
+            await session.commit()
     return updated
 
 
@@ -60,7 +77,7 @@ async def main() -> None:
 
     async with AsyncSession(engine) as session:
         count = await backfill_markdown_content(session, dry_run=True)
-        logging.getLogger(__name__).info("Would process %s entries", count)
+        logger.info("Would process %s entries", count)
 
         # For a real run, call without dry_run and report stats
 
@@ -0,0 +1,78 @@
+"""List and replay dead-lettered outbox events.
+
+Usage:
+    python -m app.scripts.dlq list --type entry.created --error timeout
+    python -m app.scripts.dlq replay --since 2026-10-01 --rate 200 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+import json
+import logging
+from uuid import UUID
+
+from app.infra.db import get_async_engine, sessionmaker_for
+from app.infra.dlq import (
+    DeadEventFilter,
+    list_dead_events,
+    replay_dead_events,
+    serialize_dead_event,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("list", "replay"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("--type", dest="event_type")
+        cmd.add_argument("--error", help="substring of the last error")
+        cmd.add_argument("--since", type=datetime.fromisoformat)
+        cmd.add_argument("--until", type=datetime.fromisoformat)
+        cmd.add_argument("--id", dest="ids", type=UUID, action="append")
+        cmd.add_argument("--limit", type=int)
+    replay = sub.choices["replay"]
+    replay.add_argument("--batch-size", type=int, default=500)
+    replay.add_argument("--rate", type=float, help="max events per second")
+    replay.add_argument("--dry-run", action="store_true")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parser().parse_args(argv)
+    flt = DeadEventFilter(
+        event_type=args.event_type,
+        error_contains=args.error,
+        since=args.since,
+        until=args.until,
+        ids=args.ids,
+    )
+    session_factory = sessionmaker_for(get_async_engine())
+
+    if args.command == "list":
+        async with session_factory() as s:
+            rows = await list_dead_events(s, flt, limit=args.limit or 100)
+        for ev in rows:
+            print(json.dumps(serialize_dead_event(ev)))  # noqa: T201 - CLI output
+        return
+
+    report = await replay_dead_events(
+        session_factory,
+        flt,
+        batch_size=args.batch_size,
+        max_per_second=args.rate,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(report.as_dict()))  # noqa: T201 - CLI output
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
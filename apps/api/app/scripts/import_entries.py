@@ -0,0 +1,55 @@
+"""Bulk import a journal archive (JSON Lines or a zip of Markdown files).
+
+Usage:
+    python -m app.scripts.import_entries --author <user-id> entries.jsonl
+    python -m app.scripts.import_entries --author <user-id> notes.zip --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from uuid import UUID
+
+from app.infra.db import get_async_engine, sessionmaker_for
+from app.infra.entry_import import import_entries
+
+
+logger = logging.getLogger(__name__)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--author", type=UUID, required=True, help="owning user id")
+    parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=["jsonl", "zip"],
+        help="defaults to the file extension",
+    )
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--workers", type=int)
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parser().parse_args(argv)
+    fmt = args.fmt or ("zip" if args.path.suffix.lower() == ".zip" else "jsonl")
+    report = await import_entries(
+        sessionmaker_for(get_async_engine()),
+        args.path,
+        fmt,
+        args.author,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print(json.dumps(report.as_dict()))  # noqa: T201 - CLI output
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+"""Recount the per-user daily entry counters behind /stats.
+
+Only needed after restoring data behind the triggers' back (or to repair
+drift); migration 009 fills the counters on upgrade.
+
+Usage:
+    python -m app.scripts.rebuild_entry_stats [--author UUID]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from uuid import UUID
+
+from app.infra.db import get_async_engine, sessionmaker_for
+from app.infra.entry_stats import rebuild_all_entry_stats, rebuild_entry_stats
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--author", type=UUID, help="Rebuild one author only")
+    args = parser.parse_args(argv)
+
+    session_factory = sessionmaker_for(get_async_engine())
+    if args.author is None:
+        rows = await rebuild_all_entry_stats(session_factory)
+    else:
+        async with session_factory() as session:
+            rows = await rebuild_entry_stats(session, args.author)
+            await session.commit()
+    print(f"wrote {rows} daily rows")  # noqa: T201 - CLI output
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""Store rendered HTML again for markdown entries that have none.
+
+Needed before downgrading past ``007_entries_markdown_canonical`` or when
+switching ``JOURNAL_ENTRY_HTML_STORAGE`` back to ``stored`` with a cold cache.
+
+Usage:
+    python -m app.scripts.store_entry_html --batch-size 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.conversion import render_markdown
+from app.infra.db import get_async_engine, sessionmaker_for
+from app.infra.sa_models import Entry
+
+
+logger = logging.getLogger(__name__)
+
+
+async def store_entry_html(session: AsyncSession, batch_size: int = 100) -> int:
+    """Render and store HTML for entries without it, one commit per batch.
+
+    Returns the number of entries updated.
+    """
+    stored = 0
+    last_id: UUID | None = None
+    while True:
+        query = (
+            select(Entry.id, Entry.markdown_content)
+            .where(Entry.content.is_(None))
+            .order_by(Entry.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(Entry.id > last_id)
+        rows = (await session.execute(query)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        for entry_id, markdown in rows:
+            await session.execute(
+                update(Entry)
+                .where(Entry.id == entry_id, Entry.content.is_(None))
+                .values(content=await render_markdown(markdown or ""))
+            )
+        await session.commit()
+        stored += len(rows)
+        logger.info("Stored HTML for %s entries", stored)
+    return stored
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    async with sessionmaker_for(get_async_engine())() as session:
+        count = await store_entry_html(session, args.batch_size)
+    print(f"stored HTML for {count} entries")  # noqa: T201 - CLI output
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,26 @@
+"""Thin out old autosave revisions of all entries.
+
+Meant to run periodically (e.g. daily from cron); see app.infra.revisions for
+the retention policy.
+
+Usage:
+    python -m app.scripts.thin_revisions
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.infra.db import get_async_engine, sessionmaker_for
+from app.infra.revisions import thin_all_revisions
+
+
+async def main() -> None:
+    removed = await thin_all_revisions(sessionmaker_for(get_async_engine()))
+    print(f"removed {removed} revisions")  # noqa: T201 - CLI output
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
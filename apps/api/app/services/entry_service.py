@@ -1,13 +1,33 @@
 from __future__ import annotations
 
 # Standard library imports
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+import json
+from typing import Any
 from uuid import UUID
 
 # Third-party imports
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    RowMapping,
+    Select,
+    Text,
+    and_,
+    cast,
+    extract,
+    func,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.conversion import markdown_to_html
+from app.infra.conversion import render_markdown, storable_html
+from app.infra.metrics import build_excerpt
 
 # Local imports
 from app.infra.sa_models import Entry, Event
@@ -26,13 +46,14 @@ async def create_entry(
     The event will be picked by the outbox relay and published via NATS.
     """
     if content_version >= 2 and markdown_content:
-        html = markdown_to_html(markdown_content)
+        html = await render_markdown(markdown_content)
         e = Entry(
             author_id=author_id,
             title=title,
-            content=html,
+            content=storable_html(html, markdown_content),
             markdown_content=markdown_content,
             content_version=content_version,
+            excerpt=build_excerpt(html),
             word_count=len(html.split()),
         )
     else:
@@ -40,6 +61,7 @@ async def create_entry(
             author_id=author_id,
             title=title,
             content=content,
+            excerpt=build_excerpt(content),
             word_count=len(content.split()),
         )
     s.add(e)
@@ -76,27 +98,262 @@ async def get_entry_by_id(
     return result.scalar_one_or_none()
 
 
-async def list_entries(
+async def get_entry_version(
+    s: AsyncSession, entry_id: UUID, author_id: UUID | None = None
+) -> int | None:
+    """Current version of a live entry without loading its content.
+
+    Args:
+        s: Database session
+        entry_id: Entry ID to look up
+        author_id: If provided, only match an entry of this author
+    """
+    conditions = [Entry.id == entry_id, Entry.is_deleted == False]  # noqa: E712
+    if author_id is not None:
+        conditions.append(Entry.author_id == author_id)
+    return (await s.execute(select(Entry.version).where(*conditions))).scalar()
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_token(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_token(token: str) -> Any:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, entry_id: UUID) -> str:
+    """Opaque cursor pointing just after the given entry in listing order."""
+    return _encode_token([created_at.isoformat(), str(entry_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        created_at, entry_id = _decode_token(cursor)
+        return datetime.fromisoformat(created_at), UUID(entry_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def encode_change_cursor(change_xid: int, change_seq: int) -> str:
+    """Opaque high-water mark of the changes feed."""
+    return _encode_token(["c", change_xid, change_seq])
+
+
+def decode_change_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a cursor produced by ``encode_change_cursor``.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        tag, change_xid, change_seq = _decode_token(cursor)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    if tag != "c" or not isinstance(change_xid, int) or not isinstance(change_seq, int):
+        raise InvalidCursorError("Invalid cursor")
+    return change_xid, change_seq
+
+
+def _xid(expr: Any) -> Any:
+    return func.cast(func.cast(expr, Text), BigInteger)
+
+
+# Transactions below the snapshot xmin have all finished, so no row can still
+# appear with a smaller (change_xid, change_seq) than one already served
+_SETTLED_XID = _xid(func.pg_snapshot_xmin(func.pg_current_snapshot()))
+# The reading transaction's own writes are visible to it as well (the feed
+# endpoint itself never writes, so this only matters inside one transaction)
+_OWN_XID = _xid(func.pg_current_xact_id_if_assigned())
+
+
+async def list_entry_changes(
     s: AsyncSession,
     author_id: UUID | None = None,
-    limit: int | None = None,
-    offset: int = 0,
+    after: tuple[int, int] | None = None,
+    limit: int = 100,
 ) -> list[Entry]:
-    """List entries, optionally filtered by author.
+    """Entries changed after ``after`` in change order, tombstones included.
+
+    Changes are stamped by a trigger with the writing transaction id and a
+    sequence number (``change_xid``, ``change_seq``). Only changes of
+    transactions older than every running one are returned, so a change
+    committed late is never skipped; a long-running transaction delays the
+    feed instead. Served by ``ix_entries_author_changes``.
 
     Args:
         s: Database session
         author_id: If provided, only return entries for this author
+        after: ``(change_xid, change_seq)`` of the last change already seen;
+            None starts a full sync of live entries
         limit: Maximum number of entries to return
-        offset: Number of entries to skip
     """
+    conditions = [or_(Entry.change_xid < _SETTLED_XID, Entry.change_xid == _OWN_XID)]
+    if author_id is not None:
+        conditions.append(Entry.author_id == author_id)
+    if after is None:
+        # Nothing to tombstone for a client that has nothing yet
+        conditions.append(Entry.is_deleted == False)  # noqa: E712
+    else:
+        conditions.append(tuple_(Entry.change_xid, Entry.change_seq) > tuple_(*after))
+    query = (
+        select(Entry)
+        .where(*conditions)
+        .order_by(Entry.change_xid, Entry.change_seq)
+        .limit(limit)
+    )
+    return list((await s.execute(query)).scalars().all())
+
+
+# Columns a summary listing may return; all but the (unbounded) title are
+# covered by ix_entries_author_created_summary
+SUMMARY_COLUMNS = (
+    "id",
+    "title",
+    "excerpt",
+    "created_at",
+    "updated_at",
+    "word_count",
+    "char_count",
+    "version",
+)
+
+
+def _listing_query(
+    columns: list[Any],
+    author_id: UUID | None,
+    limit: int | None,
+    offset: int,
+    after: tuple[datetime, UUID] | None,
+) -> Select[Any]:
     conditions = [Entry.is_deleted == False]  # noqa: E712
     if author_id is not None:
         conditions.append(Entry.author_id == author_id)
+    if after is not None:
+        created_at, entry_id = after
+        conditions.append(
+            or_(
+                Entry.created_at < created_at,
+                and_(Entry.created_at == created_at, Entry.id > entry_id),
+            )
+        )
 
-    query = select(Entry).where(*conditions).order_by(Entry.created_at.desc())
+    query = (
+        select(*columns).where(*conditions).order_by(Entry.created_at.desc(), Entry.id)
+    )
     if limit is not None:
         query = query.limit(limit)
-    if offset > 0:
+    if offset > 0 and after is None:
         query = query.offset(offset)
+    return query
+
+
+async def list_entries(
+    s: AsyncSession,
+    author_id: UUID | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    after: tuple[datetime, UUID] | None = None,
+) -> list[Entry]:
+    """List entries newest first, optionally filtered by author.
+
+    Pages by keyset when ``after`` is given, so the cost of a page does not
+    grow with its depth (served by ``ix_entries_author_created_summary``).
+
+    Args:
+        s: Database session
+        author_id: If provided, only return entries for this author
+        limit: Maximum number of entries to return
+        offset: Number of entries to skip (legacy; ignored with ``after``)
+        after: ``(created_at, id)`` of the last entry of the previous page
+    """
+    query = _listing_query([Entry], author_id, limit, offset, after)
     return list((await s.execute(query)).scalars().all())
+
+
+async def list_entry_summaries(
+    s: AsyncSession,
+    author_id: UUID | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    after: tuple[datetime, UUID] | None = None,
+    fields: Sequence[str] = SUMMARY_COLUMNS,
+) -> list[RowMapping]:
+    """List entries like ``list_entries`` but load only summary columns.
+
+    ``id``, ``created_at`` and ``version`` are always loaded so callers can
+    build cursors and ETags.
+
+    Args:
+        s: Database session
+        author_id: If provided, only return entries for this author
+        limit: Maximum number of entries to return
+        offset: Number of entries to skip (legacy; ignored with ``after``)
+        after: ``(created_at, id)`` of the last entry of the previous page
+        fields: Subset of ``SUMMARY_COLUMNS`` to load
+    """
+    names = dict.fromkeys(["id", "created_at", "version", *fields])
+    columns = [getattr(Entry, name) for name in names]
+    query = _listing_query(columns, author_id, limit, offset, after)
+    return list((await s.execute(query)).mappings().all())
+
+
+# UTC wall-clock time of an entry. The zone is inlined, not bound, so the
+# planner can match ``ix_entries_author_month_day``.
+_CREATED_UTC = func.timezone(literal_column("'UTC'"), Entry.created_at)
+
+ON_THIS_DAY_COLUMNS = ("id", "title", "excerpt", "created_at", "word_count")
+
+
+async def list_on_this_day(
+    s: AsyncSession,
+    day: date,
+    tz: str = "UTC",
+    author_id: UUID | None = None,
+    limit: int = 20,
+) -> list[RowMapping]:
+    """Summaries of entries written on ``day``'s month and day in earlier years.
+
+    Calendar days are taken in ``tz``. A local day overlaps at most three
+    UTC days, so their (month, day) pairs select candidates through
+    ``ix_entries_author_month_day``; the local date then filters exactly.
+
+    Args:
+        s: Database session
+        day: Today in ``tz``
+        tz: IANA time zone name
+        author_id: If provided, only return entries for this author
+        limit: Maximum number of entries to return
+    """
+    created_local = func.timezone(cast(tz, Text), Entry.created_at)
+    utc_days = [day + timedelta(days=shift) for shift in (-1, 0, 1)]
+    conditions = [
+        Entry.is_deleted == False,  # noqa: E712
+        tuple_(extract("month", _CREATED_UTC), extract("day", _CREATED_UTC)).in_([
+            (d.month, d.day) for d in utc_days
+        ]),
+        extract("month", created_local) == day.month,
+        extract("day", created_local) == day.day,
+        extract("year", created_local) < day.year,
+    ]
+    if author_id is not None:
+        conditions.append(Entry.author_id == author_id)
+
+    query = (
+        select(*(getattr(Entry, name) for name in ON_THIS_DAY_COLUMNS))
+        .where(*conditions)
+        .order_by(Entry.created_at.desc(), Entry.id)
+        .limit(limit)
+    )
+    return list((await s.execute(query)).mappings().all())
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,6 +16,31 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6380/0"
     nats_url: str = "nats://localhost:4222"
     otlp_endpoint: str = "http://localhost:4317"
+    # Database connection pool (see app.infra.db)
+    db_pool_size: int = 10  # Connections kept open
+    db_max_overflow: int = 10  # Extra connections opened under load, closed after
+    db_pool_timeout: float = 10.0  # Seconds to wait for a connection before failing
+    db_pool_recycle: int = 1800  # Replace connections older than this (seconds)
+    db_pool_warmup: int = 4  # Connections opened at startup (capped at pool size)
+    # Prepared statements cached per asyncpg connection; 0 behind PgBouncer
+    db_statement_cache_size: int = 100
+    # Read replicas for read-only endpoints; empty sends all reads to the primary
+    db_read_urls: list[str] = []
+    db_read_max_lag_seconds: float = 2.0  # Replicas further behind are skipped
+    db_read_lag_check_seconds: float = 1.0  # How long a lag reading is trusted
+    db_read_pin_seconds: float = 5.0  # Reads go to the primary this long after a write
+    # Per-request SQL instrumentation (see app.telemetry.sql_stats)
+    sql_warn_queries: int = 25  # Warn when one request runs more statements
+    sql_warn_repeats: int = 10  # Warn when one statement shape repeats this often
+    # Request deadlines and load shedding (see app.middleware.load_shedding)
+    request_deadline_seconds: float = 15.0  # Budget for requests not listed below
+    request_deadlines: dict[str, float] = {  # Per path prefix; longest match wins
+        "/api/v1/entries/import": 300.0,  # Streams uploads of up to import_max_bytes
+        "/api/v1/search": 10.0,
+    }
+    shed_max_in_flight: int = 256  # New requests beyond this get 503
+    shed_max_loop_lag_seconds: float = 0.5  # Or while the event loop lags this much
+    shed_retry_after_seconds: int = 2  # Retry-After sent with 503
 
     # Legacy JWT configuration (HMAC-based)
     jwt_secret: str = "change_me"  # noqa: S105 - dev default; override via env in production
@@ -33,7 +60,30 @@ class Settings(BaseSettings):
     jwt_dev_key_id: str = ""  # Key ID for development
 
     testing: bool = False
+
+    # Time-partitioned events/processed_events (see app.infra.partitions)
+    partition_months_ahead: int = 3  # Monthly partitions created ahead of time
+    partition_archive: bool = False  # Detach into `archive` schema instead of drop
+    events_retention_days: int = 90  # Fully published partitions kept this long
+    processed_events_retention_days: int = 30  # Also bounds idempotency lookups
     auto_embed_mode: str = "event"  # "event" | "inline" | "off"
+
+    # Markdown rendering (see app.infra.conversion)
+    render_cache_max_chars: int = 8_000_000  # Total HTML held by the LRU cache
+    render_offload_chars: int = 20_000  # Larger documents render in the pool
+    render_pool_workers: int = 2
+    render_max_pending: int = 16  # Offloaded renders in flight before callers wait
+    # "stored" keeps rendered HTML in entries.content; "rendered" stores only
+    # markdown for markdown entries and renders their HTML on read
+    entry_html_storage: Literal["stored", "rendered"] = "stored"
+    # Bulk entry import (see app.infra.entry_import)
+    import_workers: int = 4  # Processes parsing and rendering records
+    import_chunk_size: int = 1000  # Records per COPY + merge transaction
+    import_max_bytes: int = 512 * 1024 * 1024  # Largest accepted upload
+    # Entry revision history (see app.infra.revisions)
+    revision_snapshot_every: int = 16  # Most deltas read to rebuild a version
+    revision_keep_all_hours: int = 24  # Autosaves newer than this are all kept
+    revision_hourly_days: int = 7  # Then one per hour; older, one per day
     # Feature flags
     user_mgmt_enabled: bool = False
     auth_require_email_verify: bool = True
@@ -6,6 +6,15 @@ import threading
 _lock = threading.Lock()
 _counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
 _histograms: dict[str, list[float]] = {}
+_gauges: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+# Bucketed histograms: key -> (upper bounds, per-bucket counts, [sum, count])
+_bucketed: dict[
+    tuple[str, tuple[tuple[str, str], ...]],
+    tuple[tuple[float, ...], list[int], list[float]],
+] = {}
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
 
 
 class Counter:
@@ -54,6 +63,32 @@ def inc(name: str, labels: dict[str, str] | None = None, value: float = 1.0) ->
         _counters[k] = _counters.get(k, 0.0) + value
 
 
+def set_gauge(name: str, value: float, labels: dict[str, str] | None = None) -> None:
+    """Set the current value of a gauge."""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(
+    name: str,
+    value: float,
+    labels: dict[str, str] | None = None,
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> None:
+    """Record ``value`` in a fixed-bucket histogram (constant memory)."""
+    with _lock:
+        k = _key(name, labels)
+        if k not in _bucketed:
+            _bucketed[k] = (buckets, [0] * len(buckets), [0.0, 0.0])
+        bounds, counts, totals = _bucketed[k]
+        for i, bound in enumerate(bounds):
+            if value <= bound:
+                counts[i] += 1
+                break
+        totals[0] += value
+        totals[1] += 1
+
+
 def render_prom() -> str:
     lines: list[str] = []
     with _lock:
@@ -65,6 +100,13 @@ def render_prom() -> str:
             else:
                 lines.append(f"{name} {val}")
 
+        for (name, items), val in _gauges.items():
+            if items:
+                lbl = ",".join(f'{k}="{v}"' for k, v in items)
+                lines.append(f"{name}{{{lbl}}} {val}")
+            else:
+                lines.append(f"{name} {val}")
+
         # Render histograms (simplified - just show count and sum)
         for key, values in _histograms.items():
             if values:
@@ -73,4 +115,19 @@ def render_prom() -> str:
                 total = sum(values)
                 lines.extend([f"{name}_count {count}", f"{name}_sum {total}"])
 
+        for (name, items), (bounds, counts, totals) in _bucketed.items():
+            base = [f'{k}="{v}"' for k, v in items]
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                lbl = ",".join([*base, f'le="{bound}"'])
+                lines.append(f"{name}_bucket{{{lbl}}} {cumulative}")
+            lbl = ",".join([*base, 'le="+Inf"'])
+            lines.append(f"{name}_bucket{{{lbl}}} {int(totals[1])}")
+            suffix = f"{{{','.join(base)}}}" if base else ""
+            lines.extend([
+                f"{name}_sum{suffix} {totals[0]}",
+                f"{name}_count{suffix} {int(totals[1])}",
+            ])
+
     return "\n".join(lines) + "\n"
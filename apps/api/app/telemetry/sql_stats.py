@@ -0,0 +1,152 @@
+"""Per-request SQL statement counting and N+1 detection.
+
+Engine event hooks attribute every statement to the collectors active in
+the current context (``collect_queries``). ``QueryStatsMiddleware`` opens
+one per HTTP request, so dependencies such as JWT user lookups and audit
+writes are counted along with the handler's own queries; the totals feed
+per-route histograms and warnings. Tests use ``assert_max_queries``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import re
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.settings import settings
+from app.telemetry.metrics_runtime import observe
+
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Bound parameters (asyncpg, qmark, pyformat; optionally cast) and lists of them
+_PARAM = r"(?:\$\d+|\?|%\(\w+\)s)(?:::\w+)?"
+_PARAMS = re.compile(rf"{_PARAM}(?:\s*,\s*{_PARAM})*")
+
+
+def statement_shape(statement: str) -> str:
+    """``statement`` with whitespace and parameter lists normalized."""
+    return _PARAMS.sub("?", " ".join(statement.split()))
+
+
+@dataclass
+class QueryStats:
+    """Statements run within one ``collect_queries`` block."""
+
+    count: int = 0
+    seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest: str = ""
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def most_repeated(self) -> tuple[str, int]:
+        """The statement shape run most often, and how often."""
+        return self.shapes.most_common(1)[0] if self.shapes else ("", 0)
+
+
+_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "sql_stats_collectors", default=()
+)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Count statements run in this context (nested blocks all see them)."""
+    stats = QueryStats()
+    token = _collectors.set((*_collectors.get(), stats))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def assert_max_queries(count: int, repeats: int | None = None) -> Iterator[QueryStats]:
+    """Fail unless the block runs at most ``count`` statements.
+
+    With ``repeats``, also fail when any one statement shape runs more often
+    than that, which is how an N+1 loop shows up.
+    """
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > count:
+        shapes = "\n".join(f"{n} x {s}" for s, n in stats.shapes.most_common())
+        raise AssertionError(
+            f"{stats.count} statements ran, expected <= {count}:\n{shapes}"
+        )
+    shape, n = stats.most_repeated()
+    if repeats is not None and n > repeats:
+        raise AssertionError(f"Statement ran {n} times, expected <= {repeats}: {shape}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if context is not None and _collectors.get():
+        context._sql_stats_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    started = getattr(context, "_sql_stats_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    for stats in _collectors.get():
+        stats.record(statement, elapsed)
+
+
+def report_request(route: str, stats: QueryStats) -> None:
+    """Feed one request's totals to the per-route histograms and warnings."""
+    labels = {"route": route}
+    observe("db_request_queries", stats.count, labels, buckets=QUERY_COUNT_BUCKETS)
+    observe("db_request_seconds", stats.seconds, labels)
+    if stats.count > settings.sql_warn_queries:
+        logger.warning(
+            "%s ran %d SQL statements in %.1f ms; slowest (%.1f ms): %.200s",
+            route,
+            stats.count,
+            stats.seconds * 1000,
+            stats.slowest_seconds * 1000,
+            statement_shape(stats.slowest),
+        )
+    shape, repeats = stats.most_repeated()
+    if repeats >= settings.sql_warn_repeats:
+        logger.warning(
+            "%s ran one statement %d times (possible N+1): %.200s",
+            route,
+            repeats,
+            shape,
+        )
@@ -16,6 +16,7 @@ from sqlalchemy import select, text
 
 from app.infra.db import get_session
 from app.infra.embeddings import RateLimitedError
+from app.infra.nats_bus import nats_manager
 from app.infra.sa_models import Entry
 from app.infra.search_pgvector import upsert_entry_embedding
 from app.settings import settings
@@ -51,6 +52,8 @@ class EmbeddingConsumer:
                 if asyncio.iscoroutine(js):  # support mocked async jetstream in tests
                     js = await js
                 self.js = js
+                # Share this connection with the rest of the process (DLQ, outbox)
+                nats_manager.attach(self.nc)
                 logger.info("Connected to NATS")
                 break
             except Exception as e:  # noqa: BLE001 - keep retrying on any connection error
@@ -100,10 +103,17 @@ class EmbeddingConsumer:
             # Idempotency: skip if already processed
             if event_id:
                 async for session in get_session():
+                    # Bounded by retention so only recent partitions are probed
                     exists = (
                         await session.execute(
-                            text("SELECT 1 FROM processed_events WHERE event_id = :e"),
-                            {"e": event_id},
+                            text(
+                                "SELECT 1 FROM processed_events WHERE event_id = :e "
+                                "AND processed_at >= now() - make_interval(days => :d)"
+                            ),
+                            {
+                                "e": event_id,
+                                "d": settings.processed_events_retention_days,
+                            },
                         )
                     ).first()
                     if exists:
@@ -124,16 +134,28 @@ class EmbeddingConsumer:
             # Acknowledge the message
             if hasattr(msg, "ack"):
                 await msg.ack()
-            # Record processed outcome
+            # Record processed outcome. processed_at is part of the key, so
+            # a unique conflict can't dedupe; the lock serializes the check
+            # and insert for one event id instead
             if event_id:
                 async for session in get_session():
                     try:
+                        await session.execute(
+                            text("SELECT pg_advisory_xact_lock(hashtext(:e))"),
+                            {"e": event_id},
+                        )
                         await session.execute(
                             text(
-                                "INSERT INTO processed_events(event_id, outcome) VALUES (:e,"
-                                " :o) ON CONFLICT (event_id) DO NOTHING"
+                                "INSERT INTO processed_events(event_id, outcome) "
+                                "SELECT :e, :o WHERE NOT EXISTS ("
+                                "SELECT 1 FROM processed_events WHERE event_id = :e "
+                                "AND processed_at >= now() - make_interval(days => :d))"
                             ),
-                            {"e": event_id, "o": event_type},
+                            {
+                                "e": event_id,
+                                "o": event_type,
+                                "d": settings.processed_events_retention_days,
+                            },
                         )
                         await session.commit()
                     except Exception:  # noqa: BLE001 - best-effort insert for idempotency
@@ -197,7 +219,11 @@ class EmbeddingConsumer:
                 if not row:
                     logger.error("Entry not found for embedding: %s", entry_id)
                     return
-                text_source = (row.title or "") + " " + (row.content or "")
+                text_source = (
+                    (row.title or "")
+                    + " "
+                    + (row.content or row.markdown_content or "")
+                )
                 await upsert_entry_embedding(session, entry_id, text_source)
                 await session.commit()
                 logger.info("Updated embedding for entry %s", entry_id)
@@ -237,18 +263,18 @@ class EmbeddingConsumer:
             try:
                 # Get all entries that need reindexing
                 result = await session.execute(
-                    select(Entry.id, Entry.title, Entry.content).where(
-                        Entry.is_deleted.is_(False)
-                    )
+                    select(
+                        Entry.id, Entry.title, Entry.content, Entry.markdown_content
+                    ).where(Entry.is_deleted.is_(False))
                 )
                 rows = result.fetchall()
 
                 logger.info("Reindexing %s entries", len(rows))
 
                 # Process each entry
-                for i, (entry_id, title, content) in enumerate(rows, 1):
+                for i, (entry_id, title, content, markdown) in enumerate(rows, 1):
                     try:
-                        text_source = (title or "") + " " + (content or "")
+                        text_source = (title or "") + " " + (content or markdown or "")
                         await upsert_entry_embedding(session, entry_id, text_source)
                         if i % 100 == 0:
                             logger.info("Processed %s/%s entries", i, len(rows))
@@ -367,5 +393,10 @@ async def main() -> None:
         raise
 
 
-if __name__ == "__main__":
+def run() -> None:
+    """Console script entry point (``main`` is a coroutine function)."""
     asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
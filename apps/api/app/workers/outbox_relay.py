@@ -0,0 +1,44 @@
+"""Standalone outbox relay worker for the partitioned relay mode."""
+
+import asyncio
+import logging
+import os
+
+from app.infra.db import build_engine, sessionmaker_for
+from app.infra.outbox import relay_outbox_partitioned
+
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Main entry point for an outbox relay worker.
+
+    Run as many workers as needed; partitions are shared through advisory
+    locks, so each one is published by a single worker at a time.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    partitions = int(os.getenv("OUTBOX_PARTITIONS", "16"))
+    poll_seconds = float(os.getenv("OUTBOX_POLL_SECS", "1.0"))
+    batch_size = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+    logger.info("Starting outbox relay over %s partitions", partitions)
+
+    await relay_outbox_partitioned(
+        sessionmaker_for(build_engine()),
+        partitions,
+        poll_seconds=poll_seconds,
+        batch_size=batch_size,
+    )
+
+
+def run() -> None:
+    """Console script entry point (``main`` is a coroutine function)."""
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
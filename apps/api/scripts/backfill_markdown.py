@@ -3,12 +3,9 @@ from __future__ import annotations
 import asyncio
 import logging
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlmodel import select
-
-from app.infra.conversion import html_to_markdown
-from app.infra.db import get_async_engine
-from app.infra.models import Entry
+from app.scripts.backfill_markdown import (
+    backfill_markdown_content as _backfill_markdown_content,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -20,38 +17,8 @@ async def backfill_markdown_content(
     if dry_run:
         logger.info("DRY RUN MODE - No changes will be saved")
 
-    engine = get_async_engine()
-    async_session_local = async_sessionmaker(
-        bind=engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session_local() as s:
-        while True:
-            rows = (
-                (
-                    await s.execute(
-                        select(Entry)
-                        .where(Entry.markdown_content.is_(None))
-                        .limit(batch_size)  # type: ignore[union-attr]
-                    )
-                )
-                .scalars()
-                .all()
-            )
-            if not rows:
-                break
-            for e in rows:
-                try:
-                    md = html_to_markdown(e.content or "")
-                    if not md or not md.strip():
-                        logger.warning("Empty conversion for entry %s", e.id)
-                        continue
-                    e.markdown_content = md
-                    e.content_version = 2
-                except Exception:
-                    logger.exception("Failed to convert entry %s", e.id)
-                    continue
-            if not dry_run:
-                await s.commit()
+    count = await _backfill_markdown_content(batch_size=batch_size, dry_run=dry_run)
+    logger.info("Converted %s entries", count)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""Benchmark per-entry cost of serializing an entries listing.
+
+Compares the previous path (``EntryResponse`` model, ``model_dump``, then
+FastAPI validating the list against its ``list[dict]`` annotation and
+encoding it) with ``_entry_response`` dicts encoded by ``json_response``.
+Both produce the same bytes; the script checks that before timing.
+
+Usage:
+    python scripts/bench_entry_serialization.py --entries 20 100 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+import inspect
+import time
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.api.v1.entries import ContentBlock, EntryResponse, _entry_response
+from app.infra.serialization import json_response
+
+
+MARKDOWN = (
+    "## Tuesday\n\nWent **out** with *friends* & family, see "
+    "[photos](https://example.com/p?id=1).\n\n- groceries\n- call mum\n\n"
+) * 8
+
+# What FastAPI does with a ``-> list[dict[str, Any]]`` return value
+_RESPONSE_FIELD = TypeAdapter(list[dict[str, Any]])
+
+
+def make_entries(n: int) -> list[Any]:
+    """Stand-ins for loaded ``Entry`` rows (attribute access only)."""
+    now = datetime.now(UTC)
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            title=f"Entry {i}",
+            content=f"<p>{MARKDOWN}</p>",
+            markdown_content=MARKDOWN,
+            content_version=2,
+            word_count=160,
+            char_count=len(MARKDOWN),
+            version=3,
+            author_id=uuid4(),
+            created_at=now,
+            updated_at=now,
+            is_deleted=False,
+        )
+        for i in range(n)
+    ]
+
+
+def model_item(row: Any) -> dict[str, Any]:
+    """The pre-change ``_entry_response`` body."""
+    return EntryResponse(
+        id=row.id,
+        title=row.title,
+        content_block=ContentBlock(
+            html=row.content,
+            markdown=row.markdown_content,
+            format_preference="html",
+            version=row.content_version,
+        ),
+        metrics={"word_count": row.word_count or 0, "char_count": row.char_count or 0},
+        content=row.content,
+        markdown_content=row.markdown_content,
+        word_count=row.word_count,
+        char_count=row.char_count,
+        version=row.version,
+        author_id=row.author_id,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        is_deleted=row.is_deleted,
+        content_version=row.content_version,
+        editor_mode="html",
+    ).model_dump()
+
+
+def before(rows: list[Any]) -> bytes:
+    items = [model_item(r) for r in rows]
+    return _RESPONSE_FIELD.dump_json(_RESPONSE_FIELD.validate_python(items))
+
+
+async def after(rows: list[Any]) -> bytes:
+    return json_response([await _entry_response(r) for r in rows]).body
+
+
+def measure(path: Callable[[list[Any]], Any], rows: list[Any], repeat: int) -> float:
+    async def run() -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = path(rows)
+            if inspect.isawaitable(result):
+                await result
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for n in args.entries:
+        rows = make_entries(n)
+        if before(rows) != asyncio.run(after(rows)):
+            raise SystemExit("serialized output differs between paths")
+        old = measure(before, rows, args.repeat) / n * 1e6
+        new = measure(after, rows, args.repeat) / n * 1e6
+        print(
+            f"entries={n} before_us_per_entry={old:.1f} "
+            f"after_us_per_entry={new:.1f} speedup={old / new:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
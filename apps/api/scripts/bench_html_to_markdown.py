@@ -0,0 +1,66 @@
+"""Benchmark html_to_markdown on synthetic legacy entries of growing size.
+
+Prints time per input character for each size; a linear converter keeps it
+flat. Exits non-zero when the largest document costs more than
+``--max-growth`` times the smallest per character.
+
+Usage:
+    python scripts/bench_html_to_markdown.py --sizes 10000 100000 1000000 4000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.infra.conversion import html_to_markdown
+
+
+# One day of a typical legacy (content_version 1) entry
+BLOCK = (
+    "<h2>Tuesday</h2>\n"
+    "<p>Went <strong>out</strong> with <em>friends</em> &amp; family, "
+    'see <a href="https://example.com/p?id=1">photos</a>.<br>Back late.</p>\n'
+    "<ul>\n<li>groceries</li>\n<li>call <b>mum</b>\n<ol><li>about the trip</li>"
+    "</ol></li>\n</ul>\n"
+    "<blockquote><p>Never stop learning &mdash; a_note</p></blockquote>\n"
+    '<pre><code class="language-python">total = sum(x * 2 for x in xs)\n</code></pre>\n'
+    "<table><tr><th>Mood</th><th>Sleep</th></tr><tr><td>good</td><td>7h</td></tr>"
+    "</table>\n"
+)
+
+
+def measure(size: int, repeat: int) -> tuple[int, float]:
+    doc = BLOCK * max(1, size // len(BLOCK))
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        html_to_markdown(doc)
+        best = min(best, time.perf_counter() - t0)
+    return len(doc), best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-growth", type=float, default=2.0)
+    args = parser.parse_args()
+
+    per_char: list[float] = []
+    for size in sorted(args.sizes):
+        chars, seconds = measure(size, args.repeat)
+        per_char.append(seconds / chars * 1e9)
+        print(f"chars={chars} ms={seconds * 1000:.1f} ns_per_char={per_char[-1]:.1f}")
+    growth = per_char[-1] / per_char[0]
+    print(f"growth={growth:.2f}")
+    if growth > args.max_growth:
+        raise SystemExit(
+            f"per-char cost grew {growth:.2f}x (threshold {args.max_growth:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from httpx import AsyncClient
 import pytest
 
 from app.infra.models import Entry
+from app.telemetry.sql_stats import assert_max_queries
 from tests.conftest import assert_entry_response, create_test_entry_data
 
 
@@ -34,6 +35,100 @@ class TestEntriesAPI:
         assert len(entries) == 1
         assert_entry_response(entries[0], "Test Entry")
 
+    @pytest.mark.asyncio()
+    async def test_get_entries_query_count_is_flat(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Listing more entries must not run more statements (no N+1)."""
+        for i in range(5):
+            created = await client.post(
+                "/api/v1/entries",
+                json=create_test_entry_data(f"Entry {i}", f"<p>Body {i}</p>"),
+                headers=auth_headers,
+            )
+            assert created.status_code == 201
+
+        with assert_max_queries(5, repeats=1):
+            response = await client.get("/api/v1/entries", headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+    @pytest.mark.asyncio()
+    async def test_get_entries_summary_view(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Test that the summary view omits bodies and returns the excerpt."""
+        entry_data = create_test_entry_data("Summary Entry", "<p>Short body</p>")
+        created = await client.post(
+            "/api/v1/entries", json=entry_data, headers=auth_headers
+        )
+        assert created.status_code == 201
+
+        response = await client.get(
+            "/api/v1/entries", params={"view": "summary"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        item = response.json()[0]
+        assert item["title"] == "Summary Entry"
+        assert item["excerpt"] == "Short body"
+        assert "metrics" in item
+        assert "content" not in item
+        assert "content_block" not in item
+
+    @pytest.mark.asyncio()
+    async def test_get_entry_not_modified(
+        self, client: AsyncClient, auth_headers: dict[str, str], sample_entry: Entry
+    ):
+        """Test conditional GET with If-None-Match."""
+        url = f"/api/v1/entries/{sample_entry.id}"
+        response = await client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        response = await client.get(
+            url, headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+        # The markdown representation has its own tag
+        response = await client.get(
+            url,
+            headers={
+                **auth_headers,
+                "If-None-Match": etag,
+                "X-Editor-Mode": "markdown",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    @pytest.mark.asyncio()
+    async def test_update_entry_if_match(
+        self, client: AsyncClient, auth_headers: dict[str, str], sample_entry: Entry
+    ):
+        """Test PUT preconditions via If-Match."""
+        url = f"/api/v1/entries/{sample_entry.id}"
+        etag = (await client.get(url, headers=auth_headers)).headers["ETag"]
+
+        response = await client.put(
+            url, json={"title": "Tagged"}, headers={**auth_headers, "If-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+        # The old tag no longer matches
+        response = await client.put(
+            url, json={"title": "Stale"}, headers={**auth_headers, "If-Match": etag}
+        )
+        assert response.status_code == 412
+
+        # Neither If-Match nor expected_version
+        response = await client.put(url, json={"title": "Blind"}, headers=auth_headers)
+        assert response.status_code == 428
+
     @pytest.mark.asyncio()
     async def test_create_entry_success(
         self, client: AsyncClient, auth_headers: dict[str, str]
@@ -0,0 +1,114 @@
+"""
+Test cases for the batch entries endpoint.
+"""
+
+from uuid import uuid4
+
+from httpx import AsyncClient
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.entries import BATCH_MAX_OPERATIONS
+from app.infra.models import Entry, Event
+
+
+@pytest.mark.component()
+class TestEntriesBatchAPI:
+    """Test mixed batches of entry operations."""
+
+    @pytest.mark.asyncio()
+    async def test_batch_mixed_operations(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        sample_entry: Entry,
+        db_session: AsyncSession,
+    ):
+        """Creates, updates, deletes and gets run together with per-op results."""
+        missing = str(uuid4())
+        response = await client.post(
+            "/api/v1/entries/batch",
+            json={
+                "operations": [
+                    {"op": "create", "title": "Batch A", "content": "<p>a</p>"},
+                    {"op": "create", "title": "Batch B", "markdown_content": "# b"},
+                    {
+                        "op": "update",
+                        "id": str(sample_entry.id),
+                        "expected_version": sample_entry.version,
+                        "title": "Renamed",
+                    },
+                    {
+                        "op": "update",
+                        "id": str(sample_entry.id),
+                        "expected_version": sample_entry.version,
+                        "title": "Stale",
+                    },
+                    {"op": "delete", "id": missing, "expected_version": 1},
+                    {"op": "get", "ids": [str(sample_entry.id), missing]},
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == [201, 201, 200, 409, 404, 200]
+        assert results[1]["entry"]["markdown_content"] == "# b"
+        assert results[2]["entry"]["version"] == sample_entry.version + 1
+        assert results[3]["detail"]["actual_version"] == sample_entry.version + 1
+        assert results[5]["entries"][0]["title"] == "Renamed"
+        assert results[5]["missing"] == [missing]
+
+        created = {results[0]["entry"]["id"], results[1]["entry"]["id"]}
+        events = (
+            await db_session.execute(
+                select(Event.event_type).where(
+                    Event.aggregate_id.in_([*created, str(sample_entry.id)])
+                )
+            )
+        ).scalars()
+        assert sorted(events) == ["entry.created", "entry.created", "entry.updated"]
+
+    @pytest.mark.asyncio()
+    async def test_batch_delete_then_get(
+        self, client: AsyncClient, auth_headers: dict[str, str], sample_entry: Entry
+    ):
+        """Gets run after the batch's writes and omit deleted entries."""
+        response = await client.post(
+            "/api/v1/entries/batch",
+            json={
+                "operations": [
+                    {"op": "get", "ids": [str(sample_entry.id)]},
+                    {
+                        "op": "delete",
+                        "id": str(sample_entry.id),
+                        "expected_version": sample_entry.version,
+                    },
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        get_result, delete_result = response.json()["results"]
+        assert delete_result["status"] == 204
+        assert get_result["missing"] == [str(sample_entry.id)]
+
+    @pytest.mark.asyncio()
+    async def test_batch_limits(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Empty, oversized and unknown operations are rejected."""
+        for operations in (
+            [],
+            [{"op": "get", "ids": [str(uuid4())]}] * (BATCH_MAX_OPERATIONS + 1),
+            [{"op": "upsert", "title": "x"}],
+        ):
+            response = await client.post(
+                "/api/v1/entries/batch",
+                json={"operations": operations},
+                headers=auth_headers,
+            )
+            assert response.status_code == 422
@@ -0,0 +1,90 @@
+"""
+Test cases for the entries delta sync feed.
+"""
+
+from httpx import AsyncClient
+import pytest
+
+from app.infra.models import Entry
+
+
+@pytest.mark.component()
+class TestEntryChangesAPI:
+    """Test paging through entry changes and tombstones."""
+
+    @pytest.mark.asyncio()
+    async def test_changes_since_cursor(
+        self, client: AsyncClient, auth_headers: dict[str, str], sample_entry: Entry
+    ):
+        """A client only receives what changed after its cursor."""
+        response = await client.get("/api/v1/entries/changes", headers=auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert str(sample_entry.id) in {c["id"] for c in body["changes"]}
+        cursor = body["next_cursor"]
+
+        # Nothing new yet
+        response = await client.get(
+            "/api/v1/entries/changes", params={"since": cursor}, headers=auth_headers
+        )
+        assert response.json()["changes"] == []
+        assert response.json()["next_cursor"] == cursor
+
+        created = await client.post(
+            "/api/v1/entries",
+            json={"title": "New", "content": "Fresh"},
+            headers=auth_headers,
+        )
+        deleted = await client.delete(
+            f"/api/v1/entries/{sample_entry.id}",
+            params={"expected_version": sample_entry.version},
+            headers=auth_headers,
+        )
+        assert deleted.status_code == 204
+
+        response = await client.get(
+            "/api/v1/entries/changes", params={"since": cursor}, headers=auth_headers
+        )
+        changes = response.json()["changes"]
+        assert [c["id"] for c in changes] == [
+            created.json()["id"],
+            str(sample_entry.id),
+        ]
+        assert changes[1]["is_deleted"] is True
+        assert "content" not in changes[1]
+
+    @pytest.mark.asyncio()
+    async def test_changes_paging(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """has_more and next_cursor walk the feed page by page."""
+        for i in range(5):
+            await client.post(
+                "/api/v1/entries",
+                json={"title": f"Entry {i}", "content": "x"},
+                headers=auth_headers,
+            )
+
+        seen: list[str] = []
+        params: dict[str, str | int] = {"limit": 2}
+        while True:
+            response = await client.get(
+                "/api/v1/entries/changes", params=params, headers=auth_headers
+            )
+            body = response.json()
+            seen += [c["id"] for c in body["changes"]]
+            if not body["has_more"]:
+                break
+            params = {"limit": 2, "since": body["next_cursor"]}
+
+        assert len(seen) == len(set(seen)) >= 5
+
+    @pytest.mark.asyncio()
+    async def test_changes_invalid_cursor(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """A malformed cursor is rejected."""
+        response = await client.get(
+            "/api/v1/entries/changes", params={"since": "bogus"}, headers=auth_headers
+        )
+        assert response.status_code == 400
@@ -47,6 +47,49 @@ class TestEntriesAPIErrors:
         entries = response.json()
         assert len(entries) == 5  # Only 5 entries left after offset 10
 
+    @pytest.mark.asyncio()
+    async def test_get_entries_with_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        db_session: AsyncSession,
+    ):
+        """Test walking all entries with keyset cursors."""
+        for i in range(12):
+            entry = Entry(
+                title=f"Entry {i}",
+                content=f"Content {i}",
+                author_id="11111111-1111-1111-1111-111111111111",
+            )
+            db_session.add(entry)
+        await db_session.flush()
+
+        seen: list[str] = []
+        params: dict[str, str | int] = {"limit": 5}
+        while True:
+            response = await client.get(
+                "/api/v1/entries", params=params, headers=auth_headers
+            )
+            assert response.status_code == 200
+            seen += [e["id"] for e in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 5, "cursor": cursor}
+
+        assert len(seen) == 12
+        assert len(set(seen)) == 12
+
+    @pytest.mark.asyncio()
+    async def test_get_entries_invalid_cursor(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Test that a malformed cursor is rejected."""
+        response = await client.get(
+            "/api/v1/entries", params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
     @pytest.mark.asyncio()
     async def test_update_entry_empty_data(
         self, client: AsyncClient, auth_headers: dict[str, str], sample_entry: Entry
@@ -0,0 +1,44 @@
+"""
+Test cases for the bulk import endpoints.
+"""
+
+from uuid import uuid4
+
+from httpx import AsyncClient
+import pytest
+
+
+@pytest.mark.component()
+class TestEntriesImportAPI:
+    """Request validation of the import endpoints."""
+
+    @pytest.mark.asyncio()
+    async def test_import_rejects_unknown_format(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        response = await client.post(
+            "/api/v1/entries/import",
+            content=b"title,content\n",
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 415
+
+    @pytest.mark.asyncio()
+    async def test_import_rejects_body_that_is_not_a_zip(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        response = await client.post(
+            "/api/v1/entries/import?format=zip",
+            content=b"plain text",
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio()
+    async def test_unknown_import_job(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        response = await client.get(
+            f"/api/v1/entries/import/{uuid4()}", headers=auth_headers
+        )
+        assert response.status_code == 404
@@ -2,6 +2,8 @@
 Test cases for entry API markdown content handling.
 """
 
+from uuid import UUID
+
 from httpx import AsyncClient
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -355,3 +357,35 @@ Math: 5 < 10 && 10 > 5
         # When markdown_content is None, it should not update markdown
         # but should update HTML content
         assert data["content"] == "<p>HTML only</p>"
+
+    @pytest.mark.asyncio()
+    async def test_rendered_storage_keeps_markdown_only(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        db_session: AsyncSession,
+        monkeypatch,
+    ):
+        """Test markdown entries store no HTML and render it on read."""
+        monkeypatch.setattr(
+            "app.infra.conversion.settings.entry_html_storage", "rendered"
+        )
+
+        response = await client.post(
+            "/api/v1/entries",
+            json={"title": "Canonical", "markdown_content": "Some **bold** text"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        created = response.json()
+        assert "<strong>bold</strong>" in created["content"]
+
+        entry = await db_session.get(Entry, UUID(created["id"]))
+        assert entry.content is None
+        assert entry.excerpt == "Some bold text"
+
+        response = await client.get(
+            f"/api/v1/entries/{created['id']}", headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["content_block"]["html"] == created["content"]
@@ -0,0 +1,101 @@
+"""
+Test cases for the "on this day" entries endpoint.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from httpx import AsyncClient
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.models import Entry
+from app.infra.redis import get_redis_client
+from app.main import app
+
+
+AUTHOR = "11111111-1111-1111-1111-111111111111"
+
+
+@pytest.fixture()
+def cache(redis_client):
+    app.dependency_overrides[get_redis_client] = lambda: redis_client
+    yield redis_client
+    app.dependency_overrides.pop(get_redis_client, None)
+
+
+def _years_back(now: datetime, years: int) -> datetime:
+    if now.month == 2 and now.day == 29:
+        pytest.skip("no same calendar day in most earlier years")
+    return now.replace(year=now.year - years)
+
+
+@pytest.mark.component()
+class TestOnThisDayAPI:
+    """Test entries from the same calendar day in earlier years."""
+
+    @pytest.mark.asyncio()
+    async def test_lists_earlier_years_only(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        db_session: AsyncSession,
+        cache,
+    ):
+        now = datetime.now(UTC).replace(hour=12, tzinfo=None)
+        for title, at in (
+            ("One year ago", _years_back(now, 1)),
+            ("Three years ago", _years_back(now, 3)),
+            ("Today", now),
+            ("Other day", _years_back(now, 1) - timedelta(days=2)),
+        ):
+            db_session.add(
+                Entry(
+                    title=title,
+                    content=f"<p>{title}</p>",
+                    author_id=AUTHOR,
+                    created_at=at,
+                    updated_at=at,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/entries/on-this-day", params={"tz": "UTC"}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        items = response.json()
+        assert [(i["title"], i["years_ago"]) for i in items] == [
+            ("One year ago", 1),
+            ("Three years ago", 3),
+        ]
+        assert "content" not in items[0]
+        assert response.headers["cache-control"].startswith("private, max-age=")
+
+        key, body = cache.set.call_args.args
+        assert key.startswith("entries:on-this-day:")
+        assert body == response.content
+        assert 0 < cache.set.call_args.kwargs["ex"] <= 86400
+
+    @pytest.mark.asyncio()
+    async def test_serves_cached_answer(
+        self, client: AsyncClient, auth_headers: dict[str, str], cache
+    ):
+        cache.get.return_value = b'[{"title":"cached"}]'
+
+        response = await client.get("/api/v1/entries/on-this-day", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == [{"title": "cached"}]
+        cache.set.assert_not_called()
+
+    @pytest.mark.asyncio()
+    async def test_rejects_unknown_time_zone(
+        self, client: AsyncClient, auth_headers: dict[str, str], cache
+    ):
+        response = await client.get(
+            "/api/v1/entries/on-this-day",
+            params={"tz": "Mars/Olympus"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
@@ -0,0 +1,121 @@
+"""
+Test cases for partial (PATCH) entry updates.
+"""
+
+from httpx import AsyncClient
+import pytest
+
+
+async def _create(client: AsyncClient, headers: dict[str, str]) -> dict:
+    response = await client.post(
+        "/api/v1/entries",
+        json={"title": "Draft", "markdown_content": "# Day\n\nHello world"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return {**response.json(), "etag": response.headers["ETag"]}
+
+
+@pytest.mark.component()
+class TestEntriesPatchAPI:
+    """Test autosave patches against a known version."""
+
+    @pytest.mark.asyncio()
+    async def test_patch_applies_edits_and_derives_fields(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Edits splice the markdown; HTML, excerpt and metrics follow."""
+        entry = await _create(client, auth_headers)
+
+        response = await client.patch(
+            f"/api/v1/entries/{entry['id']}",
+            json={
+                "expected_version": entry["version"],
+                "edits": [{"at": 13, "delete": 5, "insert": "there, big world"}],
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["version"] == entry["version"] + 1
+        assert body["metrics"] == {"word_count": 5, "char_count": 29}
+        assert "content" not in body
+        assert response.headers["ETag"].startswith(f'"{body["version"]}-')
+
+        full = await client.get(
+            f"/api/v1/entries/{entry['id']}",
+            headers={**auth_headers, "X-Editor-Mode": "markdown"},
+        )
+        data = full.json()
+        assert data["markdown_content"] == "# Day\n\nHello there, big world"
+        assert "<p>Hello there, big world</p>" in data["content_block"]["html"]
+
+    @pytest.mark.asyncio()
+    async def test_patch_return_representation(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Prefer: return=representation returns the full entry."""
+        entry = await _create(client, auth_headers)
+
+        response = await client.patch(
+            f"/api/v1/entries/{entry['id']}",
+            json={"expected_version": entry["version"], "title": "Renamed"},
+            headers={**auth_headers, "Prefer": "return=representation"},
+        )
+        assert response.status_code == 200
+        assert response.json()["title"] == "Renamed"
+        assert response.headers["Preference-Applied"] == "return=representation"
+
+    @pytest.mark.asyncio()
+    async def test_patch_stale_version_conflicts(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """A patch made against an older version is rejected like PUT."""
+        entry = await _create(client, auth_headers)
+        url = f"/api/v1/entries/{entry['id']}"
+        edit = {"at": 0, "insert": "x"}
+
+        first = await client.patch(
+            url,
+            json={"expected_version": entry["version"], "edits": [edit]},
+            headers=auth_headers,
+        )
+        assert first.status_code == 200
+        stale = await client.patch(
+            url,
+            json={"expected_version": entry["version"], "edits": [edit]},
+            headers=auth_headers,
+        )
+        assert stale.status_code == 409
+        assert stale.json()["detail"]["actual_version"] == entry["version"] + 1
+
+        stale_etag = await client.patch(
+            url,
+            json={"edits": [edit]},
+            headers={**auth_headers, "If-Match": entry["etag"]},
+        )
+        assert stale_etag.status_code == 412
+
+    @pytest.mark.asyncio()
+    async def test_patch_rejects_edits_out_of_range(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        """Edits that do not fit the named version are a 422."""
+        entry = await _create(client, auth_headers)
+
+        response = await client.patch(
+            f"/api/v1/entries/{entry['id']}",
+            json={
+                "expected_version": entry["version"],
+                "edits": [{"at": 500, "insert": "x"}],
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+
+        empty = await client.patch(
+            f"/api/v1/entries/{entry['id']}",
+            json={"expected_version": entry["version"]},
+            headers=auth_headers,
+        )
+        assert empty.status_code == 422
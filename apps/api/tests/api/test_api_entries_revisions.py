@@ -0,0 +1,112 @@
+"""
+Test cases for entry revision history endpoints.
+"""
+
+from httpx import AsyncClient
+import pytest
+
+
+async def _entry_with_history(client: AsyncClient, headers: dict[str, str]) -> str:
+    response = await client.post(
+        "/api/v1/entries",
+        json={"title": "Draft", "markdown_content": "# Day\n\nHello world"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    entry_id = response.json()["id"]
+
+    response = await client.patch(
+        f"/api/v1/entries/{entry_id}",
+        json={"expected_version": 1, "edits": [{"at": 13, "insert": " there"}]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    response = await client.put(
+        f"/api/v1/entries/{entry_id}",
+        json={
+            "title": "Final",
+            "markdown_content": "# Day\n\nGoodbye",
+            "expected_version": 2,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return entry_id
+
+
+@pytest.mark.component()
+class TestEntryRevisionsAPI:
+    """Test listing and reading past versions of an entry."""
+
+    @pytest.mark.asyncio()
+    async def test_list_revisions_newest_first(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        entry_id = await _entry_with_history(client, auth_headers)
+
+        response = await client.get(
+            f"/api/v1/entries/{entry_id}/revisions", headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        revisions = response.json()
+        assert [r["version"] for r in revisions] == [3, 2, 1]
+        assert [r["title"] for r in revisions] == ["Final", "Draft", "Draft"]
+        assert [r["autosave"] for r in revisions] == [False, True, False]
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.asyncio()
+    async def test_list_revisions_pages(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        entry_id = await _entry_with_history(client, auth_headers)
+
+        first = await client.get(
+            f"/api/v1/entries/{entry_id}/revisions",
+            params={"limit": 2},
+            headers=auth_headers,
+        )
+        second = await client.get(
+            f"/api/v1/entries/{entry_id}/revisions",
+            params={"limit": 2, "before": first.headers["X-Next-Cursor"]},
+            headers=auth_headers,
+        )
+
+        assert [r["version"] for r in first.json()] == [3, 2]
+        assert [r["version"] for r in second.json()] == [1]
+
+    @pytest.mark.asyncio()
+    async def test_get_old_revision(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        entry_id = await _entry_with_history(client, auth_headers)
+
+        for version, markdown in [
+            (1, "# Day\n\nHello world"),
+            (2, "# Day\n\nHello there world"),
+            (3, "# Day\n\nGoodbye"),
+        ]:
+            response = await client.get(
+                f"/api/v1/entries/{entry_id}/revisions/{version}",
+                headers=auth_headers,
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["markdown_content"] == markdown
+            assert data["content_format"] == "markdown"
+            assert "<h1>Day</h1>" in data["content"]
+
+    @pytest.mark.asyncio()
+    async def test_unknown_revision_not_found(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        entry_id = await _entry_with_history(client, auth_headers)
+
+        response = await client.get(
+            f"/api/v1/entries/{entry_id}/revisions/9", headers=auth_headers
+        )
+        assert response.status_code == 404
+        response = await client.get(
+            "/api/v1/entries/not-a-uuid/revisions", headers=auth_headers
+        )
+        assert response.status_code == 404
@@ -4,12 +4,17 @@ Moved from test_api_admin_extended.py to proper location.
 """
 
 from datetime import datetime, timedelta
+from uuid import UUID
 
 from httpx import AsyncClient
 import pytest
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.stats import get_entry_stats
+from app.infra.entry_stats import read_activity, rebuild_entry_stats
 from app.infra.models import Entry
+from app.infra.sa_models import UserEntryStatsDaily, UserEntryStatsTotal
 
 
 @pytest.mark.component()
@@ -291,3 +296,242 @@ class TestStatsAPI:
         # Only entries updated within last 7 days
         assert data["recent_entries"] == 2
         assert data["total_entries"] == 3
+
+
+@pytest.mark.component()
+class TestEntryStatsRollup:
+    """Daily counters kept by the entries_stats_rollup triggers."""
+
+    AUTHOR = UUID("22222222-2222-2222-2222-222222222222")
+    OTHER = UUID("33333333-3333-3333-3333-333333333333")
+
+    async def _rows(self, db_session: AsyncSession) -> list[tuple]:
+        result = await db_session.execute(
+            select(
+                UserEntryStatsDaily.day,
+                UserEntryStatsDaily.created,
+                UserEntryStatsDaily.updated,
+            )
+            .where(UserEntryStatsDaily.author_id == self.AUTHOR)
+            .order_by(UserEntryStatsDaily.day)
+        )
+        return [tuple(row) for row in result]
+
+    async def _total(self, db_session: AsyncSession) -> int | None:
+        return await db_session.scalar(
+            select(UserEntryStatsTotal.entries).where(
+                UserEntryStatsTotal.author_id == self.AUTHOR
+            )
+        )
+
+    @pytest.mark.asyncio()
+    async def test_counts_only_the_given_author(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        now = datetime(2024, 6, 15, 14, 30, 0)
+        monkeypatch.setattr("app.api.v1.stats._utcnow", lambda: now)
+        for author, count in ((self.AUTHOR, 2), (self.OTHER, 3)):
+            for i in range(count):
+                db_session.add(
+                    Entry(
+                        title=f"Entry {i}",
+                        content="Content",
+                        author_id=str(author),
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+        await db_session.commit()
+
+        mine = await get_entry_stats(db_session, self.AUTHOR)
+        assert mine["total_entries"] == 2
+        assert mine["entries_today"] == 2
+        everyone = await get_entry_stats(db_session, None)
+        assert everyone["total_entries"] >= 5
+
+    @pytest.mark.asyncio()
+    async def test_soft_delete_and_update_move_counters(self, db_session: AsyncSession):
+        day = datetime(2024, 6, 1, 12, 0, 0)
+        entry = Entry(
+            title="Entry",
+            content="Content",
+            author_id=str(self.AUTHOR),
+            created_at=day,
+            updated_at=day,
+        )
+        db_session.add(entry)
+        await db_session.commit()
+        assert await self._rows(db_session) == [(day.date(), 1, 1)]
+        assert await self._total(db_session) == 1
+
+        entry.updated_at = day + timedelta(days=2)
+        await db_session.commit()
+        assert await self._rows(db_session) == [
+            (day.date(), 1, 0),
+            ((day + timedelta(days=2)).date(), 0, 1),
+        ]
+
+        entry.is_deleted = True
+        await db_session.commit()
+        assert await self._rows(db_session) == []
+        assert await self._total(db_session) is None
+
+    @pytest.mark.asyncio()
+    async def test_rebuild_matches_triggers(self, db_session: AsyncSession):
+        start = datetime(2024, 5, 1, 9, 0, 0)
+        for i in range(6):
+            db_session.add(
+                Entry(
+                    title=f"Entry {i}",
+                    content="Content",
+                    author_id=str(self.AUTHOR),
+                    created_at=start + timedelta(days=i // 2),
+                    updated_at=start + timedelta(days=i),
+                    is_deleted=i == 5,
+                )
+            )
+        await db_session.commit()
+        maintained = await self._rows(db_session)
+        assert await self._total(db_session) == 5
+
+        await db_session.execute(
+            delete(UserEntryStatsDaily).where(
+                UserEntryStatsDaily.author_id == self.AUTHOR
+            )
+        )
+        await db_session.execute(
+            delete(UserEntryStatsTotal).where(
+                UserEntryStatsTotal.author_id == self.AUTHOR
+            )
+        )
+        assert await rebuild_entry_stats(db_session, self.AUTHOR) == len(maintained)
+        assert await self._rows(db_session) == maintained
+        assert await self._total(db_session) == 5
+
+
+@pytest.mark.component()
+class TestActivityAPI:
+    """Test cases for the activity heatmap endpoint."""
+
+    @pytest.mark.asyncio()
+    async def test_heatmap_and_streaks(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        db_session: AsyncSession,
+        monkeypatch,
+    ):
+        mock_now = datetime(2024, 6, 15, 14, 30, 0)
+        monkeypatch.setattr("app.api.v1.stats._utcnow", lambda: mock_now)
+        # Two entries today, one on each of the two days before, one a week ago
+        for days_ago, words in ((0, 10), (0, 5), (1, 7), (2, 3), (7, 4)):
+            at = mock_now - timedelta(days=days_ago)
+            db_session.add(
+                Entry(
+                    title="Entry",
+                    content="Content",
+                    author_id="11111111-1111-1111-1111-111111111111",
+                    word_count=words,
+                    char_count=words * 6,
+                    created_at=at,
+                    updated_at=at,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/stats/activity", params={"days": 8}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["start"] == "2024-06-08"
+        assert data["end"] == "2024-06-15"
+        assert data["entries"] == [1, 0, 0, 0, 0, 1, 1, 2]
+        assert data["words"] == [4, 0, 0, 0, 0, 3, 7, 15]
+        assert data["chars"][-1] == 90
+        assert data["current_streak"] == 3
+        assert data["longest_streak"] == 3
+
+    @pytest.mark.asyncio()
+    async def test_edits_and_deletes_update_days(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        db_session: AsyncSession,
+        monkeypatch,
+    ):
+        mock_now = datetime(2024, 6, 15, 14, 30, 0)
+        monkeypatch.setattr("app.api.v1.stats._utcnow", lambda: mock_now)
+        entry = Entry(
+            title="Entry",
+            content="Content",
+            author_id="11111111-1111-1111-1111-111111111111",
+            word_count=10,
+            char_count=60,
+            created_at=mock_now,
+            updated_at=mock_now,
+        )
+        db_session.add(entry)
+        await db_session.commit()
+
+        entry.word_count = 25
+        await db_session.commit()
+        params = {"days": 1}
+        data = (
+            await client.get(
+                "/api/v1/stats/activity", params=params, headers=auth_headers
+            )
+        ).json()
+        assert data["words"] == [25]
+
+        entry.is_deleted = True
+        await db_session.commit()
+        data = (
+            await client.get(
+                "/api/v1/stats/activity", params=params, headers=auth_headers
+            )
+        ).json()
+        assert data["entries"] == [0]
+        assert data["current_streak"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_multi_row_statements_match_recount(self, db_session: AsyncSession):
+        author_id = UUID("11111111-1111-1111-1111-111111111111")
+        day = datetime(2024, 6, 15, 12, 0, 0)
+        await db_session.execute(
+            insert(Entry),
+            [
+                {
+                    "title": f"Entry {i}",
+                    "content": "Content",
+                    "author_id": author_id,
+                    "word_count": 10,
+                    "char_count": 60,
+                    "created_at": day - timedelta(days=i % 3),
+                    "updated_at": day,
+                }
+                for i in range(9)
+            ],
+        )
+        # One statement moving two entries to another day and editing their counts
+        await db_session.execute(
+            update(Entry)
+            .where(
+                Entry.author_id == author_id, Entry.title.in_(["Entry 0", "Entry 1"])
+            )
+            .values(created_at=day - timedelta(days=5), word_count=Entry.word_count + 1)
+        )
+        await db_session.execute(
+            delete(Entry).where(Entry.author_id == author_id, Entry.title == "Entry 2")
+        )
+        await db_session.commit()
+
+        start, end = (day - timedelta(days=5)).date(), day.date()
+        kept = (await read_activity(db_session, author_id)).window(start, end)
+        assert kept.entries == [2, 0, 0, 2, 2, 2]
+        assert kept.words == [22, 0, 0, 20, 20, 20]
+
+        await rebuild_entry_stats(db_session, author_id)
+        await db_session.commit()
+        assert (await read_activity(db_session, author_id)).window(start, end) == kept
@@ -26,7 +26,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import sessionmaker
 
 from app.infra.auth import require_user
-from app.infra.db import build_engine, get_session
+from app.infra.db import build_engine, get_read_session, get_session
 from app.infra.models import Entry
 from app.main import app
 from app.settings import settings
@@ -185,6 +185,7 @@ async def client(request, session_factory, db_connection: AsyncConnection):
                 await session.close()
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
     # For E2E auth tests, don't override auth unless explicitly marked to skip
     # Check if this is an auth-specific test that should not bypass authentication
     is_auth_test = hasattr(request, "node") and "auth" in request.node.name
@@ -196,6 +197,7 @@ async def client(request, session_factory, db_connection: AsyncConnection):
             yield c
     finally:
         app.dependency_overrides.pop(get_session, None)
+        app.dependency_overrides.pop(get_read_session, None)
         app.dependency_overrides.pop(require_user, None)
 
 
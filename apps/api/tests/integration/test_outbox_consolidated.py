@@ -493,3 +493,61 @@ class TestOutboxPatternExtended:
 
         # Should have attempted twice (error then retry)
         assert call_count >= 2
+
+    @pytest.mark.asyncio()
+    async def test_process_outbox_batch_pipelines_publishes(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        """Test that a batch is published concurrently and acknowledged in bulk."""
+        for i in range(10):
+            db_session.add(
+                Event(
+                    aggregate_id=uuid4(),
+                    aggregate_type="Entry",
+                    event_type="entry.created",
+                    event_data={"index": i},
+                    occurred_at=datetime.utcnow(),
+                )
+            )
+        await db_session.commit()
+
+        in_flight = 0
+        max_in_flight = 0
+        msg_ids = []
+
+        class MockJS:
+            async def publish(self, subject, payload, headers=None):
+                nonlocal in_flight, max_in_flight
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                msg_ids.append(headers["Nats-Msg-Id"])
+
+        class MockNC:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            def jetstream(self):
+                return MockJS()
+
+        monkeypatch.setattr("app.infra.outbox.nats_conn", MockNC)
+
+        @asynccontextmanager
+        async def mock_session_factory():
+            yield db_session
+
+        count = await process_outbox_batch(mock_session_factory)
+
+        assert count == 10
+        assert len(msg_ids) == 10
+        # Acks are awaited together rather than one round trip at a time
+        assert max_in_flight > 1
+
+        result = await db_session.execute(
+            select(Event).where(Event.published_at.is_(None))
+        )
+        assert result.scalars().all() == []
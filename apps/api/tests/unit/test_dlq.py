@@ -0,0 +1,161 @@
+"""
+Unit tests for DLQ filtering and batched replay of dead outbox events.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infra import dlq
+from app.infra.dlq import (
+    DeadEventFilter,
+    _dead_events_query,
+    get_replay_job,
+    replay_dead_events,
+    start_replay_job,
+)
+from app.infra.sa_models import Event
+
+
+def _dead_event(seq):
+    return Event(
+        id=uuid4(),
+        aggregate_id=uuid4(),
+        aggregate_type="Entry",
+        event_type="entry.created",
+        event_data={},
+        occurred_at=datetime.now(UTC),
+        seq=seq,
+        state="dead",
+    )
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.unit()
+class TestDeadEventQuery:
+    def test_filters_compile(self):
+        flt = DeadEventFilter(
+            event_type="entry.created",
+            error_contains="timeout",
+            since=datetime(2026, 10, 1, tzinfo=UTC),
+        )
+        sql = str(_dead_events_query(flt).compile(dialect=postgresql.dialect()))
+
+        assert "events.state = " in sql
+        assert "events.event_type = " in sql
+        assert "ILIKE" in sql.upper()
+        assert "events.occurred_at >= " in sql
+        assert sql.rstrip().endswith("ORDER BY events.seq")
+
+    def test_error_filter_escapes_wildcards(self):
+        query = _dead_events_query(DeadEventFilter(error_contains="50%_off"))
+        compiled = query.compile(dialect=postgresql.dialect())
+
+        assert "ESCAPE '/'" in str(compiled)
+        assert "50/%/_off" in compiled.params.values()
+
+
+@pytest.mark.unit()
+class TestReplay:
+    @pytest.fixture()
+    def dead_rows(self, monkeypatch):
+        rows = [_dead_event(seq) for seq in range(1, 8)]
+        sessions = []
+
+        async def claim(s, flt, batch_size, after_seq):
+            remaining = [r for r in rows if after_seq is None or r.seq > after_seq]
+            return remaining[:batch_size]
+
+        async def publish(s, batch, retry_enabled):
+            assert retry_enabled
+            # First event of every batch fails again
+            return len(batch) - 1
+
+        @asynccontextmanager
+        async def session_factory():
+            s = FakeSession()
+            sessions.append(s)
+            yield s
+
+        monkeypatch.setattr(dlq, "_claim_dead_batch", claim)
+        monkeypatch.setattr(dlq, "_publish_rows", publish)
+        return rows, sessions, session_factory
+
+    @pytest.mark.asyncio()
+    async def test_replays_in_batches(self, dead_rows):
+        rows, sessions, factory = dead_rows
+
+        report = await replay_dead_events(factory, DeadEventFilter(), batch_size=3)
+
+        assert report.selected == len(rows)
+        assert report.batches == 3
+        assert report.published == len(rows) - 3
+        assert report.failed == 3
+        assert sum(s.commits for s in sessions) == 3
+
+    @pytest.mark.asyncio()
+    async def test_limit_caps_selection(self, dead_rows):
+        _rows, _sessions, factory = dead_rows
+
+        report = await replay_dead_events(
+            factory, DeadEventFilter(), batch_size=3, limit=4
+        )
+
+        assert report.selected == 4
+        assert report.batches == 2
+
+    @pytest.mark.asyncio()
+    async def test_rate_cap_paces_batches(self, dead_rows, monkeypatch):
+        _rows, _sessions, factory = dead_rows
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(dlq.asyncio, "sleep", fake_sleep)
+
+        await replay_dead_events(
+            factory, DeadEventFilter(), batch_size=5, max_per_second=10
+        )
+
+        assert len(delays) == 2
+        assert 0.4 < delays[0] <= 0.5
+
+    @pytest.mark.asyncio()
+    async def test_dry_run_reports_bounded_ids(self, dead_rows, monkeypatch):
+        rows, _sessions, factory = dead_rows
+        monkeypatch.setattr(dlq, "MAX_REPORTED_IDS", 5)
+        # Listing sees the same rows as claiming
+        monkeypatch.setattr(dlq, "list_dead_events", dlq._claim_dead_batch)
+
+        report = await replay_dead_events(
+            factory, DeadEventFilter(), batch_size=3, dry_run=True
+        )
+
+        assert report.selected == len(rows)
+        assert report.as_dict()["event_ids"] == [str(r.id) for r in rows[:5]]
+        assert report.as_dict()["event_ids_truncated"]
+
+    @pytest.mark.asyncio()
+    async def test_replay_job_reports_progress(self, dead_rows):
+        rows, _sessions, factory = dead_rows
+
+        job = start_replay_job(factory, DeadEventFilter(), batch_size=3)
+        assert get_replay_job(job.id) is job
+        assert job.as_dict()["status"] == "running"
+        await asyncio.gather(*dlq._job_tasks)
+
+        assert job.status == "succeeded"
+        assert job.as_dict()["selected"] == len(rows)
+        assert job.as_dict()["batches"] == 3
@@ -0,0 +1,58 @@
+"""
+Unit tests for activity windows and streaks over the daily activity arrays.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.infra.entry_stats import Activity
+
+
+FIRST = date(2026, 10, 1)
+
+
+def _activity(entries: list[int]) -> Activity:
+    return Activity(
+        FIRST, entries, [n * 100 for n in entries], [n * 600 for n in entries]
+    )
+
+
+@pytest.mark.unit()
+class TestWindow:
+    def test_pads_days_outside_stored_range(self):
+        window = _activity([1, 2]).window(
+            FIRST - timedelta(days=2), FIRST + timedelta(days=3)
+        )
+        assert window.first == FIRST - timedelta(days=2)
+        assert window.entries == [0, 0, 1, 2, 0, 0]
+        assert window.words == [0, 0, 100, 200, 0, 0]
+
+    def test_slices_inside_range(self):
+        window = _activity([1, 2, 3, 4]).window(
+            FIRST + timedelta(days=1), FIRST + timedelta(days=2)
+        )
+        assert window.entries == [2, 3]
+        assert window.chars == [1200, 1800]
+
+    def test_empty_activity(self):
+        window = Activity(FIRST, [], [], []).window(FIRST, FIRST + timedelta(days=1))
+        assert window.entries == [0, 0]
+
+
+@pytest.mark.unit()
+class TestStreaks:
+    @pytest.mark.parametrize(
+        "entries,today_offset,expected",
+        [
+            ([1, 1, 0, 1, 1, 1], 5, (3, 3)),
+            # Nothing written today yet: yesterday's streak still counts
+            ([1, 1, 0, 1, 1, 0], 5, (2, 2)),
+            ([1, 1, 1, 0, 0, 0], 5, (0, 3)),
+            ([1, 0, 2, 1], 10, (0, 2)),
+            ([], 0, (0, 0)),
+        ],
+    )
+    def test_current_and_longest(self, entries, today_offset, expected):
+        today = FIRST + timedelta(days=today_offset)
+        assert _activity(entries).streaks(today) == expected
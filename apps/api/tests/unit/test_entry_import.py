@@ -0,0 +1,155 @@
+"""
+Unit tests for bulk entry import: record preparation and chunked loading.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import json
+from uuid import UUID, uuid4
+import zipfile
+
+import pytest
+
+from app.infra import entry_import
+from app.infra.entry_import import (
+    MAX_REPORTED_ERRORS,
+    STAGE_COLUMNS,
+    ImportReport,
+    import_entries,
+    iter_markdown_zip,
+    prepare_chunk,
+)
+
+
+AUTHOR = str(uuid4())
+
+
+def _row(row):
+    return dict(zip(STAGE_COLUMNS, row, strict=True))
+
+
+@pytest.mark.unit()
+class TestPrepareChunk:
+    def test_jsonl_records(self):
+        records = [
+            (
+                "line 1",
+                json.dumps({"title": "One", "markdown_content": "# Hi\n\nthere"}),
+            ),
+            (
+                "line 2",
+                json.dumps({"title": "Legacy", "content": "<p>Old <b>html</b></p>"}),
+            ),
+            ("line 3", "{not json"),
+            ("line 4", json.dumps({"markdown_content": "no title"})),
+            (
+                "line 5",
+                json.dumps({
+                    "title": "Dated",
+                    "created_at": "2020-05-01T10:00:00+02:00",
+                }),
+            ),
+        ]
+
+        rows, errors = prepare_chunk(AUTHOR, "jsonl", records)
+
+        assert len(rows) == 3
+        assert [e.split(":")[0] for e in errors] == ["line 3", "line 4"]
+        first, legacy, dated = map(_row, rows)
+        assert first["content"] == "<h1>Hi</h1>\n<p>there</p>\n"
+        assert (first["word_count"], first["char_count"]) == (2, 11)
+        assert first["excerpt"] == "Hi there"
+        assert legacy["markdown_content"] == "Old **html**"
+        assert legacy["content_version"] == 2
+        assert dated["created_at"].isoformat() == "2020-05-01T08:00:00+00:00"
+        assert dated["updated_at"] == dated["created_at"]
+
+    def test_empty_legacy_html_stays_empty(self):
+        record = [("line 1", json.dumps({"title": "Blank", "content": "<p></p>"}))]
+
+        blank = _row(prepare_chunk(AUTHOR, "jsonl", record)[0][0])
+
+        assert blank["markdown_content"] == ""
+        assert blank["word_count"] == 0
+
+    def test_ids_are_stable_across_runs(self):
+        record = [("line 1", json.dumps({"title": "Same", "markdown_content": "x"}))]
+        given = str(uuid4())
+        with_id = [("line 1", json.dumps({"id": given, "title": "T"}))]
+
+        first = _row(prepare_chunk(AUTHOR, "jsonl", record)[0][0])
+        again = _row(prepare_chunk(AUTHOR, "jsonl", record)[0][0])
+
+        assert first["id"] == again["id"]
+        assert _row(prepare_chunk(AUTHOR, "jsonl", with_id)[0][0])["id"] == UUID(given)
+
+    def test_markdown_zip(self, tmp_path):
+        archive = tmp_path / "notes.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr(
+                "2021/trip.md",
+                '---\ntitle: "Road trip"\ndate: 2021-07-04\n---\n\nDrove **far**.',
+            )
+            zf.writestr("2021/plain_note.markdown", "Just text")
+            zf.writestr("2021/headed.md", "# From heading\n\nBody")
+            zf.writestr("2021/photo.jpg", b"\xff\xd8")
+
+        records = list(iter_markdown_zip(archive))
+        rows, errors = prepare_chunk(AUTHOR, "zip", records)
+
+        assert not errors
+        trip, plain, headed = map(_row, rows)
+        assert trip["title"] == "Road trip"
+        assert trip["markdown_content"] == "Drove **far**."
+        assert trip["created_at"].date().isoformat() == "2021-07-04"
+        assert plain["title"] == "plain note"
+        assert headed["title"] == "From heading"
+
+
+@pytest.mark.unit()
+class TestImportEntries:
+    @pytest.mark.asyncio()
+    async def test_loads_in_chunks(self, tmp_path, monkeypatch):
+        source = tmp_path / "entries.jsonl"
+        lines = [
+            json.dumps({"title": f"E{i}", "markdown_content": "x"}) for i in range(7)
+        ]
+        source.write_text("\n".join([*lines, "", "oops"]) + "\n")
+        loaded = []
+
+        async def fake_copy_and_merge(s, rows):
+            loaded.append(len(rows))
+            return len(rows) - 1  # one row per chunk already exists
+
+        class FakeSession:
+            async def commit(self):
+                pass
+
+        @asynccontextmanager
+        async def session_factory():
+            yield FakeSession()
+
+        monkeypatch.setattr(entry_import, "copy_and_merge", fake_copy_and_merge)
+
+        report = await import_entries(
+            session_factory,
+            source,
+            "jsonl",
+            UUID(AUTHOR),
+            chunk_size=3,
+            workers=1,
+            executor_factory=ThreadPoolExecutor,
+        )
+
+        assert loaded == [3, 3, 1]
+        assert report.records == 8
+        assert (report.imported, report.skipped, report.failed) == (4, 3, 1)
+        assert report.chunks == 3
+
+    def test_report_caps_errors(self):
+        report = ImportReport()
+
+        report.add_errors([f"line {i}: bad" for i in range(MAX_REPORTED_ERRORS + 5)])
+
+        assert report.failed == MAX_REPORTED_ERRORS + 5
+        assert len(report.errors) == MAX_REPORTED_ERRORS
@@ -0,0 +1,51 @@
+"""
+Unit tests for keyset pagination cursors of the entry listing.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.services.entry_service import (
+    InvalidCursorError,
+    decode_change_cursor,
+    decode_cursor,
+    encode_change_cursor,
+    encode_cursor,
+)
+
+
+@pytest.mark.unit()
+class TestEntryCursor:
+    def test_round_trip(self):
+        created_at, entry_id = datetime(2026, 10, 18, 9, 30, 0, 123456), uuid4()
+
+        cursor = encode_cursor(created_at, entry_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, entry_id)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WzFd", "e30"])
+    def test_rejects_malformed(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+@pytest.mark.unit()
+class TestChangeCursor:
+    def test_round_trip(self):
+        cursor = encode_change_cursor(2**40, 17)
+
+        assert decode_change_cursor(cursor) == (2**40, 17)
+
+    def test_listing_cursor_is_not_a_change_cursor(self):
+        cursor = encode_cursor(datetime(2026, 10, 18), uuid4())
+
+        with pytest.raises(InvalidCursorError):
+            decode_change_cursor(cursor)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WyJjIiwiMSIsMl0"])
+    def test_rejects_malformed(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_change_cursor(cursor)
@@ -0,0 +1,72 @@
+"""
+Unit tests for the direct entry serialization path.
+"""
+
+from datetime import UTC, datetime
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import Response
+import pytest
+
+from app.api.v1.entries import EntryResponse, _entry_response
+from app.infra.serialization import json_bytes, json_response
+
+
+def _row(**overrides):
+    now = datetime(2026, 10, 18, 12, 30, tzinfo=UTC)
+    fields = {
+        "id": uuid4(),
+        "title": "Tuesday",
+        "content": "<p>Went <em>out</em></p>",
+        "markdown_content": "Went *out*",
+        "content_version": 2,
+        "word_count": 2,
+        "char_count": 10,
+        "version": 3,
+        "author_id": uuid4(),
+        "created_at": now,
+        "updated_at": now,
+        "is_deleted": False,
+    }
+    return SimpleNamespace(**(fields | overrides))
+
+
+@pytest.mark.unit()
+class TestEntryResponse:
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize("prefer_md", [False, True])
+    async def test_matches_model(self, prefer_md):
+        item = await _entry_response(_row(), prefer_md)
+        model = EntryResponse.model_validate(item)
+        assert item == model.model_dump()
+        assert json_bytes(item) == model.model_dump_json().encode()
+
+    @pytest.mark.asyncio()
+    async def test_html_only_entry(self):
+        item = await _entry_response(_row(markdown_content=None), prefer_md=True)
+        assert item["content"] == "<p>Went <em>out</em></p>"
+        assert item["content_block"]["format_preference"] == "html"
+        assert item["editor_mode"] == "markdown"
+
+
+@pytest.mark.unit()
+class TestJsonResponse:
+    def test_encodes_plain_values(self):
+        entry_id = uuid4()
+        out = json_response([{"id": entry_id, "at": datetime(2026, 1, 1, tzinfo=UTC)}])
+        assert out.media_type == "application/json"
+        assert json.loads(out.body) == [
+            {"id": str(entry_id), "at": "2026-01-01T00:00:00Z"}
+        ]
+
+    def test_keeps_headers_set_on_injected_response(self):
+        injected = Response()
+        del injected.headers["content-length"]  # as FastAPI prepares it
+        injected.headers["ETag"] = '"abc"'
+        injected.headers["X-Next-Cursor"] = "c1"
+        out = json_response([], injected)
+        assert out.headers["etag"] == '"abc"'
+        assert out.headers["x-next-cursor"] == "c1"
+        assert out.headers["content-length"] == "2"
@@ -0,0 +1,56 @@
+"""
+Unit tests for stored excerpts and summary field selection of entry listings.
+"""
+
+from fastapi import HTTPException
+import pytest
+
+from app.api.v1.entries import _summary_fields, _summary_response
+from app.infra.metrics import build_excerpt
+
+
+@pytest.mark.unit()
+class TestBuildExcerpt:
+    def test_strips_markup(self):
+        html = (
+            "<h1>Title &amp; more</h1>\n<p>Body <em>text</em></p><script>x()</script>"
+        )
+        assert build_excerpt(html) == "Title & more Body text"
+
+    def test_empty(self):
+        assert build_excerpt(None) == ""
+        assert build_excerpt("") == ""
+
+    def test_truncates_at_word_boundary(self):
+        excerpt = build_excerpt("<p>" + "lorem ipsum " * 50 + "</p>", length=40)
+        assert len(excerpt) <= 40
+        assert excerpt.endswith("…")
+        assert excerpt[:-1].split(" ")[-1] in {"lorem", "ipsum"}
+
+
+@pytest.mark.unit()
+class TestSummaryFields:
+    def test_full_view_by_default(self):
+        assert _summary_fields("full", None) is None
+
+    def test_summary_view(self):
+        fields = _summary_fields("summary", None)
+        assert "excerpt" in fields
+        assert "id" not in fields
+
+    def test_explicit_fields(self):
+        assert _summary_fields("full", "id, title,excerpt") == ["title", "excerpt"]
+
+    def test_rejects_unknown_fields(self):
+        with pytest.raises(HTTPException) as exc:
+            _summary_fields("full", "title,content")
+        assert exc.value.status_code == 400
+
+    def test_metrics_are_grouped(self):
+        row = {"id": 1, "title": "t", "word_count": 3, "char_count": None}
+        item = _summary_response(row, ["title", "word_count", "char_count"])
+        assert item == {
+            "id": 1,
+            "title": "t",
+            "metrics": {"word_count": 3, "char_count": 0},
+        }
@@ -0,0 +1,56 @@
+"""
+Unit tests for entry ETags and conditional request header parsing.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.infra.etag import entry_etag, if_match_version, list_etag, none_match
+
+
+@pytest.mark.unit()
+class TestEntryEtag:
+    def test_depends_on_id_version_and_representation(self):
+        eid = uuid4()
+        tag = entry_etag(eid, 3, "html")
+
+        assert tag.startswith('"3-') and tag.endswith('"')
+        assert tag == entry_etag(eid, 3, "html")
+        assert tag != entry_etag(eid, 4, "html")
+        assert tag != entry_etag(eid, 3, "markdown")
+        assert tag != entry_etag(uuid4(), 3, "html")
+
+    def test_list_etag_tracks_items(self):
+        a, b = uuid4(), uuid4()
+        tag = list_etag([(a, 1), (b, 1)], "html")
+
+        assert tag == list_etag([(a, 1), (b, 1)], "html")
+        assert tag != list_etag([(a, 1), (b, 2)], "html")
+        assert tag != list_etag([(a, 1)], "html")
+        assert tag != list_etag([(a, 1), (b, 1)], "markdown")
+
+
+@pytest.mark.unit()
+class TestConditionalHeaders:
+    def test_none_match(self):
+        tag = entry_etag(uuid4(), 1, "html")
+
+        assert none_match(tag, tag)
+        assert none_match(f'"other", W/{tag}', tag)
+        assert none_match("*", tag)
+        assert not none_match('"other"', tag)
+        assert not none_match(None, tag)
+
+    def test_if_match_version(self):
+        eid = uuid4()
+
+        assert if_match_version(entry_etag(eid, 5, "markdown"), eid) == 5
+        assert if_match_version(f'"x", {entry_etag(eid, 2, "html")}', eid) == 2
+
+    def test_if_match_rejects_foreign_and_weak_tags(self):
+        eid = uuid4()
+
+        assert if_match_version(entry_etag(uuid4(), 5, "html"), eid) is None
+        assert if_match_version(f"W/{entry_etag(eid, 5, 'html')}", eid) is None
+        assert if_match_version('"5-forged"', eid) is None
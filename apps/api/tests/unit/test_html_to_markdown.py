@@ -0,0 +1,158 @@
+"""
+Unit tests for the single-pass HTML to Markdown converter.
+"""
+
+import re
+import time
+
+import pytest
+
+from app.infra.conversion import _render, html_to_markdown
+
+
+CORPUS = [
+    pytest.param(
+        "<h2>Sub</h2><p>Paragraph</p><br/>", "## Sub\n\nParagraph", id="heading"
+    ),
+    pytest.param(
+        "<h1><h2>Nested headers</h2></h1>", "# Nested headers", id="nested-heading"
+    ),
+    pytest.param(
+        "<p>Mix of <strong>bold</strong>, <em>italic</em>, <del>gone</del></p>",
+        "Mix of **bold**, *italic*, ~~gone~~",
+        id="emphasis",
+    ),
+    pytest.param(
+        "<p><strong> spaced </strong>out</p>", "**spaced** out", id="emphasis-spaces"
+    ),
+    pytest.param("<b><i>x</b></i> y", "***x*** y", id="misnested-inline"),
+    pytest.param(
+        "<p>Inline <code>co`de</code> and <code>a*b</code></p>",
+        "Inline ``co`de`` and `a*b`",
+        id="inline-code",
+    ),
+    pytest.param(
+        '<a href="https://example.com" title="Example">Link</a> '
+        '<img src="image.jpg" alt="Description" width="100">',
+        "[Link](https://example.com) ![Description](image.jpg)",
+        id="link-image",
+    ),
+    pytest.param(
+        '<a href="/a path">x</a>', "[x](</a path>)", id="link-angle-destination"
+    ),
+    pytest.param(
+        "<p>&lt;b&gt; 5 * 3 snake_case _x_ [y]</p>",
+        "\\<b> 5 \\* 3 snake_case \\_x\\_ \\[y\\]",
+        id="escaping",
+    ),
+    pytest.param(
+        "<p>1. not a list</p><p># not heading</p><p>- nor this</p>",
+        "1\\. not a list\n\n\\# not heading\n\n\\- nor this",
+        id="block-marker-escaping",
+    ),
+    pytest.param(
+        "<p>line1<br>line2<br><br>line3</p>",
+        "line1\\\nline2\n\nline3",
+        id="line-breaks",
+    ),
+    pytest.param(
+        "<ul>\n  <li>Item 1</li>\n  <li>Item 2\n    <ol start=3><li>c</li><li>d</li></ol>"
+        "</li>\n</ul>",
+        "- Item 1\n- Item 2\n  3. c\n  4. d",
+        id="nested-lists",
+    ),
+    pytest.param("<li>orphan<li>second", "- orphan\n- second", id="unclosed-items"),
+    pytest.param(
+        "<ul><li><p>A</p><p>more</p></li><li><p>B</p></li></ul>",
+        "- A\n\n  more\n\n- B",
+        id="loose-list",
+    ),
+    pytest.param(
+        "<blockquote><p>Q1</p><p>Q2</p><ul><li>a</li></ul></blockquote><p>after</p>",
+        "> Q1\n>\n> Q2\n>\n> - a\n\nafter",
+        id="blockquote",
+    ),
+    pytest.param(
+        '<pre><code class="language-python">def f():\n    return "```"\n</code></pre>',
+        '````python\ndef f():\n    return "```"\n````',
+        id="fenced-code",
+    ),
+    pytest.param(
+        "<ul><li>x<pre><code>a\n\nb</code></pre></li></ul>",
+        "- x\n\n  ```\n  a\n\n  b\n  ```",
+        id="code-in-list",
+    ),
+    pytest.param(
+        "<table><tr><th>H1</th><th>H|2</th></tr><tr><td>a <b>b</b></td></tr></table>",
+        "| H1 | H\\|2 |\n| --- | --- |\n| a **b** |  |",
+        id="table",
+    ),
+    pytest.param("<p>a</p><hr><p>b</p>", "a\n\n---\n\nb", id="rule"),
+    pytest.param(
+        "<style>p {}</style><script>x()</script><div>kept</div>", "kept", id="skipped"
+    ),
+    pytest.param(
+        "<script>alert(1)</script>",
+        "&lt;script&gt;alert(1)&lt;/script&gt;",
+        id="nothing-representable",
+    ),
+    pytest.param("<p></p>", "", id="empty-paragraph"),
+    pytest.param("<br>", "", id="empty-break"),
+    pytest.param("<div> <style> </style></div>", "", id="empty-skipped"),
+    pytest.param("<p>caf&eacute; &#x1F30D;\xa0ok</p>", "café 🌍\xa0ok", id="entities"),
+]
+
+ROUND_TRIP = [
+    "# T\n\nSome *em* and **strong** and `code` and [link](http://x.com/a_b).",
+    "> quote\n> more\n\n- a\n- b\n  - c\n\n1. x\n2. y",
+    "```python\nprint('*')\n```\n\n| a | b |\n| --- | --- |\n| 1 | 2 |",
+    "---\n\nEnd  \nbreak ~~del~~ ![img](i.png)",
+    "Text with < > & \" ' characters and *asterisks* _underscores_ 2 * 3 a_b_c",
+    "- Level 1 item 1\n  - Level 2 item 1\n    - Level 3 item\n- Level 1 item 2",
+    "1) one\n2) two\n\n> > nested quote\n\n## Heading with `code`",
+]
+
+
+def _normalized(html):
+    return re.sub(r"\s+", " ", html).strip()
+
+
+@pytest.mark.unit()
+class TestHtmlToMarkdownCorpus:
+    @pytest.mark.parametrize("html,expected", CORPUS)
+    def test_converts(self, html, expected):
+        assert html_to_markdown(html) == expected
+
+    @pytest.mark.parametrize("markdown", ROUND_TRIP)
+    def test_round_trip_renders_the_same(self, markdown):
+        html = _render(markdown, "inline")
+
+        assert _normalized(_render(html_to_markdown(html), "inline")) == (
+            _normalized(html)
+        )
+
+
+@pytest.mark.unit()
+@pytest.mark.slow()
+class TestHtmlToMarkdownScaling:
+    def test_cost_is_linear_in_size(self):
+        block = (
+            "<h2>Day</h2><p>Went <strong>out</strong> with <em>friends</em>, see "
+            '<a href="https://example.com">photos</a>.</p><ul><li>one</li>'
+            "<li>two<ul><li>three</li></ul></li></ul><blockquote><p>quote</p>"
+            "</blockquote><pre><code>x = 1\n</code></pre>"
+        )
+
+        def per_block(n):
+            doc = block * n
+            best = float("inf")
+            for _ in range(3):
+                started = time.perf_counter()
+                html_to_markdown(doc)
+                best = min(best, time.perf_counter() - started)
+            return best / n
+
+        small, large = per_block(50), per_block(3200)
+
+        # 64x the input must not cost much more than 64x the time
+        assert large < small * 3
@@ -0,0 +1,154 @@
+"""
+Unit tests for request deadlines and the load-shedding middleware.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from fastapi import BackgroundTasks, FastAPI
+from httpx import ASGITransport, AsyncClient
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.infra.db import _apply_deadline
+from app.infra.deadlines import (
+    DeadlineExceeded,
+    create_detached_task,
+    deadline,
+    deadline_for,
+    time_left,
+)
+from app.infra.redis import DeadlineRedis
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.settings import settings
+
+
+@pytest.mark.unit()
+class TestDeadlines:
+    def test_no_deadline_outside_requests(self):
+        assert time_left() is None
+        assert time_left(3.0) == 3.0
+
+    def test_inner_deadline_cannot_extend_outer(self):
+        with deadline(1.0), deadline(60.0):
+            assert time_left() <= 1.0
+            assert time_left(0.5) == 0.5
+        assert time_left() is None
+
+    def test_passed_deadline_raises(self):
+        with deadline(0.0), pytest.raises(DeadlineExceeded):
+            time_left()
+
+    @pytest.mark.asyncio()
+    async def test_detached_tasks_have_no_deadline(self):
+        async def left():
+            return time_left()
+
+        with deadline(1.0):
+            assert await asyncio.create_task(left()) is not None
+            assert await create_detached_task(left()) is None
+
+    def test_longest_prefix_wins(self, monkeypatch):
+        monkeypatch.setattr(settings, "request_deadline_seconds", 15.0)
+        monkeypatch.setattr(
+            settings,
+            "request_deadlines",
+            {"/api/v1": 5.0, "/api/v1/entries/import": 300.0},
+        )
+        assert deadline_for("/api/v1/entries/import") == 300.0
+        assert deadline_for("/api/v1/entries") == 5.0
+        assert deadline_for("/graphql") == 15.0
+
+    def test_transactions_get_statement_timeout(self):
+        connection = MagicMock()
+        _apply_deadline(MagicMock(), MagicMock(), connection)
+        connection.execute.assert_not_called()
+        with deadline(2.0):
+            _apply_deadline(MagicMock(), MagicMock(), connection)
+        ms = int(connection.execute.call_args.args[1]["ms"])
+        assert 1900 < ms <= 2000
+
+    @pytest.mark.asyncio()
+    async def test_redis_commands_stop_at_deadline(self, monkeypatch):
+        async def slow_command(self, *args, **options):
+            await asyncio.sleep(1)
+
+        monkeypatch.setattr(Redis, "execute_command", slow_command)
+        client = DeadlineRedis()
+        with deadline(0.01), pytest.raises(RedisTimeoutError):
+            await client.get("key")
+
+
+@pytest.fixture()
+def app():
+    api = FastAPI()
+
+    @api.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @api.get("/background")
+    async def background(tasks: BackgroundTasks) -> dict[str, str]:
+        async def after_response() -> None:
+            await asyncio.sleep(0.1)
+            api.state.left_after_response = time_left()
+
+        tasks.add_task(after_response)
+        return {"status": "accepted"}
+
+    @api.get("/work")
+    async def work(seconds: float = 0.0) -> dict[str, float | None]:
+        await asyncio.sleep(seconds)
+        return {"left": time_left()}
+
+    return api
+
+
+async def _get(app, url, middleware=None):
+    middleware = middleware or LoadSheddingMiddleware(app)
+    transport = ASGITransport(app=middleware)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        return await c.get(url)
+
+
+@pytest.mark.unit()
+class TestLoadSheddingMiddleware:
+    @pytest.mark.asyncio()
+    async def test_admitted_request_runs_under_deadline(self, app, monkeypatch):
+        monkeypatch.setattr(settings, "request_deadline_seconds", 5.0)
+        response = await _get(app, "/work")
+        assert response.status_code == 200
+        assert 0 < response.json()["left"] <= 5.0
+
+    @pytest.mark.asyncio()
+    async def test_missed_deadline_answers_504(self, app, monkeypatch):
+        monkeypatch.setattr(settings, "request_deadline_seconds", 0.05)
+        response = await _get(app, "/work?seconds=1")
+        assert response.status_code == 504
+
+    @pytest.mark.asyncio()
+    async def test_background_tasks_outlive_deadline(self, app, monkeypatch):
+        monkeypatch.setattr(settings, "request_deadline_seconds", 0.05)
+        response = await _get(app, "/background")
+        assert response.status_code == 200
+        assert app.state.left_after_response is None
+
+    @pytest.mark.asyncio()
+    async def test_sheds_when_too_many_in_flight(self, app, monkeypatch):
+        monkeypatch.setattr(settings, "shed_max_in_flight", 0)
+        response = await _get(app, "/work")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(settings.shed_retry_after_seconds)
+        # Probes still answer
+        assert (await _get(app, "/health")).status_code == 200
+
+    @pytest.mark.asyncio()
+    async def test_sheds_while_event_loop_lags(self, app, monkeypatch):
+        middleware = LoadSheddingMiddleware(app)
+        monkeypatch.setattr(middleware, "_ensure_lag_watch", lambda: None)
+        middleware.loop_lag = settings.shed_max_loop_lag_seconds + 1
+        assert (await _get(app, "/work", middleware)).status_code == 503
+        middleware.loop_lag = 0.0
+        assert (await _get(app, "/work", middleware)).status_code == 200
+        assert middleware.in_flight == 0
@@ -0,0 +1,86 @@
+"""
+Unit tests for the shared NATS connection manager.
+"""
+
+import pytest
+
+from app.infra.nats_bus import NatsManager
+
+
+class FakeNC:
+    def __init__(self):
+        self.is_connected = True
+        self.is_reconnecting = False
+        self.is_closed = False
+        self.jetstream_calls = 0
+        self.drained = False
+
+    def jetstream(self):
+        self.jetstream_calls += 1
+        return object()
+
+    async def drain(self):
+        self.drained = True
+        self.is_closed = True
+
+
+@pytest.mark.unit()
+class TestNatsManager:
+    @pytest.mark.asyncio()
+    async def test_connects_once_and_reuses_client(self, monkeypatch):
+        connects = []
+
+        async def fake_connect(**kwargs):
+            connects.append(kwargs)
+            return FakeNC()
+
+        monkeypatch.setattr("app.infra.nats_bus.nats.connect", fake_connect)
+        manager = NatsManager()
+
+        first = await manager.connect()
+        second = await manager.connect()
+
+        assert first is second
+        assert len(connects) == 1
+        assert connects[0]["max_reconnect_attempts"] == -1
+
+    @pytest.mark.asyncio()
+    async def test_reconnects_after_close(self, monkeypatch):
+        async def fake_connect(**kwargs):
+            return FakeNC()
+
+        monkeypatch.setattr("app.infra.nats_bus.nats.connect", fake_connect)
+        manager = NatsManager()
+        first = await manager.connect()
+
+        await manager.close()
+
+        assert first.drained
+        assert manager.status() == "not_started"
+        assert await manager.connect() is not first
+
+    def test_jetstream_context_is_cached(self):
+        manager = NatsManager()
+        nc = FakeNC()
+        manager.attach(nc)
+
+        assert manager.jetstream() is manager.jetstream()
+        assert manager.jetstream_for(nc) is manager.jetstream()
+        assert nc.jetstream_calls == 1
+
+        other = FakeNC()
+        manager.jetstream_for(other)
+        assert other.jetstream_calls == 1
+
+    def test_status_reflects_connection_state(self):
+        manager = NatsManager()
+        assert manager.status() == "not_started"
+
+        nc = FakeNC()
+        manager.attach(nc)
+        assert manager.status() == "connected"
+
+        nc.is_connected = False
+        nc.is_reconnecting = True
+        assert manager.status() == "reconnecting"
+        assert not manager.is_connected
@@ -0,0 +1,94 @@
+"""
+Unit tests for ordered, per-aggregate publishing in the partitioned outbox relay.
+"""
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+import tomllib
+from uuid import uuid4
+
+import pytest
+
+from app.infra.outbox import _BlockedByPredecessorError, _publish_ordered
+from app.infra.sa_models import Event
+from app.workers import outbox_relay
+
+
+def _event(aggregate_id, index):
+    return Event(
+        id=uuid4(),
+        aggregate_id=aggregate_id,
+        aggregate_type="Entry",
+        event_type="entry.updated",
+        event_data={"index": index},
+        occurred_at=datetime.utcnow(),
+    )
+
+
+class MockJS:
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.published = []
+
+    async def publish(self, subject, payload, headers=None):
+        await asyncio.sleep(0)
+        msg_id = headers["Nats-Msg-Id"]
+        if msg_id in self.fail_ids:
+            raise RuntimeError("simulated publish failure")
+        self.published.append(msg_id)
+
+
+class MockNC:
+    def __init__(self, js):
+        self._js = js
+
+    def jetstream(self):
+        return self._js
+
+
+@pytest.mark.unit()
+class TestPublishOrdered:
+    @pytest.mark.asyncio()
+    async def test_preserves_order_within_aggregate(self):
+        a, b = uuid4(), uuid4()
+        rows = [_event(a, 0), _event(b, 0), _event(a, 1), _event(b, 1), _event(a, 2)]
+        js = MockJS()
+
+        results = await _publish_ordered(MockNC(js), rows)
+
+        assert results == [None] * len(rows)
+        for aggregate in (a, b):
+            expected = [str(r.id) for r in rows if r.aggregate_id == aggregate]
+            assert [i for i in js.published if i in expected] == expected
+
+    @pytest.mark.asyncio()
+    async def test_failure_blocks_later_events_of_same_aggregate(self):
+        a, b = uuid4(), uuid4()
+        rows = [_event(a, 0), _event(a, 1), _event(a, 2), _event(b, 0)]
+        js = MockJS(fail_ids={str(rows[1].id)})
+
+        results = await _publish_ordered(MockNC(js), rows)
+
+        assert results[0] is None
+        assert isinstance(results[1], RuntimeError)
+        assert isinstance(results[2], _BlockedByPredecessorError)
+        assert results[3] is None
+        assert str(rows[2].id) not in js.published
+
+
+@pytest.mark.unit()
+class TestRelayEntryPoint:
+    def test_console_script_runs_the_relay(self, monkeypatch):
+        pyproject = Path(__file__).resolve().parents[2] / "pyproject.toml"
+        scripts = tomllib.loads(pyproject.read_text())["project"]["scripts"]
+        assert scripts["journal-outbox-relay"] == "app.workers.outbox_relay:run"
+        ran = []
+
+        async def fake_main():
+            ran.append(True)
+
+        monkeypatch.setattr(outbox_relay, "main", fake_main)
+        outbox_relay.run()
+
+        assert ran == [True]
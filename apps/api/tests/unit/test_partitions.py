@@ -0,0 +1,45 @@
+"""
+Unit tests for monthly partition naming and bounds.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.infra.partitions import _UPPER_BOUND, _month_start, partition_name
+
+
+@pytest.mark.unit()
+class TestPartitionHelpers:
+    def test_month_start_rolls_over_year(self):
+        now = datetime(2026, 11, 18, 13, 5, tzinfo=UTC)
+        assert _month_start(now) == datetime(2026, 11, 1, tzinfo=UTC)
+        assert _month_start(now, 2) == datetime(2027, 1, 1, tzinfo=UTC)
+
+    def test_partition_name(self):
+        assert (
+            partition_name("events", datetime(2027, 1, 1, tzinfo=UTC))
+            == "events_p202701"
+        )
+
+    @pytest.mark.parametrize(
+        "bound, upper",
+        [
+            (
+                "FOR VALUES FROM ('2026-11-01 00:00:00+00') TO ('2026-12-01 00:00:00+00')",
+                "2026-12-01 00:00:00+00",
+            ),
+            (
+                "FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00+00')",
+                "2026-11-01 00:00:00+00",
+            ),
+        ],
+    )
+    def test_upper_bound_parsing(self, bound, upper):
+        match = _UPPER_BOUND.search(bound)
+        assert match is not None
+        assert match.group(1) == upper
+        assert datetime.fromisoformat(upper).tzinfo is not None
+
+    def test_default_partition_has_no_upper_bound(self):
+        assert _UPPER_BOUND.search("DEFAULT") is None
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
+import io
 import json
 from uuid import uuid4
+import zipfile
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -146,6 +148,68 @@ class TestPrivacyService:
         assert "Test Entry" in csv_content
         assert "This is test content" in csv_content
 
+    @pytest.mark.asyncio()
+    async def test_export_user_data_zip(
+        self,
+        privacy_service: PrivacyService,
+        test_user: User,
+        test_entry: Entry,
+        test_session: UserSession,
+        db_session: AsyncSession,
+    ) -> None:
+        """Test exporting user data as a zip of JSON Lines files."""
+        filename, content_type, data_bytes = await privacy_service.export_user_data(
+            test_user.id, export_format="zip"
+        )
+
+        assert filename.endswith(".zip")
+        assert content_type == "application/zip"
+
+        with zipfile.ZipFile(io.BytesIO(data_bytes)) as zf:
+            user = json.loads(zf.read("user.json"))
+            entries = zf.read("entries.jsonl").decode().splitlines()
+            devices = zf.read("devices.jsonl").decode().splitlines()
+
+        assert user["user"]["email"] == "test@example.com"
+        assert [json.loads(line)["title"] for line in entries] == ["Test Entry"]
+        assert len(devices) == 1
+
+    @pytest.mark.asyncio()
+    async def test_stream_user_data_in_chunks(
+        self,
+        privacy_service: PrivacyService,
+        test_user: User,
+        db_session: AsyncSession,
+    ) -> None:
+        """Test large exports arrive as several chunks that form one document."""
+        db_session.add_all([
+            Entry(
+                author_id=test_user.id,
+                title=f"Entry {i}",
+                markdown_content="word " * 200,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+            for i in range(300)
+        ])
+        await db_session.flush()
+
+        _, _, stream = await privacy_service.stream_user_data(test_user.id)
+        chunks = [chunk async for chunk in stream]
+
+        assert len(chunks) > 1
+        data = json.loads(b"".join(chunks))
+        assert len(data["entries"]) == 300
+        assert data["audit_log"][-1]["event_type"] == "data_export"
+
+    @pytest.mark.asyncio()
+    async def test_export_unknown_user(
+        self, privacy_service: PrivacyService, db_session: AsyncSession
+    ) -> None:
+        """Test exporting a missing user fails before any data is streamed."""
+        with pytest.raises(ValueError, match="User not found"):
+            await privacy_service.stream_user_data(uuid4())
+
     @pytest.mark.asyncio()
     async def test_schedule_deletion(
         self,
@@ -297,6 +361,7 @@ class TestPrivacyService:
         assert summary["audit_log_integrity"] is True
         assert "json" in summary["export_formats"]
         assert "csv" in summary["export_formats"]
+        assert "zip" in summary["export_formats"]
 
     @pytest.mark.asyncio()
     async def test_privacy_summary_with_deletion(
@@ -0,0 +1,128 @@
+"""
+Unit tests for read-replica routing and read-your-writes pinning.
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.infra import db
+from app.infra.db import (
+    Replica,
+    check_replica_lag,
+    client_key,
+    get_sessionmaker,
+    read_sessionmaker,
+    track_commits,
+)
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.settings import settings
+
+
+def _replica(name="replica0", lag=0.1):
+    return Replica(name, MagicMock(), MagicMock(), lag=lag, checked_at=time.monotonic())
+
+
+@pytest.fixture()
+def redis(monkeypatch):
+    client = MagicMock(exists=AsyncMock(return_value=0), set=AsyncMock())
+    monkeypatch.setattr(db, "get_redis_client", lambda: client)
+    return client
+
+
+@pytest.fixture()
+def replicas(monkeypatch):
+    configured = [_replica("replica0"), _replica("replica1")]
+    monkeypatch.setattr(db, "read_replicas", lambda: tuple(configured))
+    monkeypatch.setattr(
+        "app.middleware.read_your_writes.read_replicas", lambda: tuple(configured)
+    )
+    return configured
+
+
+@pytest.mark.unit()
+class TestReadRouting:
+    @pytest.mark.asyncio()
+    async def test_primary_without_replicas(self, redis):
+        assert await read_sessionmaker("client") is get_sessionmaker()
+        redis.exists.assert_not_awaited()
+
+    @pytest.mark.asyncio()
+    async def test_fresh_replica_serves_reads(self, redis, replicas):
+        chosen = await read_sessionmaker("client")
+        assert chosen in {r.sessionmaker for r in replicas}
+
+    @pytest.mark.asyncio()
+    async def test_lagging_replicas_are_skipped(self, redis, replicas):
+        replicas[0].lag = settings.db_read_max_lag_seconds + 1
+        replicas[1].lag = None  # unreachable
+        assert await read_sessionmaker("client") is get_sessionmaker()
+        replicas[1].lag = 0.0
+        assert await read_sessionmaker("client") is replicas[1].sessionmaker
+
+    @pytest.mark.asyncio()
+    async def test_pinned_client_reads_primary(self, redis, replicas):
+        redis.exists.return_value = 1
+        assert await read_sessionmaker("client") is get_sessionmaker()
+        # Anonymous reads have nothing to pin
+        assert await read_sessionmaker(None) is not get_sessionmaker()
+
+    @pytest.mark.asyncio()
+    async def test_redis_failure_reads_primary(self, redis, replicas):
+        redis.exists.side_effect = RedisError("down")
+        assert await read_sessionmaker("client") is get_sessionmaker()
+
+    @pytest.mark.asyncio()
+    async def test_unreachable_replica_marked_unusable(self):
+        engine = db._create_engine("postgresql+asyncpg://u:p@127.0.0.1:1/x")
+        replica = Replica("replica0", engine, MagicMock(), lag=0.0)
+        await check_replica_lag(replica)
+        assert replica.lag is None
+        assert not replica.usable
+        assert replica.checked_at > 0
+
+    def test_client_key(self):
+        assert client_key(None) is None
+        assert client_key("Bearer a") == client_key("Bearer a")
+        assert client_key("Bearer a") != client_key("Bearer b")
+
+
+@pytest.mark.unit()
+class TestReadYourWrites:
+    def test_commits_are_tracked_per_request(self):
+        engine = create_engine("sqlite://")
+        with Session(engine) as s:
+            s.execute(text("SELECT 1"))
+            s.commit()  # outside a request: ignored
+            with track_commits() as committed:
+                s.execute(text("SELECT 1"))
+                assert not committed
+                s.commit()
+            assert committed
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize("commits", [False, True])
+    async def test_writer_pinned_before_response(self, monkeypatch, replicas, commits):
+        events = []
+        monkeypatch.setattr(
+            "app.middleware.read_your_writes.pin_to_primary",
+            AsyncMock(side_effect=lambda client: events.append(("pin", client))),
+        )
+
+        async def endpoint(scope, receive, send):
+            if commits:
+                db._note_commit(MagicMock())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def send(message):
+            events.append(message["type"])
+
+        scope = {"type": "http", "headers": [(b"authorization", b"Bearer t")]}
+        await ReadYourWritesMiddleware(endpoint)(scope, AsyncMock(), send)
+        pinned = [("pin", client_key("Bearer t"))] if commits else []
+        assert events == [*pinned, "http.response.start", "http.response.body"]
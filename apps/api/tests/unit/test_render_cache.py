@@ -0,0 +1,152 @@
+"""
+Unit tests for the markdown render cache, pool offload and render metrics.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.infra import conversion
+from app.infra.conversion import (
+    _RenderCache,
+    entry_html,
+    markdown_to_html,
+    render_markdown,
+    storable_html,
+    with_entry_html,
+)
+from app.telemetry.metrics_runtime import render_prom
+
+
+@pytest.fixture()
+def render_calls(monkeypatch):
+    calls = []
+    real_render = conversion._render
+
+    def counting_render(md, mode):
+        calls.append(mode)
+        return real_render(md, mode)
+
+    conversion._render_cache.clear()
+    monkeypatch.setattr(conversion, "_render", counting_render)
+    yield calls
+    conversion._render_cache.clear()
+
+
+@pytest.mark.unit()
+class TestRenderCache:
+    def test_repeated_render_hits_cache(self, render_calls):
+        first = markdown_to_html("# Title\n\nBody")
+        second = markdown_to_html("# Title\n\nBody")
+
+        assert first == second
+        assert "<h1>Title</h1>" in first
+        assert render_calls == ["inline"]
+
+    def test_lru_bounded_by_size(self):
+        cache = _RenderCache(max_chars=80)
+        keys = [cache.key(str(i)) for i in range(3)]
+        for key in keys:
+            cache.put(key, "x" * 10)
+        cache.get(keys[0])  # most recently used survives eviction
+        for i in range(3, 9):
+            cache.put(cache.key(str(i)), "x" * 10)
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+
+    def test_oversized_documents_not_cached(self):
+        cache = _RenderCache(max_chars=80)
+        key = cache.key("big")
+        cache.put(key, "x" * 11)
+
+        assert cache.get(key) is None
+
+    @pytest.mark.asyncio()
+    async def test_large_documents_render_in_pool(self, render_calls, monkeypatch):
+        monkeypatch.setattr(conversion.settings, "render_offload_chars", 10)
+
+        html, small = await asyncio.gather(
+            render_markdown("**a long enough document**"),
+            render_markdown("short"),
+        )
+
+        assert "<strong>" in html
+        assert small.strip() == "<p>short</p>"
+        assert sorted(render_calls) == ["inline", "pool"]
+        assert await render_markdown("**a long enough document**") == html
+        assert len(render_calls) == 2
+
+    def test_backlog_slots_work_across_event_loops(self, render_calls, monkeypatch):
+        monkeypatch.setattr(conversion.settings, "render_offload_chars", 10)
+        monkeypatch.setattr(conversion.settings, "render_max_pending", 1)
+
+        async def contended(n):
+            # Distinct documents, so both miss the cache and wait for a slot
+            return await asyncio.gather(
+                *(render_markdown(f"**long document {n}.{i}**") for i in range(2))
+            )
+
+        for n in range(2):
+            assert len(asyncio.run(contended(n))) == 2
+        assert render_calls == ["pool"] * 4
+
+    def test_render_time_histogram(self):
+        markdown_to_html("histogram *sample*")
+
+        prom = render_prom()
+        assert 'markdown_render_seconds_bucket{mode="inline",le="+Inf"}' in prom
+        assert 'markdown_render_seconds_count{mode="inline"}' in prom
+
+
+@pytest.mark.unit()
+class TestEntryHtml:
+    @pytest.mark.asyncio()
+    async def test_stored_html_is_used_as_is(self, render_calls):
+        html = await entry_html(uuid4(), 1, "<p>stored</p>", "rendered")
+
+        assert html == "<p>stored</p>"
+        assert render_calls == []
+
+    @pytest.mark.asyncio()
+    async def test_rendered_once_per_version(self, render_calls):
+        entry_id = uuid4()
+
+        first = await entry_html(entry_id, 1, None, "# v1")
+        again = await entry_html(entry_id, 1, None, "# v1")
+        second = await entry_html(entry_id, 2, None, "# v2")
+
+        assert first == again == "<h1>v1</h1>\n"
+        assert second == "<h1>v2</h1>\n"
+        assert render_calls == ["inline", "inline"]
+
+    @pytest.mark.asyncio()
+    async def test_search_rows_filled_in(self):
+        rows = [
+            {"id": uuid4(), "version": 3, "content": None, "markdown_content": "*x*"},
+            {
+                "id": uuid4(),
+                "version": 1,
+                "content": "<p>y</p>",
+                "markdown_content": None,
+            },
+        ]
+
+        await with_entry_html(rows)
+
+        assert rows[0]["content"] == "<p><em>x</em></p>\n"
+        assert rows[1]["content"] == "<p>y</p>"
+
+    @pytest.mark.parametrize(
+        "storage,markdown,expected",
+        [
+            ("stored", "# md", "<h1>md</h1>"),
+            ("rendered", "# md", None),
+            ("rendered", None, "<h1>md</h1>"),
+        ],
+    )
+    def test_storable_html(self, monkeypatch, storage, markdown, expected):
+        monkeypatch.setattr(conversion.settings, "entry_html_storage", storage)
+
+        assert storable_html("<h1>md</h1>", markdown) == expected
@@ -0,0 +1,69 @@
+"""
+Unit tests for revision deltas and autosave thinning.
+"""
+
+from datetime import UTC, datetime, timedelta
+import random
+
+import pytest
+
+from app.infra.revisions import _thinned, diff
+from app.infra.text_patch import apply_edits
+
+
+WORDS = ["alpha", "beta", "gamma", "delta", "\n", "\n\n", "é", "🌍"]
+
+
+@pytest.mark.unit()
+class TestDiff:
+    @pytest.mark.parametrize(
+        "src,dst",
+        [
+            ("", ""),
+            ("", "new"),
+            ("old", ""),
+            ("a\nb\nc\n", "a\nB\nc\n"),
+            ("same", "same"),
+            ("line one\nline two", "line one\nline two\nline three"),
+        ],
+    )
+    def test_round_trip(self, src, dst):
+        assert apply_edits(src, diff(src, dst)) == dst
+
+    def test_edit_inside_long_line_stays_small(self):
+        src = "word " * 2000
+        dst = src[:5000] + "inserted " + src[5000:]
+
+        edits = diff(src, dst)
+
+        assert [(e.at, e.delete, e.insert) for e in edits] == [(5000, 0, "inserted ")]
+
+    def test_random_round_trips(self):
+        rng = random.Random(7)  # noqa: S311 - deterministic test data
+        for _ in range(200):
+            src = "".join(rng.choices(WORDS, k=rng.randrange(40)))
+            dst = "".join(rng.choices(WORDS, k=rng.randrange(40)))
+            assert apply_edits(src, diff(src, dst)) == dst
+
+
+@pytest.mark.unit()
+class TestThinning:
+    def test_keeps_recent_explicit_and_one_per_bucket(self):
+        now = datetime(2026, 3, 10, 12, 30, tzinfo=UTC)
+        rows = [
+            (9, now - timedelta(minutes=1), True),  # newest
+            (8, now - timedelta(hours=2), True),  # within keep-all window
+            (7, now - timedelta(days=2, minutes=10), True),  # newest of its hour
+            (6, now - timedelta(days=2, minutes=20), True),  # same hour: dropped
+            (5, now - timedelta(days=2, minutes=25), False),  # explicit save
+            (4, now - timedelta(days=20), True),  # newest of its day
+            (3, now - timedelta(days=20, hours=1), True),  # same day: dropped
+        ]
+
+        assert _thinned(rows, now) == {6, 3}
+
+    def test_newest_revision_always_kept(self):
+        now = datetime(2026, 3, 10, tzinfo=UTC)
+        old = now - timedelta(days=30)
+
+        assert _thinned([(2, old, True), (1, old, True)], now) == {1}
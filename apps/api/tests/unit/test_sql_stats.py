@@ -0,0 +1,109 @@
+"""
+Unit tests for per-request SQL statistics and N+1 detection.
+"""
+
+import logging
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.telemetry.metrics_runtime import render_prom
+from app.telemetry.sql_stats import (
+    assert_max_queries,
+    collect_queries,
+    statement_shape,
+)
+
+
+@pytest.fixture()
+def engine():
+    return create_engine("sqlite://")
+
+
+def _loop(engine, n):
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text("SELECT :i"), {"i": i})
+
+
+@pytest.mark.unit()
+class TestCollectQueries:
+    def test_counts_statements_and_time(self, engine):
+        with collect_queries() as stats:
+            _loop(engine, 3)
+        assert stats.count == 3
+        assert stats.seconds >= stats.slowest_seconds > 0
+        assert stats.most_repeated() == ("SELECT ?", 3)
+
+    def test_nested_blocks_both_count(self, engine):
+        with collect_queries() as outer:
+            _loop(engine, 1)
+            with collect_queries() as inner:
+                _loop(engine, 2)
+        assert (outer.count, inner.count) == (3, 2)
+
+    def test_nothing_counted_outside_a_block(self, engine):
+        _loop(engine, 1)
+        with collect_queries() as stats:
+            pass
+        assert stats.count == 0
+
+    @pytest.mark.parametrize(
+        "statement,shape",
+        [
+            (
+                "SELECT *\n  FROM entries WHERE id = $1::UUID",
+                "SELECT * FROM entries WHERE id = ?",
+            ),
+            ("SELECT 1 WHERE id IN ($1, $2, $3)", "SELECT 1 WHERE id IN (?)"),
+            ("SELECT 1 WHERE id IN (?, ?)", "SELECT 1 WHERE id IN (?)"),
+        ],
+    )
+    def test_statement_shape(self, statement, shape):
+        assert statement_shape(statement) == shape
+
+
+@pytest.mark.unit()
+class TestAssertMaxQueries:
+    def test_passes_within_budget(self, engine):
+        with assert_max_queries(3, repeats=3):
+            _loop(engine, 3)
+
+    def test_fails_over_budget(self, engine):
+        with pytest.raises(AssertionError, match="4 statements ran"):  # noqa: SIM117
+            with assert_max_queries(3):
+                _loop(engine, 4)
+
+    def test_fails_on_repeats(self, engine):
+        with pytest.raises(AssertionError, match="ran 3 times"):  # noqa: SIM117
+            with assert_max_queries(10, repeats=2):
+                _loop(engine, 3)
+
+
+@pytest.mark.unit()
+class TestQueryStatsMiddleware:
+    @pytest.mark.asyncio()
+    async def test_reports_per_route(self, engine, monkeypatch, caplog):
+        monkeypatch.setattr("app.telemetry.sql_stats.settings.sql_warn_repeats", 5)
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: int) -> dict[str, int]:
+            _loop(engine, item_id)
+            return {"id": item_id}
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as c:
+            with caplog.at_level(logging.WARNING, logger="app.telemetry.sql_stats"):
+                assert (await c.get("/items/2")).status_code == 200
+                assert not caplog.records
+                assert (await c.get("/items/6")).status_code == 200
+
+        assert "possible N+1" in caplog.text
+        out = render_prom()
+        assert 'db_request_queries_count{route="GET /items/{item_id}"} 2' in out
+        assert 'db_request_seconds_count{route="GET /items/{item_id}"} 2' in out
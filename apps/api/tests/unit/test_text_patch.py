@@ -0,0 +1,82 @@
+"""
+Unit tests for positional text edits and incremental word counts.
+"""
+
+import random
+
+import pytest
+
+from app.infra.metrics import count_words_chars
+from app.infra.text_patch import (
+    PatchError,
+    TextEdit,
+    apply_edits,
+    char_count_delta,
+    validate_edits,
+    word_count_delta,
+)
+
+
+@pytest.mark.unit()
+class TestApplyEdits:
+    def test_applies_against_original_offsets(self):
+        text = "The quick brown fox"
+        edits = [TextEdit(4, 5, "slow"), TextEdit(16, 3, "cat"), TextEdit(19, 0, "!")]
+
+        validate_edits(text, edits)
+
+        assert apply_edits(text, edits) == "The slow brown cat!"
+
+    @pytest.mark.parametrize(
+        "edits",
+        [
+            [TextEdit(20, 0, "x")],
+            [TextEdit(3, 5)],
+            [TextEdit(2, 2), TextEdit(3, 0, "x")],
+            [TextEdit(5), TextEdit(1)],
+        ],
+    )
+    def test_rejects_edits_that_do_not_apply(self, edits):
+        with pytest.raises(PatchError):
+            validate_edits("abcdef", edits)
+
+
+@pytest.mark.unit()
+class TestIncrementalCounts:
+    @pytest.mark.parametrize(
+        "text,edits",
+        [
+            ("hello world", [TextEdit(5, 1, "")]),  # join two words
+            ("helloworld", [TextEdit(5, 0, " ")]),  # split one word
+            ("a b c", [TextEdit(1, 0, "x"), TextEdit(2, 1, "y")]),  # touching edits
+            ("", [TextEdit(0, 0, "new words here")]),
+            ("snake_case stays one", [TextEdit(5, 1, "-")]),
+        ],
+    )
+    def test_matches_full_recount(self, text, edits):
+        after = apply_edits(text, edits)
+
+        words = count_words_chars(text)[0] + word_count_delta(text, edits)
+        chars = len(text) + char_count_delta(edits)
+
+        assert (words, chars) == count_words_chars(after)
+
+    def test_random_edits_match_full_recount(self):
+        rng = random.Random(38)  # noqa: S311 - reproducible test data
+        alphabet = "ab _-\n.é"
+        for _ in range(500):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            edits, pos = [], 0
+            while pos <= len(text) and rng.random() < 0.7:
+                at = rng.randint(pos, len(text))
+                delete = rng.randint(0, len(text) - at)
+                insert = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 5)))
+                edits.append(TextEdit(at, delete, insert))
+                pos = at + delete
+
+            after = apply_edits(text, edits)
+
+            assert (
+                count_words_chars(text)[0] + word_count_delta(text, edits)
+                == count_words_chars(after)[0]
+            )